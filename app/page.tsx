@@ -73,50 +73,15 @@ export default function Home() {
 
   const fetchDashboardData = async () => {
     try {
-      // In a real implementation, we would fetch this data from the API
-      // For now, we'll simulate the API response with mock data
-      
-      // Simulate API call delay
-      await new Promise(resolve => setTimeout(resolve, 1000))
-      
-      // Mock data
-      setDashboardData({
-        trucks: {
-          total: 24,
-          active: 18,
-          maintenance: 3,
-          expiringSoon: 5
-        },
-        trailers: {
-          total: 18,
-          active: 15,
-          expiringSoon: 3
-        },
-        employees: {
-          total: 32,
-          drivers: 22,
-          expiringSoon: 4
-        },
-        trips: {
-          total: 156,
-          completed: 142,
-          inProgress: 14,
-          revenue: 245000,
-          profit: 87500
-        },
-        maintenance: {
-          total: 48,
-          pending: 5,
-          cost: 35600
-        },
-        fines: {
-          total: 12,
-          pending: 3,
-          amount: 8500
-        },
-        documents: {
-          expiringSoon: 8
+      const data = await fetchApi('/dashboard')
+
+      // Sections that timed out on the server come back null; keep what we had
+      setDashboardData(current => {
+        const next = { ...current }
+        for (const key of Object.keys(current) as (keyof typeof current)[]) {
+          if (data[key]) next[key] = data[key]
         }
+        return next
       })
     } catch (error) {
       console.error('Error fetching dashboard data:', error)
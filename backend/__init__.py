@@ -0,0 +1,99 @@
+# TruckingBusiness API. create_app() builds the FastAPI app from the per-domain
+# routers; nothing below the package is imported until it is called.
+import glob
+import hashlib
+import json
+import os
+from contextlib import asynccontextmanager
+
+import mysql.connector
+from fastapi import FastAPI, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+
+OPENAPI_FILE = os.path.join(os.path.dirname(__file__), "openapi.json")
+
+
+async def validation_exception_handler(request: Request, exc: RequestValidationError):
+    # Log full error to the terminal
+    print(f"Validation error at {request.url}")
+    print(exc.errors())
+    print(f"Body: {await request.body()}")
+
+    return JSONResponse(
+        status_code=422,
+        # a validator's ValueError is kept in the error context; send its message
+        content={"detail": jsonable_encoder(exc.errors(), custom_encoder={Exception: str})},
+    )
+
+
+@asynccontextmanager
+async def lifespan(app):
+    from .dashboard import warm_dashboard_pool
+
+    await run_in_threadpool(warm_dashboard_pool)
+    yield
+
+
+# Hash of the package source; a precomputed schema is only used while it matches
+def source_fingerprint():
+    digest = hashlib.sha1()
+    for path in sorted(glob.glob(os.path.join(os.path.dirname(__file__), "*.py"))):
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+# The OpenAPI schema is written at build time (python backend2.py openapi) so
+# the first /docs hit doesn't have to generate it for every route and model
+def load_openapi(app):
+    try:
+        with open(OPENAPI_FILE) as f:
+            schema = json.load(f)
+    except (OSError, ValueError):
+        return
+    if schema.get("x-source-fingerprint") == source_fingerprint():
+        app.openapi = lambda: schema
+
+
+def write_openapi(app):
+    schema = dict(FastAPI.openapi(app), **{"x-source-fingerprint": source_fingerprint()})
+    with open(OPENAPI_FILE, "w") as f:
+        json.dump(schema, f)
+    return OPENAPI_FILE
+
+
+def create_app():
+    from . import analytics, archive, batch, dashboard, db, documents, finance, fleet, people, sync, traffic
+
+    app = FastAPI(lifespan=lifespan)
+    # Allow requests from the frontend (add other origins if needed)
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # Allow the frontend origin
+        allow_credentials=True,
+        allow_methods=["*"],  # Allow all HTTP methods
+        allow_headers=["*"],  # Allow all headers
+    )
+    app.add_exception_handler(RequestValidationError, validation_exception_handler)
+    app.add_exception_handler(mysql.connector.Error, db.database_error_handler)
+    app.add_exception_handler(db.DatabaseUnavailable, db.database_unavailable_handler)
+
+    for router in (people.router, fleet.router, finance.router, documents.router, sync.router, archive.router,
+                   analytics.router, dashboard.router, batch.router, db.router, traffic.router):
+        app.include_router(router)
+
+    # Each middleware wraps the ones added before it, so the last one runs first
+    app.middleware("http")(traffic.etag_middleware)
+    app.middleware("http")(traffic.idempotency_middleware)
+    app.middleware("http")(traffic.admission_middleware)
+    app.middleware("http")(traffic.single_flight_middleware)
+    app.add_middleware(traffic.StatementDeadlineMiddleware)
+    app.middleware("http")(traffic.stale_response_middleware)
+    app.add_middleware(traffic.CompressionMiddleware)
+
+    load_openapi(app)
+    return app
@@ -0,0 +1,308 @@
+# DuckDB analytics snapshot
+import os
+import threading
+import time
+from typing import Any, List, Optional
+
+from fastapi import APIRouter, HTTPException
+from mysql.connector import FieldType
+from pydantic import BaseModel
+
+from .archive import ARCHIVE_DIR, archived_years
+from .db import add_column_if_missing, add_index_if_missing, get_db_connection
+from .sync import SYNC_SAFETY_LAG
+
+router = APIRouter()
+
+#-----------------------------------------------------analytics------------------------------------------------------------
+# Embedded DuckDB snapshot of the finance tables for ad-hoc group-bys. Each
+# snapshot is refreshed incrementally from updated_at and sync_tombstones, and
+# /analytics/query only accepts a restricted spec that is compiled to SQL
+# against whitelisted columns.
+#
+# As with /sync, a refresh only reads changes older than SYNC_SAFETY_LAG, so a
+# transaction that commits after later-stamped rows were read is not skipped.
+# DuckDB lets one process at a time open a file for writing, so each worker
+# keeps its own snapshot: it takes the first slot file no other worker holds,
+# and picks it up again (with its watermarks) after a restart.
+
+ANALYTICS_DB = os.path.join("Analytics", "analytics-{}.duckdb")
+ANALYTICS_MAX_SLOTS = 64
+ANALYTICS_TABLES = {
+    "trips": "trip_id",
+    "fines": "id",
+    "truckmaintenance": "id",
+    "salary": "id",
+}
+ANALYTICS_REFRESH_SECONDS = 60
+ANALYTICS_BATCH_SIZE = 50000
+
+analytics_lock = threading.Lock()
+analytics_state = {"conn": None, "refreshed_at": 0.0}
+
+DUCKDB_TYPES = {
+    "TINY": "INTEGER", "SHORT": "INTEGER", "INT24": "INTEGER", "LONG": "INTEGER",
+    "LONGLONG": "BIGINT", "YEAR": "INTEGER",
+    "FLOAT": "DOUBLE", "DOUBLE": "DOUBLE", "DECIMAL": "DOUBLE", "NEWDECIMAL": "DOUBLE",
+    "DATE": "DATE", "NEWDATE": "DATE", "DATETIME": "TIMESTAMP", "TIMESTAMP": "TIMESTAMP",
+}
+
+
+@router.on_event("startup")
+def ensure_analytics_schema():
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    for table in ANALYTICS_TABLES:
+        add_column_if_missing(
+            cursor, table, "updated_at",
+            "TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6)"
+        )
+        add_index_if_missing(cursor, table, "idx_updated_at", "updated_at")
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+
+def analytics_connection():
+    if analytics_state["conn"] is None:
+        import duckdb
+
+        os.makedirs(os.path.dirname(ANALYTICS_DB), exist_ok=True)
+        for slot in range(ANALYTICS_MAX_SLOTS):
+            try:
+                duck = duckdb.connect(ANALYTICS_DB.format(slot))
+                break
+            except duckdb.IOException as e:
+                if "lock" not in str(e).lower():
+                    raise  # not another worker's file lock
+        else:
+            raise RuntimeError(f"All {ANALYTICS_MAX_SLOTS} analytics snapshot files are in use")
+        duck.execute("""
+            CREATE TABLE IF NOT EXISTS _analytics_state (
+                table_name VARCHAR PRIMARY KEY, last_updated TIMESTAMP, last_tombstone BIGINT
+            )
+        """)
+        analytics_state["conn"] = duck
+    return analytics_state["conn"]
+
+
+def load_batch(duck, table, key, columns, batch):
+    import pyarrow as pa
+
+    data = pa.table({c: list(values) for c, values in zip(columns, zip(*batch))})
+    duck.register("incoming", data)
+    duck.execute(f"DELETE FROM {table} WHERE {key} IN (SELECT {key} FROM incoming)")
+    duck.execute(f"INSERT INTO {table} BY NAME SELECT * FROM incoming")
+    duck.unregister("incoming")
+
+
+# Pull rows changed since the last refresh and before the cutoff. Every row
+# older than the cutoff is then loaded, so the cutoff becomes the watermark
+# (>= so rows stamped exactly at it are read next time; the delete-then-insert
+# keeps re-reads idempotent).
+def refresh_analytics_table(duck, cursor, table, key, cutoff):
+    state = duck.execute(
+        "SELECT last_updated, last_tombstone FROM _analytics_state WHERE table_name = ?", [table]
+    ).fetchone()
+    last_updated, last_tombstone = state if state else (None, None)
+
+    if last_updated is None:
+        cursor.execute(f"SELECT * FROM {table} WHERE updated_at < %s ORDER BY updated_at", (cutoff,))
+    else:
+        cursor.execute(
+            f"SELECT * FROM {table} WHERE updated_at >= %s AND updated_at < %s ORDER BY updated_at",
+            (last_updated, cutoff)
+        )
+    columns = [c[0] for c in cursor.description]
+
+    if state is None:
+        column_defs = ", ".join(
+            f"{c[0]} {DUCKDB_TYPES.get(FieldType.get_info(c[1]), 'VARCHAR')}" for c in cursor.description
+        )
+        duck.execute(f"DROP TABLE IF EXISTS {table}")
+        duck.execute(f"CREATE TABLE {table} ({column_defs})")
+        # Years already moved to cold storage only exist in the archive
+        if archived_years(table):
+            duck.execute(
+                f"INSERT INTO {table} BY NAME SELECT * FROM read_parquet(?, union_by_name = true)",
+                [os.path.join(ARCHIVE_DIR, table, "*.parquet")]
+            )
+    else:
+        known = {row[0] for row in duck.execute(f"DESCRIBE {table}").fetchall()}
+        for c in cursor.description:
+            if c[0] not in known:
+                duck.execute(f"ALTER TABLE {table} ADD COLUMN {c[0]} {DUCKDB_TYPES.get(FieldType.get_info(c[1]), 'VARCHAR')}")
+
+    while True:
+        batch = cursor.fetchmany(ANALYTICS_BATCH_SIZE)
+        if not batch:
+            break
+        load_batch(duck, table, key, columns, batch)
+    last_updated = cutoff
+
+    if last_tombstone is None:
+        cursor.execute(
+            "SELECT COALESCE(MAX(id), 0) FROM sync_tombstones WHERE table_name = %s AND deleted_at < %s",
+            (table, cutoff)
+        )
+        last_tombstone = cursor.fetchone()[0]
+    else:
+        cursor.execute("""
+            SELECT id, row_key FROM sync_tombstones
+            WHERE table_name = %s AND id > %s AND deleted_at < %s ORDER BY id
+        """, (table, last_tombstone, cutoff))
+        tombstones = cursor.fetchall()
+        if tombstones:
+            duck.executemany(
+                f"DELETE FROM {table} WHERE CAST({key} AS VARCHAR) = ?", [[t[1]] for t in tombstones]
+            )
+            last_tombstone = tombstones[-1][0]
+
+    duck.execute(
+        "INSERT OR REPLACE INTO _analytics_state VALUES (?, ?, ?)", [table, last_updated, last_tombstone]
+    )
+
+
+def refresh_analytics(force=False):
+    with analytics_lock:
+        if not force and time.time() - analytics_state["refreshed_at"] < ANALYTICS_REFRESH_SECONDS:
+            return
+        duck = analytics_connection()
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT NOW(6) - INTERVAL %s SECOND", (SYNC_SAFETY_LAG,))
+            cutoff = cursor.fetchone()[0]
+            for table, key in ANALYTICS_TABLES.items():
+                refresh_analytics_table(duck, cursor, table, key, cutoff)
+        finally:
+            cursor.close()
+            conn.close()
+        analytics_state["refreshed_at"] = time.time()
+
+
+class AnalyticsFilter(BaseModel):
+    column: str
+    op: str  # eq, ne, gt, gte, lt, lte, in
+    value: Any
+
+
+class AnalyticsMetric(BaseModel):
+    op: str  # sum, avg, min, max, count, count_distinct, ratio
+    column: Optional[str] = None
+    denominator: Optional[str] = None  # for ratio: sum(column) / sum(denominator)
+    name: Optional[str] = None
+
+
+class AnalyticsQuery(BaseModel):
+    table: str
+    group_by: List[str] = []  # column, or column:year|quarter|month|week|day for dates
+    metrics: List[AnalyticsMetric]
+    filters: List[AnalyticsFilter] = []
+    order_by: Optional[str] = None  # any group_by or metric name, prefix "-" for descending
+    limit: int = 1000
+
+
+FILTER_OPS = {"eq": "=", "ne": "<>", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+METRIC_OPS = {"sum", "avg", "min", "max", "count", "count_distinct", "ratio"}
+DATE_PARTS = {"year", "quarter", "month", "week", "day"}
+
+
+# Identifiers are quoted so a name that is also a keyword (e.g. "from") still works
+def quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def compile_analytics_query(spec, columns):
+    def column(name):
+        if name not in columns:
+            raise HTTPException(status_code=400, detail=f"Unknown column '{name}' in {spec.table}")
+        return quote(name)
+
+    select = []
+    groups = []
+    names = []
+    for item in spec.group_by:
+        name, _, part = item.partition(":")
+        if part:
+            if part not in DATE_PARTS:
+                raise HTTPException(status_code=400, detail=f"Unknown date part '{part}'")
+            expr = f"date_trunc('{part}', {column(name)})"
+            alias = f"{name}_{part}"
+        else:
+            expr, alias = column(name), name
+        select.append(f"{expr} AS {quote(alias)}")
+        groups.append(expr)
+        names.append(alias)
+
+    if not spec.metrics:
+        raise HTTPException(status_code=400, detail="At least one metric is required")
+    for metric in spec.metrics:
+        if metric.op not in METRIC_OPS:
+            raise HTTPException(status_code=400, detail=f"Unknown metric '{metric.op}'")
+        if metric.op == "count" and metric.column is None:
+            expr = "count(*)"
+        elif metric.op == "count_distinct":
+            expr = f"count(DISTINCT {column(metric.column)})"
+        elif metric.op == "ratio":
+            expr = f"sum({column(metric.column)}) / nullif(sum({column(metric.denominator)}), 0)"
+        else:
+            expr = f"{metric.op}({column(metric.column)})"
+        alias = metric.name or f"{metric.op}_{metric.column or 'rows'}"
+        if not alias.isidentifier():
+            raise HTTPException(status_code=400, detail=f"Invalid metric name '{alias}'")
+        select.append(f"{expr} AS {quote(alias)}")
+        names.append(alias)
+
+    where = []
+    params = []
+    for f in spec.filters:
+        if f.op == "in":
+            values = list(f.value) if isinstance(f.value, list) else [f.value]
+            where.append(f"{column(f.column)} IN ({', '.join('?' for _ in values)})")
+            params += values
+        elif f.op in FILTER_OPS:
+            where.append(f"{column(f.column)} {FILTER_OPS[f.op]} ?")
+            params.append(f.value)
+        else:
+            raise HTTPException(status_code=400, detail=f"Unknown filter op '{f.op}'")
+
+    sql = f"SELECT {', '.join(select)} FROM {spec.table}"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    if groups:
+        sql += " GROUP BY " + ", ".join(groups)
+    if spec.order_by:
+        order = spec.order_by.lstrip("-")
+        if order not in names:
+            raise HTTPException(status_code=400, detail=f"Cannot order by '{order}'")
+        sql += f" ORDER BY {quote(order)} {'DESC' if spec.order_by.startswith('-') else 'ASC'}"
+    sql += f" LIMIT {max(1, min(spec.limit, 100000))}"
+    return sql, params
+
+
+# Ad-hoc aggregate over the columnar snapshot, e.g.
+# {"table": "trips", "group_by": ["destination_country", "date:quarter"],
+#  "metrics": [{"op": "sum", "column": "company_profit"}]}
+@router.post("/analytics/query")
+def analytics_query(spec: AnalyticsQuery):
+    if spec.table not in ANALYTICS_TABLES:
+        raise HTTPException(status_code=400, detail=f"Unknown table '{spec.table}'")
+    started = time.perf_counter()
+    refresh_analytics()
+    with analytics_lock:
+        duck = analytics_connection()
+        import duckdb
+        columns = {row[0] for row in duck.execute(f"DESCRIBE {spec.table}").fetchall()}
+        sql, params = compile_analytics_query(spec, columns)
+        try:
+            result = duck.execute(sql, params)
+            names = [d[0] for d in result.description]
+            rows = result.fetchall()
+        except (duckdb.BinderException, duckdb.ConversionException, duckdb.ParserException) as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "columns": names,
+        "rows": rows,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
@@ -0,0 +1,241 @@
+# Monthly partitions and cold storage for closed years
+import datetime
+import os
+
+from fastapi import APIRouter
+
+from .db import ROW_BATCH, get_db_connection
+
+router = APIRouter()
+
+#-----------------------------------------------------partitions & archive-------------------------------------------------
+# trips, fines and truckmaintenance are RANGE COLUMNS partitioned by month on
+# their date column, so date-bounded reads only touch the partitions they need.
+# Closed years are moved to zstd-compressed Parquet files under ARCHIVE_DIR and
+# streamed back into list endpoints only when the requested range reaches them.
+PARTITIONED_TABLES = {
+    # table: (primary key, date column)
+    "trips": ("trip_id", "date"),
+    "fines": ("id", "fine_date"),
+    "truckmaintenance": ("id", "date"),
+}
+PARTITION_MONTHS_AHEAD = 3
+ARCHIVE_DIR = "Archive"
+
+
+def month_start(d):
+    return datetime.date(d.year, d.month, 1)
+
+
+def next_month(d):
+    return datetime.date(d.year + (d.month == 12), d.month % 12 + 1, 1)
+
+
+def partition_name(d):
+    return f"p{d.year}{d.month:02d}"
+
+
+def is_partitioned(cursor, table):
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.partitions
+        WHERE table_schema = DATABASE() AND table_name = %s AND partition_name IS NOT NULL
+    """, (table,))
+    return cursor.fetchone()[0] > 0
+
+
+def month_partitions(start, end):
+    parts = []
+    d = month_start(start)
+    while d <= end:
+        upper = next_month(d)
+        parts.append(f"PARTITION {partition_name(d)} VALUES LESS THAN ('{upper.isoformat()}')")
+        d = upper
+    return parts
+
+
+# One-off migration: widen the primary key with the date column (MySQL requires
+# the partition column in every unique key) and split the table by month.
+def partition_by_month(table):
+    pk, date_column = PARTITIONED_TABLES[table]
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        if is_partitioned(cursor, table):
+            return f"{table} is already partitioned"
+        cursor.execute(f"SELECT COUNT(*) FROM {table} WHERE {date_column} IS NULL")
+        missing = cursor.fetchone()[0]
+        if missing:
+            raise ValueError(f"{table} has {missing} rows without {date_column}; fix them before partitioning")
+
+        cursor.execute(f"SELECT MIN({date_column}) FROM {table}")
+        first = cursor.fetchone()[0] or datetime.date.today()
+        last = datetime.date.today()
+        for _ in range(PARTITION_MONTHS_AHEAD):
+            last = next_month(last)
+        parts = month_partitions(first, last) + ["PARTITION pmax VALUES LESS THAN (MAXVALUE)"]
+
+        cursor.execute(f"ALTER TABLE {table} DROP PRIMARY KEY, ADD PRIMARY KEY ({pk}, {date_column})")
+        cursor.execute(
+            f"ALTER TABLE {table} PARTITION BY RANGE COLUMNS({date_column}) ({', '.join(parts)})"
+        )
+        return f"{table} partitioned into {len(parts)} partitions"
+    finally:
+        cursor.close()
+        conn.close()
+
+
+# Split pmax so there are always PARTITION_MONTHS_AHEAD empty months ready
+def ensure_future_partitions(cursor, table):
+    cursor.execute("""
+        SELECT partition_name FROM information_schema.partitions
+        WHERE table_schema = DATABASE() AND table_name = %s AND partition_name <> 'pmax'
+    """, (table,))
+    existing = {row[0] for row in cursor.fetchall()}
+    d = month_start(datetime.date.today())
+    wanted = []
+    for _ in range(PARTITION_MONTHS_AHEAD + 1):
+        if partition_name(d) not in existing:
+            wanted.append(d)
+        d = next_month(d)
+    if not wanted:
+        return
+    parts = month_partitions(wanted[0], wanted[-1])
+    cursor.execute(
+        f"ALTER TABLE {table} REORGANIZE PARTITION pmax INTO "
+        f"({', '.join(parts)}, PARTITION pmax VALUES LESS THAN (MAXVALUE))"
+    )
+
+
+@router.on_event("startup")
+def maintain_partitions():
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    for table in PARTITIONED_TABLES:
+        if is_partitioned(cursor, table):
+            ensure_future_partitions(cursor, table)
+    cursor.close()
+    conn.close()
+
+
+def archive_path(table, year):
+    return os.path.join(ARCHIVE_DIR, table, f"{year}.parquet")
+
+
+def archived_years(table):
+    folder = os.path.join(ARCHIVE_DIR, table)
+    if not os.path.isdir(folder):
+        return []
+    return sorted(int(name[:-8]) for name in os.listdir(folder) if name.endswith(".parquet"))
+
+
+def date_range_clause(column, from_date, to_date):
+    where = []
+    params = []
+    if from_date:
+        where.append(f"{column} >= %s")
+        params.append(from_date)
+    if to_date:
+        where.append(f"{column} <= %s")
+        params.append(to_date)
+    return (" WHERE " + " AND ".join(where) if where else ""), tuple(params)
+
+
+# Rows from archived years that overlap [from_date, to_date], in batches of
+# ROW_BATCH read lazily from the Parquet files with the date filter pushed
+# down. No files are opened when the range starts after the last archived year.
+def read_archived(table, date_column, from_date=None, to_date=None):
+    years = [
+        y for y in archived_years(table)
+        if (not from_date or y >= from_date.year) and (not to_date or y <= to_date.year)
+    ]
+    if not years:
+        return
+    import pyarrow.dataset as ds
+
+    condition = None
+    if from_date:
+        condition = ds.field(date_column) >= from_date
+    if to_date:
+        upper = ds.field(date_column) <= to_date
+        condition = upper if condition is None else condition & upper
+    for year in years:
+        dataset = ds.dataset(archive_path(table, year), format="parquet")
+        for batch in dataset.to_batches(filter=condition, batch_size=ROW_BATCH):
+            if batch.num_rows:
+                yield batch.to_pylist()
+
+
+def find_archived(table, key, value):
+    years = archived_years(table)
+    if not years:
+        return None
+    import pyarrow.parquet as pq
+
+    for year in reversed(years):
+        found = pq.read_table(archive_path(table, year), filters=[(key, "=", value)]).to_pylist()
+        if found:
+            return found[0]
+    return None
+
+
+# Move one closed year of a table into a compressed Parquet file, then drop
+# its partitions (or delete the rows if the table is not partitioned yet).
+def archive_year(table, year, batch_size=50000):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    pk, date_column = PARTITIONED_TABLES[table]
+    if year >= datetime.date.today().year:
+        raise ValueError(f"{year} is not a closed year")
+    if year in archived_years(table):
+        raise ValueError(f"{table} {year} is already archived")
+    start, end = datetime.date(year, 1, 1), datetime.date(year + 1, 1, 1)
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        f"SELECT * FROM {table} WHERE {date_column} >= %s AND {date_column} < %s ORDER BY {pk}",
+        (start, end)
+    )
+    columns = [c[0] for c in cursor.description]
+    data = {c: [] for c in columns}
+    count = 0
+    while True:
+        batch = cursor.fetchmany(batch_size)
+        if not batch:
+            break
+        for c, values in zip(columns, zip(*batch)):
+            data[c].extend(values)
+        count += len(batch)
+
+    if count:
+        os.makedirs(os.path.dirname(archive_path(table, year)), exist_ok=True)
+        tmp_path = archive_path(table, year) + ".tmp"
+        pq.write_table(pa.table(data), tmp_path, compression="zstd")
+        os.replace(tmp_path, archive_path(table, year))
+
+        present = []
+        if is_partitioned(cursor, table):
+            names = [partition_name(datetime.date(year, m, 1)) for m in range(1, 13)]
+            cursor.execute("""
+                SELECT partition_name FROM information_schema.partitions
+                WHERE table_schema = DATABASE() AND table_name = %s
+            """, (table,))
+            present = [n for (n,) in cursor.fetchall() if n in names]
+            # The lowest partition also holds anything older than the year,
+            # so only drop whole partitions when nothing older is left
+            cursor.execute(f"SELECT COUNT(*) FROM {table} WHERE {date_column} < %s", (start,))
+            if cursor.fetchone()[0]:
+                present = []
+        if present:
+            cursor.execute(f"ALTER TABLE {table} DROP PARTITION {', '.join(present)}")
+        else:
+            cursor.execute(
+                f"DELETE FROM {table} WHERE {date_column} >= %s AND {date_column} < %s",
+                (start, end)
+            )
+        conn.commit()
+
+    cursor.close()
+    conn.close()
+    return f"archived {count} {table} rows from {year}"
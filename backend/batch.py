@@ -0,0 +1,89 @@
+# Many API calls in one round-trip
+import asyncio
+import json
+from typing import Any, List, Optional
+
+from fastapi import APIRouter, HTTPException, Request
+from pydantic import BaseModel
+
+router = APIRouter()
+
+#-----------------------------------------------------batch----------------------------------------------------------------
+# Many API calls in one round-trip. Each sub-request is dispatched in-process
+# through the app itself (routing, validation, handlers, error handlers), all
+# of them concurrently; a failing sub-request only fails its own entry.
+BATCH_MAX_REQUESTS = 50
+
+
+class BatchItem(BaseModel):
+    id: Optional[str] = None
+    method: str = "GET"
+    path: str  # may include a query string, e.g. /trips?from_date=2024-01-01
+    body: Optional[Any] = None
+
+
+class BatchRequest(BaseModel):
+    requests: List[BatchItem]
+
+
+async def dispatch_subrequest(request, item):
+    path, _, query = item.path.partition("?")
+    if not path.startswith("/") or path.rstrip("/") == "/batch":
+        return {"id": item.id, "status": 400, "body": {"detail": "Invalid sub-request path"}}
+    body = json.dumps(item.body, default=str).encode() if item.body is not None else b""
+    headers = [(b"host", request.headers.get("host", "localhost").encode())]
+    if body:
+        headers += [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": item.method.upper(),
+        "scheme": request.url.scheme,
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": headers,
+        "client": request.scope.get("client"),
+        "server": request.scope.get("server"),
+    }
+    sent = {"status": 500, "headers": [], "chunks": []}
+    received = False
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        # The sub-request never disconnects; wait until the response is done
+        await asyncio.Event().wait()
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            sent["status"] = message["status"]
+            sent["headers"] = message.get("headers", [])
+        elif message["type"] == "http.response.body":
+            sent["chunks"].append(message.get("body", b""))
+
+    try:
+        await request.app(scope, receive, send)
+    except Exception as e:
+        print(f"Batch sub-request {item.method} {item.path} failed: {e!r}")
+        return {"id": item.id, "status": 500, "body": {"detail": "Internal Server Error"}}
+
+    content = b"".join(sent["chunks"])
+    content_type = dict(sent["headers"]).get(b"content-type", b"").decode()
+    if content_type.startswith("application/json") and content:
+        result = json.loads(content)
+    else:
+        result = content.decode("utf-8", errors="replace")
+    return {"id": item.id, "status": sent["status"], "body": result}
+
+# Run several API calls at once, e.g. {"requests": [{"path": "/drivers"}, {"path": "/trucks-num"}]}
+@router.post("/batch")
+async def run_batch(batch: BatchRequest, request: Request):
+    if len(batch.requests) > BATCH_MAX_REQUESTS:
+        raise HTTPException(status_code=400, detail=f"A batch can hold at most {BATCH_MAX_REQUESTS} requests")
+    responses = await asyncio.gather(*[dispatch_subrequest(request, item) for item in batch.requests])
+    return {"responses": responses}
@@ -0,0 +1,275 @@
+# Two-tier cache for hot record reads
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+#-----------------------------------------------------cache----------------------------------------------------------------
+# Two-tier cache for hot single-record reads. Each worker keeps a small LRU in
+# front of a tier shared by all workers: Redis when CACHE_URL is set
+# (redis://host:6379/0), otherwise a SQLite file in shared memory for workers
+# on one host. Write handlers invalidate after commit; the invalidation is
+# published through the shared tier and every worker drops the key from its LRU.
+#
+# Every invalidation also bumps the key's version in the shared tier. A read
+# takes the version before it queries MySQL and its value is only stored if
+# the version is still the same (compare-and-set), so a read that raced an
+# invalidation in any worker cannot put the old value back.
+#
+# While a worker's invalidation listener is down it cannot hear other
+# workers' invalidations, so it caches locally only, for CACHE_DEGRADED_TTL,
+# and the listener retries every CACHE_LISTEN_RETRY seconds.
+
+CACHE_URL = os.environ.get("CACHE_URL", "")
+CACHE_TTL = 300
+CACHE_DEGRADED_TTL = 5
+CACHE_LOCAL_SIZE = 2048
+CACHE_POLL_INTERVAL = 0.2
+CACHE_LISTEN_RETRY = 5
+CACHE_CHANNEL = "truckingbusiness:invalidate"
+
+
+class LocalCache:
+    def __init__(self, size):
+        self.size = size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key, value, ttl):
+        with self.lock:
+            self.entries[key] = (value, time.monotonic() + ttl)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def delete(self, keys):
+        with self.lock:
+            for key in keys:
+                self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class SharedMemoryTier:
+    def __init__(self, path):
+        self.path = path
+        self.local = threading.local()
+        db = self.db()
+        db.execute("PRAGMA journal_mode = WAL")
+        db.execute("CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value TEXT, expires REAL)")
+        db.execute("CREATE TABLE IF NOT EXISTS versions (key TEXT PRIMARY KEY, version INTEGER NOT NULL)")
+        db.execute("CREATE TABLE IF NOT EXISTS invalidations (id INTEGER PRIMARY KEY AUTOINCREMENT, key TEXT, at REAL)")
+        db.commit()
+
+    # sqlite connections cannot be shared between threads
+    def db(self):
+        if not hasattr(self.local, "db"):
+            self.local.db = sqlite3.connect(self.path, timeout=5)
+        return self.local.db
+
+    def get(self, key):
+        row = self.db().execute("SELECT value FROM entries WHERE key = ? AND expires > ?", (key, time.time())).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def version(self, key):
+        row = self.db().execute("SELECT version FROM versions WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else 0
+
+    # BEGIN IMMEDIATE takes the write lock, so no invalidation lands between the check and the write
+    def set(self, key, value, ttl, version):
+        db = self.db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            if self.version(key) != version:
+                return False
+            db.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?)", (key, json.dumps(value, default=str), time.time() + ttl))
+            return True
+        finally:
+            db.commit()
+
+    def invalidate(self, keys):
+        db = self.db()
+        now = time.time()
+        db.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key in keys])
+        db.executemany(
+            "INSERT INTO versions VALUES (?, 1) ON CONFLICT (key) DO UPDATE SET version = version + 1",
+            [(key,) for key in keys]
+        )
+        db.executemany("INSERT INTO invalidations (key, at) VALUES (?, ?)", [(key, now) for key in keys])
+        db.execute("DELETE FROM invalidations WHERE at < ?", (now - 60,))
+        db.commit()
+
+    # Poll the invalidation log on a background thread
+    def listen(self, callback, connected):
+        def poll():
+            while True:
+                try:
+                    db = self.db()
+                    last = db.execute("SELECT COALESCE(MAX(id), 0) FROM invalidations").fetchone()[0]
+                    connected(True)
+                    while True:
+                        time.sleep(CACHE_POLL_INTERVAL)
+                        rows = db.execute(
+                            "SELECT id, key FROM invalidations WHERE id > ? ORDER BY id", (last,)
+                        ).fetchall()
+                        if rows:
+                            last = rows[-1][0]
+                            callback([key for _, key in rows])
+                except Exception as e:
+                    print(f"Cache invalidation listener failed, retrying in {CACHE_LISTEN_RETRY}s: {e!r}")
+                    connected(False)
+                    time.sleep(CACHE_LISTEN_RETRY)
+
+        threading.Thread(target=poll, name="cache-invalidations", daemon=True).start()
+
+
+class RedisTier:
+    def __init__(self, url):
+        import redis
+
+        self.redis = redis
+        self.client = redis.Redis.from_url(url)
+
+    @staticmethod
+    def version_key(key):
+        return f"{key}:version"
+
+    def get(self, key):
+        value = self.client.get(key)
+        return json.loads(value) if value is not None else None
+
+    def version(self, key):
+        return int(self.client.get(self.version_key(key)) or 0)
+
+    # WATCH makes the SET fail if an invalidation bumps the version in between
+    def set(self, key, value, ttl, version):
+        with self.client.pipeline() as pipe:
+            try:
+                pipe.watch(self.version_key(key))
+                if int(pipe.get(self.version_key(key)) or 0) != version:
+                    return False
+                pipe.multi()
+                pipe.set(key, json.dumps(value, default=str), ex=ttl)
+                pipe.execute()
+                return True
+            except self.redis.WatchError:
+                return False
+
+    def invalidate(self, keys):
+        with self.client.pipeline() as pipe:
+            pipe.delete(*keys)
+            for key in keys:
+                pipe.incr(self.version_key(key))
+            pipe.publish(CACHE_CHANNEL, json.dumps(keys))
+            pipe.execute()
+
+    def listen(self, callback, connected):
+        def subscribe():
+            while True:
+                try:
+                    pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                    pubsub.subscribe(CACHE_CHANNEL)
+                    connected(True)
+                    for message in pubsub.listen():
+                        callback(json.loads(message["data"]))
+                except Exception as e:
+                    print(f"Cache invalidation listener failed, retrying in {CACHE_LISTEN_RETRY}s: {e!r}")
+                    connected(False)
+                    time.sleep(CACHE_LISTEN_RETRY)
+
+        threading.Thread(target=subscribe, name="cache-invalidations", daemon=True).start()
+
+
+class Cache:
+    def __init__(self, shared):
+        self.local = LocalCache(CACHE_LOCAL_SIZE)
+        self.shared = shared
+        # Bumped by every invalidation this worker hears of; a value read from
+        # MySQL only goes into the LRU when none happened while it was read
+        self.epoch = 0
+        self.listening = False
+        shared.listen(self.evict, self.listener_state)
+
+    def evict(self, keys):
+        self.epoch += 1
+        self.local.delete(keys)
+
+    # Invalidations may have been missed while the listener was down (or
+    # before it came up), so the LRU starts over on every change
+    def listener_state(self, listening):
+        if listening != self.listening:
+            self.listening = listening
+            self.epoch += 1
+            self.local.clear()
+
+    # The shared tier is an optimization: when it is down reads fall through
+    # to MySQL instead of failing
+    def get(self, key):
+        value = self.local.get(key)
+        if value is None and self.listening:
+            try:
+                value = self.shared.get(key)
+            except Exception as e:
+                print(f"Shared cache read failed: {e!r}")
+                return None
+            if value is not None:
+                self.local.set(key, value, CACHE_TTL)
+        return value
+
+    # Taken before reading MySQL and handed back to set()
+    def version(self, key):
+        shared_version = None
+        if self.listening:
+            try:
+                shared_version = self.shared.version(key)
+            except Exception as e:
+                print(f"Shared cache version read failed: {e!r}")
+        return self.epoch, shared_version
+
+    def set(self, key, value, version):
+        epoch, shared_version = version
+        if shared_version is None:
+            if epoch == self.epoch:
+                self.local.set(key, value, CACHE_DEGRADED_TTL)
+            return
+        try:
+            stored = self.shared.set(key, value, CACHE_TTL, shared_version)
+        except Exception as e:
+            print(f"Shared cache write failed: {e!r}")
+            return
+        if stored and epoch == self.epoch:
+            self.local.set(key, value, CACHE_TTL)
+
+    def invalidate(self, *keys):
+        keys = list(dict.fromkeys(keys))
+        self.evict(keys)
+        try:
+            self.shared.invalidate(keys)
+        except Exception as e:
+            print(f"Cache invalidation of {keys} failed: {e!r}")
+
+
+def shared_cache_tier():
+    if CACHE_URL:
+        return RedisTier(CACHE_URL)
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return SharedMemoryTier(os.path.join(directory, "truckingbusiness-cache.sqlite"))
+
+
+cache = Cache(shared_cache_tier())
@@ -0,0 +1,210 @@
+# Landing page data in one round-trip
+import asyncio
+import datetime
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import mysql.connector
+from fastapi import APIRouter
+from mysql.connector import pooling
+
+from .db import DB_BREAKER_RESET, DB_CONFIG, DatabaseUnavailable, db_breaker
+from .fleet import TRIP_MAX_DAYS
+
+router = APIRouter()
+
+#-----------------------------------------------------dashboard------------------------------------------------------------
+# The landing page in one request: each section is an independent query run
+# concurrently on its own pooled connection, bounded by a per-section timeout
+# (a section that misses it comes back null and is listed in "errors"), and
+# complete results are cached for a few seconds.
+
+DASHBOARD_TTL = 15
+DASHBOARD_SECTION_TIMEOUT = 3.0
+DASHBOARD_EXPIRY_DAYS = 30
+DASHBOARD_RECENT_TRIPS = 5
+
+
+def expiring_condition(columns):
+    return " OR ".join(
+        f"{c} BETWEEN CURDATE() AND CURDATE() + INTERVAL {DASHBOARD_EXPIRY_DAYS} DAY" for c in columns
+    )
+
+
+def dashboard_trucks(cursor, since):
+    cursor.execute(f"""
+        SELECT COUNT(*) AS total,
+               COALESCE(SUM({expiring_condition(["mulkiya_exp", "ins_exp"])}), 0) AS expiringSoon
+        FROM Trucks
+    """)
+    result = cursor.fetchone()
+    cursor.execute("""
+        SELECT COUNT(DISTINCT truck_no) AS active FROM trips
+        WHERE truck_no IS NOT NULL AND date BETWEEN CURDATE() - INTERVAL %s DAY AND CURDATE()
+          AND COALESCE(end_date, date) >= CURDATE()
+    """, (TRIP_MAX_DAYS,))
+    result.update(cursor.fetchone())
+    cursor.execute("""
+        SELECT COUNT(DISTINCT truck_number) AS maintenance FROM truckmaintenance
+        WHERE status = 'UNPAID' AND date >= CURDATE() - INTERVAL 7 DAY
+    """)
+    result.update(cursor.fetchone())
+    return result
+
+
+def dashboard_trailers(cursor, since):
+    cursor.execute(f"""
+        SELECT COUNT(*) AS total,
+               COALESCE(SUM({expiring_condition(["mulkiya_exp", "oman_ins_exp"])}), 0) AS expiringSoon
+        FROM trailers
+    """)
+    result = cursor.fetchone()
+    cursor.execute("SELECT COUNT(DISTINCT trailer_no) AS active FROM Trucks WHERE trailer_no IS NOT NULL AND trailer_no <> ''")
+    result.update(cursor.fetchone())
+    return result
+
+
+def dashboard_employees(cursor, since):
+    columns = ["visa_exp", "health_ins_exp", "emp_ins_exp", "license_exp"]
+    cursor.execute(f"""
+        SELECT COUNT(*) AS total,
+               COALESCE(SUM(designation = 'driver'), 0) AS drivers,
+               COALESCE(SUM({expiring_condition(columns)}), 0) AS expiringSoon
+        FROM employees
+    """)
+    return cursor.fetchone()
+
+
+def dashboard_trips(cursor, since):
+    cursor.execute("""
+        SELECT COUNT(*) AS total,
+               COALESCE(SUM(COALESCE(end_date, date) < CURDATE()), 0) AS completed,
+               COALESCE(SUM(COALESCE(end_date, date) >= CURDATE()), 0) AS inProgress,
+               COALESCE(SUM(COALESCE(company_rate, 0) + COALESCE(extra_delivery, 0) + COALESCE(extra_charges, 0)), 0) AS revenue,
+               COALESCE(SUM(company_profit), 0) AS profit
+        FROM trips WHERE date >= %s
+    """, (since,))
+    return cursor.fetchone()
+
+
+def dashboard_maintenance(cursor, since):
+    cursor.execute("""
+        SELECT COUNT(*) AS total,
+               COALESCE(SUM(status = 'UNPAID'), 0) AS pending,
+               COALESCE(SUM(COALESCE(credit_card, 0) + COALESCE(bank, 0) + COALESCE(cash, 0) + COALESCE(vat, 0)), 0) AS cost
+        FROM truckmaintenance WHERE date >= %s
+    """, (since,))
+    return cursor.fetchone()
+
+
+def dashboard_fines(cursor, since):
+    cursor.execute("""
+        SELECT COUNT(*) AS total,
+               COALESCE(SUM(payment_status = 'UNPAID'), 0) AS pending,
+               COALESCE(SUM(amount), 0) AS amount
+        FROM fines WHERE fine_date >= %s
+    """, (since,))
+    return cursor.fetchone()
+
+
+def dashboard_recent_trips(cursor, since):
+    cursor.execute("""
+        SELECT trip_id, date, end_date, client, destination_country, truck_no, driver, company_rate
+        FROM trips ORDER BY date DESC, trip_id DESC LIMIT %s
+    """, (DASHBOARD_RECENT_TRIPS,))
+    return cursor.fetchall()
+
+
+DASHBOARD_SECTIONS = {
+    "trucks": dashboard_trucks,
+    "trailers": dashboard_trailers,
+    "employees": dashboard_employees,
+    "trips": dashboard_trips,
+    "maintenance": dashboard_maintenance,
+    "fines": dashboard_fines,
+    "recentTrips": dashboard_recent_trips,
+}
+
+# Threads (not the shared request threadpool) so a section that times out can
+# be abandoned; the server stops its query at the same limit.
+dashboard_executor = ThreadPoolExecutor(max_workers=2 * len(DASHBOARD_SECTIONS), thread_name_prefix="dashboard")
+dashboard_pool = None
+dashboard_pool_lock = threading.Lock()
+dashboard_lock = asyncio.Lock()
+dashboard_cache = {"expires": 0.0, "data": None}
+
+
+# The sections run on several threads at once; only one of them may build the pool
+def get_dashboard_connection():
+    global dashboard_pool
+    with dashboard_pool_lock:
+        if dashboard_pool is None:
+            dashboard_pool = db_breaker.connect(lambda: pooling.MySQLConnectionPool(
+                pool_name="dashboard", pool_size=2 * len(DASHBOARD_SECTIONS), **DB_CONFIG
+            ))
+    return db_breaker.connect(dashboard_pool.get_connection)
+
+
+# The pool opens all its connections when it is created; do that at startup
+# instead of on the first dashboard load
+def warm_dashboard_pool():
+    try:
+        get_dashboard_connection().close()
+    except mysql.connector.Error as e:
+        print(f"Could not warm the dashboard pool: {e!r}")
+
+
+# The time limit is a session setting, so it is put back before the pool hands
+# the connection to its next borrower
+def run_dashboard_section(section, since):
+    conn = get_dashboard_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute("SET SESSION MAX_EXECUTION_TIME = %s", (int(DASHBOARD_SECTION_TIMEOUT * 1000),))
+        return section(cursor, since)
+    finally:
+        try:
+            cursor.execute("SET SESSION MAX_EXECUTION_TIME = DEFAULT")
+        except mysql.connector.Error as e:
+            print(f"Could not reset the dashboard statement limit: {e!r}")
+        cursor.close()
+        conn.close()
+
+
+async def build_dashboard():
+    loop = asyncio.get_running_loop()
+    since = datetime.date.today().replace(month=1, day=1)
+    names = list(DASHBOARD_SECTIONS)
+    results = await asyncio.gather(*[
+        asyncio.wait_for(
+            loop.run_in_executor(dashboard_executor, run_dashboard_section, DASHBOARD_SECTIONS[name], since),
+            DASHBOARD_SECTION_TIMEOUT,
+        )
+        for name in names
+    ], return_exceptions=True)
+
+    data = {"generated_at": datetime.datetime.now(), "since": since, "errors": []}
+    for name, result in zip(names, results):
+        if isinstance(result, BaseException):
+            print(f"Dashboard section {name} failed: {result!r}")
+            data["errors"].append(name)
+            data[name] = None
+        else:
+            data[name] = result
+    expiring = [data[name]["expiringSoon"] for name in ("trucks", "trailers", "employees") if data[name]]
+    data["documents"] = {"expiringSoon": sum(expiring)}
+    return data
+
+# Everything the landing page shows, in one round-trip
+@router.get("/dashboard")
+async def get_dashboard():
+    async with dashboard_lock:
+        if dashboard_cache["data"] is None or dashboard_cache["expires"] < time.monotonic():
+            data = await build_dashboard()
+            if data["errors"]:
+                if db_breaker.state != "closed":
+                    raise DatabaseUnavailable(int(DB_BREAKER_RESET))
+                return data
+            dashboard_cache.update(data=data, expires=time.monotonic() + DASHBOARD_TTL)
+        return dashboard_cache["data"]
@@ -0,0 +1,530 @@
+# Database access: connections, schema helpers, row versions, statement deadlines and the circuit breaker
+import contextvars
+import importlib.util
+import io
+import itertools
+import threading
+import time
+from typing import List
+
+import mysql.connector
+from mysql.connector import FieldType
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import TypeAdapter
+
+router = APIRouter()
+
+#-----------------------------------------------------connections----------------------------------------------------------
+DB_CONFIG = {
+    "host": "localhost",
+    "user": "root",
+    "password": "",
+    "database": "TruckingBusiness",
+    "connection_timeout": 5,
+}
+
+def get_db_connection():
+    conn = db_breaker.connect(lambda: mysql.connector.connect(**DB_CONFIG))
+    track_statement_deadline(conn)
+    return conn
+
+# Handlers release their connection in a finally block; a write that an error
+# (404, 409, lock conflict) interrupted is rolled back so its locks go at once
+def release_db_connection(conn, cursor):
+    try:
+        cursor.close()
+        if conn.in_transaction:
+            conn.rollback()
+    except mysql.connector.Error:
+        pass  # the connection is broken; closing it is all that is left
+    finally:
+        conn.close()
+
+# Schema helpers (MySQL has no ADD COLUMN / ADD INDEX IF NOT EXISTS)
+def add_column_if_missing(cursor, table, column, definition):
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.columns
+        WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s
+    """, (table, column))
+    if cursor.fetchone()[0] == 0:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+def add_index_if_missing(cursor, table, index_name, columns):
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+    """, (table, index_name))
+    if cursor.fetchone()[0] == 0:
+        cursor.execute(f"ALTER TABLE {table} ADD INDEX {index_name} ({columns})")
+
+
+#-----------------------------------------------------row versions---------------------------------------------------------
+# Optimistic concurrency for the PUT handlers: every row carries a version that
+# each update bumps. A client sends back the version it read (If-Match: "3" or
+# the body's version field) and the UPDATE only matches that version, so a
+# stale edit changes nothing and gets a 409 instead of overwriting.
+VERSIONED_TABLES = [
+    "employees", "other_employees", "trucks", "other_trucks", "trailers", "other_trailer", "clients",
+    "truckmaintenance", "suppliers", "other_owner", "inventory", "investors", "investor1_accounts",
+    "investor2_accounts", "salary", "fines", "trips",
+]
+
+
+@router.on_event("startup")
+def ensure_version_columns():
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    for table in VERSIONED_TABLES:
+        add_column_if_missing(cursor, table, "version", "INT NOT NULL DEFAULT 1")
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+
+# Version the client expects to overwrite; None when it sent neither (last write wins)
+def expected_version(if_match, body=None):
+    if if_match:
+        value = if_match.strip()
+        if value.startswith("W/"):
+            value = value[2:]
+        value = value.strip('"')
+        if value == "*":
+            return None
+        try:
+            return int(value)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="If-Match must be a row version")
+    return getattr(body, "version", None)
+
+
+# Called when a versioned UPDATE matched nothing: 409 if the row exists (so its
+# version moved on), otherwise the caller reports 404
+def raise_if_stale(cursor, table, key_column, key):
+    cursor.execute(f"SELECT version FROM {table} WHERE {key_column} = %s", (key,))
+    row = cursor.fetchone()
+    if row:
+        raise_if_stale_version(row[0])
+
+
+def raise_if_stale_version(version):
+    raise HTTPException(status_code=409, detail={
+        "message": "This record was changed by someone else; reload it and try again",
+        "version": version,
+    })
+
+#-----------------------------------------------------statement deadlines--------------------------------------------------
+# Every request gets a deadline from its admission class (or a per-route
+# override). Connections opened for the request carry it as the session
+# MAX_EXECUTION_TIME on reads, which MySQL enforces itself; a watchdog thread
+# KILL QUERYs anything still running past the deadline (writes included), and
+# when the client disconnects mid-request its queries are killed at once so the
+# worker thread and connection are freed.
+
+STATEMENT_DEADLINES = {"light": 5, "write": 15, "heavy": 30, "upload": 60}
+STATEMENT_DEADLINE_ROUTES = {
+    # path: seconds
+    "/sync": 60,
+    "/analytics/query": 60,
+    # the streamed list reads keep their statement open while rows are sent
+    "/trips": 60,
+    "/fines": 60,
+    "/maintenance": 60,
+    "/salaries": 60,
+    "/fines/match": 300,
+}
+STATEMENT_KILL_GRACE = 1.0
+ER_QUERY_INTERRUPTED = 1317
+ER_QUERY_TIMEOUT = 3024
+ER_LOCK_WAIT_TIMEOUT = 1205
+ER_LOCK_DEADLOCK = 1213
+
+request_statements = contextvars.ContextVar("request_statements", default=None)
+running_statements = {}  # connection_id: (deadline, route)
+running_statements_lock = threading.Lock()
+statement_stats = {}
+
+
+def count_statement_event(route, event):
+    stats = statement_stats.setdefault(route, {"timed_out": 0, "killed": 0, "cancelled": 0})
+    stats[event] += 1
+
+
+def route_of(scope):
+    route = scope.get("route")
+    return route.path if route is not None else scope["path"]
+
+
+# Called by get_db_connection for connections opened while serving a request
+def track_statement_deadline(conn):
+    statements = request_statements.get()
+    if statements is None:
+        return
+    if statements["read_only"]:
+        remaining = max(1, int((statements["deadline"] - time.monotonic()) * 1000))
+        cursor = conn.cursor()
+        cursor.execute("SET SESSION MAX_EXECUTION_TIME = %s", (remaining,))
+        cursor.close()
+    statements["connections"].append(conn.connection_id)
+    with running_statements_lock:
+        running_statements[conn.connection_id] = (statements["deadline"], statements["scope"])
+
+
+def kill_queries(connection_ids):
+    if not connection_ids:
+        return
+    conn = mysql.connector.connect(**DB_CONFIG)
+    cursor = conn.cursor()
+    for connection_id in connection_ids:
+        try:
+            cursor.execute("KILL QUERY %s", (connection_id,))
+        except mysql.connector.Error:
+            pass  # the connection is already gone
+    cursor.close()
+    conn.close()
+
+
+def statement_watchdog():
+    while True:
+        time.sleep(1)
+        now = time.monotonic()
+        with running_statements_lock:
+            overdue = [
+                (connection_id, scope) for connection_id, (deadline, scope) in running_statements.items()
+                if now > deadline + STATEMENT_KILL_GRACE
+            ]
+            for connection_id, _ in overdue:
+                del running_statements[connection_id]
+        if overdue:
+            try:
+                kill_queries([connection_id for connection_id, _ in overdue])
+            except mysql.connector.Error as e:
+                print(f"Statement watchdog could not kill queries: {e!r}")
+                continue
+            for _, scope in overdue:
+                count_statement_event(route_of(scope), "killed")
+
+
+@router.on_event("startup")
+def start_statement_watchdog():
+    threading.Thread(target=statement_watchdog, name="statement-watchdog", daemon=True).start()
+
+
+async def database_error_handler(request: Request, exc: mysql.connector.Error):
+    if exc.errno in (ER_QUERY_TIMEOUT, ER_QUERY_INTERRUPTED):
+        if exc.errno == ER_QUERY_TIMEOUT:
+            count_statement_event(route_of(request.scope), "timed_out")
+        return JSONResponse(status_code=504, content={"detail": "The query took too long and was stopped"})
+    if exc.errno in (ER_LOCK_DEADLOCK, ER_LOCK_WAIT_TIMEOUT):
+        # MySQL has rolled the statement (or, for a deadlock, the whole
+        # transaction) back; nothing was written, so the client can retry as-is
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "The record was locked by another write; retry the request"},
+            headers={"Retry-After": "1"},
+        )
+    if exc.errno in CR_CONNECTION_ERRORS:
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "Could not reach the database"},
+            headers={"Retry-After": "1", "X-Circuit": db_breaker.state},
+        )
+    print(f"Database error at {request.url}: {exc!r}")
+    return JSONResponse(status_code=500, content={"detail": "Database error"})
+
+# Statement timeouts, watchdog kills and disconnect cancellations per route
+@router.get("/metrics/statements")
+def get_statement_metrics():
+    with running_statements_lock:
+        running = len(running_statements)
+    return {"running": running, "routes": statement_stats}
+
+#-----------------------------------------------------circuit breaker------------------------------------------------------
+# After DB_BREAKER_THRESHOLD failed connects in a row the breaker opens and
+# every connect fails at once with a 503 instead of waiting on a dead server.
+# Once DB_BREAKER_RESET has passed one request is let through as a probe; if
+# it connects the breaker closes, otherwise it stays open for another round.
+DB_BREAKER_THRESHOLD = 3
+DB_BREAKER_RESET = 10.0
+CR_CONNECTION_ERRORS = {2002, 2003, 2006, 2013, 2055}
+
+class DatabaseUnavailable(Exception):
+    def __init__(self, retry_after):
+        super().__init__("Database unavailable")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    def __init__(self, threshold, reset_after):
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.lock = threading.Lock()
+        self.failures = 0
+        self.opened_at = None
+        self.probe_started = None
+        self.stats = {"opened": 0, "rejected": 0}
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        return "open" if time.monotonic() - self.opened_at < self.reset_after else "half-open"
+
+    def allow(self):
+        with self.lock:
+            if self.opened_at is None:
+                return
+            now = time.monotonic()
+            if now - self.opened_at >= self.reset_after and (
+                self.probe_started is None or now - self.probe_started >= self.reset_after
+            ):
+                self.probe_started = now
+                return
+            self.stats["rejected"] += 1
+            raise DatabaseUnavailable(max(1, int(self.opened_at + self.reset_after - now + 1)))
+
+    def succeeded(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probe_started = None
+
+    def failed(self):
+        with self.lock:
+            self.failures += 1
+            if self.probe_started is not None or (self.opened_at is None and self.failures >= self.threshold):
+                if self.probe_started is None:
+                    self.stats["opened"] += 1
+                self.opened_at = time.monotonic()
+                self.probe_started = None
+
+    def connect(self, connect):
+        self.allow()
+        try:
+            conn = connect()
+        except mysql.connector.errors.PoolError:
+            raise
+        except mysql.connector.Error:
+            self.failed()
+            raise
+        self.succeeded()
+        return conn
+
+
+db_breaker = CircuitBreaker(DB_BREAKER_THRESHOLD, DB_BREAKER_RESET)
+
+
+async def database_unavailable_handler(request: Request, exc: DatabaseUnavailable):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Database unavailable"},
+        headers={"Retry-After": str(exc.retry_after), "X-Circuit": db_breaker.state},
+    )
+
+#-----------------------------------------------------compact rows---------------------------------------------------------
+# Large list reads skip the dictionary cursor. Rows come off a plain cursor as
+# tuples in batches of ROW_BATCH, keyed by the cursor's one column list, and
+# each batch is encoded and sent before the next one is fetched, so only one
+# batch is ever held in memory.
+#
+# The format follows the Accept header: JSON by default, MessagePack (the same
+# rows as the JSON, packed) or an Arrow IPC stream, which carries the table's
+# columns with their SQL types straight from the cursor, one record batch per
+# batch of rows. msgpack and pyarrow are optional; without them those types
+# are simply not offered.
+ROW_BATCH = 2000
+LIST_FORMATS = {
+    # media type: (encoding, module it needs)
+    "application/json": ("json", None),
+    "application/msgpack": ("msgpack", "msgpack"),
+    "application/x-msgpack": ("msgpack", "msgpack"),
+    "application/vnd.apache.arrow.stream": ("arrow", "pyarrow"),
+}
+ARROW_TYPES = {
+    "TINY": "int64", "SHORT": "int64", "INT24": "int64", "LONG": "int64", "LONGLONG": "int64", "YEAR": "int64",
+    "BIT": "int64",
+    "FLOAT": "double", "DOUBLE": "double", "DECIMAL": "double", "NEWDECIMAL": "double",
+    "DATE": "date32", "NEWDATE": "date32", "DATETIME": "timestamp[us]", "TIMESTAMP": "timestamp[us]",
+    "TIME": "duration[us]",
+}
+list_adapters = {}
+installed_modules = {}
+
+
+def fetch_batches(cursor, size=ROW_BATCH):
+    while True:
+        batch = cursor.fetchmany(size)
+        if not batch:
+            return
+        yield batch
+
+
+def fetch_rows(cursor, size=ROW_BATCH):
+    columns = cursor.column_names
+    for batch in fetch_batches(cursor, size):
+        yield [dict(zip(columns, values)) for values in batch]
+
+
+def list_adapter(model):
+    if model not in list_adapters:
+        list_adapters[model] = TypeAdapter(List[model])
+    return list_adapters[model]
+
+
+def module_installed(name):
+    if name not in installed_modules:
+        installed_modules[name] = importlib.util.find_spec(name) is not None
+    return installed_modules[name]
+
+
+# (value, quality) for each entry of an Accept-style header, in header order
+def accept_values(header):
+    values = []
+    for part in (header or "").split(","):
+        value, _, params = part.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, q = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(q)
+                except ValueError:
+                    quality = 0.0
+        if value.strip():
+            values.append((value.strip().lower(), quality))
+    return values
+
+
+# The client's most preferred list format that we can produce, else JSON
+def list_media_type(accept):
+    for media_type, quality in sorted(accept_values(accept), key=lambda value: -value[1]):
+        if quality == 0 or media_type in ("*/*", "application/*"):
+            break
+        if media_type in LIST_FORMATS:
+            module = LIST_FORMATS[media_type][1]
+            if module is None or module_installed(module):
+                return media_type
+    return "application/json"
+
+
+def json_body(adapter, batches):
+    separator = b"["
+    for batch in batches:
+        items = adapter.dump_json(adapter.validate_python(batch))[1:-1]
+        if items:
+            yield separator + items
+            separator = b","
+    yield b"[]" if separator == b"[" else b"]"
+
+
+# A MessagePack array needs its length up front, so the packed rows are held
+# until the cursor is exhausted
+def msgpack_body(adapter, batches):
+    import msgpack
+
+    packer = msgpack.Packer()
+    count, chunks = 0, []
+    for batch in batches:
+        rows = adapter.dump_python(adapter.validate_python(batch), mode="json")
+        chunks.append(b"".join(packer.pack(row) for row in rows))
+        count += len(rows)
+    yield packer.pack_array_header(count)
+    yield from chunks
+
+
+def arrow_array(values, arrow_type):
+    import pyarrow as pa
+
+    if pa.types.is_floating(arrow_type):
+        values = [None if value is None else float(value) for value in values]
+    elif pa.types.is_string(arrow_type):
+        values = [value if value is None or isinstance(value, (str, bytes)) else str(value) for value in values]
+    return pa.array(values, type=arrow_type)
+
+
+def arrow_body(description, batches):
+    import pyarrow as pa
+
+    schema = pa.schema([
+        (c[0], pa.type_for_alias(ARROW_TYPES.get(FieldType.get_info(c[1]), "string"))) for c in description
+    ])
+    sink = io.BytesIO()
+
+    def drain():
+        chunk = sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+        return chunk
+
+    with pa.ipc.new_stream(sink, schema) as writer:
+        for batch in batches:
+            columns = list(zip(*batch))
+            writer.write_batch(pa.record_batch(
+                [arrow_array(values, field.type) for values, field in zip(columns, schema)], schema=schema
+            ))
+            yield drain()
+    yield drain()
+
+
+# A streamed body that fails part-way must not reach the client looking
+# complete. The failure is flagged on the request's scope, and the outermost
+# middleware aborts the connection instead of ending the body.
+class StreamAborted(Exception):
+    pass
+
+
+def mark_stream_failed(scope=None):
+    if scope is None:
+        statements = request_statements.get()
+        if statements is None:
+            return
+        scope = statements["scope"]
+    scope["stream_failed"] = True
+
+
+# Response for a list route: the head batches of row dicts (e.g. archived
+# rows, read as they are sent) followed by the executed cursor's rows, as a
+# list of model in the format the Accept header asks for. The first chunk is
+# produced (and its rows validated) before the response starts, so a bad row
+# there is an ordinary 500. The cursor and connection are closed once the last
+# row is sent.
+def stream_rows(conn, cursor, model, head=(), accept=None):
+    media_type = list_media_type(accept)
+    encoding = LIST_FORMATS[media_type][0]
+    head_batches = iter(head)
+    if encoding == "arrow":
+        columns = cursor.column_names
+        body = arrow_body(cursor.description, itertools.chain(
+            ([tuple(row.get(column) for column in columns) for row in batch] for batch in head_batches),
+            fetch_batches(cursor),
+        ))
+    else:
+        adapter = list_adapter(model)
+        batches = itertools.chain(head_batches, fetch_rows(cursor))
+        body = json_body(adapter, batches) if encoding == "json" else msgpack_body(adapter, batches)
+
+    def close():
+        try:
+            cursor.close()
+        except mysql.connector.Error:
+            pass  # rows left unread because the client went away
+        conn.close()
+
+    try:
+        first = next(body, b"")
+    except BaseException:
+        close()
+        raise
+
+    def stream():
+        try:
+            yield first
+            yield from body
+        except Exception as e:
+            print(f"Streamed {model.__name__} list failed part-way: {e!r}")
+            mark_stream_failed()
+            raise
+        finally:
+            close()
+
+    return StreamingResponse(stream(), media_type=media_type, headers={"Vary": "Accept"})
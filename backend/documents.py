@@ -0,0 +1,1085 @@
+# Document uploads for every record type
+import datetime
+import os
+import shutil
+from typing import List, Optional
+
+from fastapi import APIRouter, File, HTTPException, UploadFile
+from fastapi.responses import FileResponse
+from pydantic import BaseModel, validator
+
+from .db import get_db_connection
+from .includes import INCLUDES
+
+router = APIRouter()
+
+#------------------------------------------documents-----------------------------------------
+#--------------------------------------------------------------------------------------------
+
+#-------------------------------------------documents-employee-------------------------------
+
+# Pydantic model for response
+class Document(BaseModel):
+    type: str
+    url: str
+    uploadDate: Optional[str]
+    employee_name: str
+
+             # Validator to ensure load_date is formatted as a string
+    @validator('uploadDate', pre=True)
+    def format_load_date(cls, v):
+        if isinstance(v, datetime.date):
+            return v.strftime('%d-%m-%Y')  
+        return v
+
+
+# Get all documents for an employee
+@router.get("/employees/{employee_name}/documents", response_model=List[Document])
+def get_documents(employee_name: str):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    cursor.execute("SELECT * FROM employee_documents WHERE employee_name = %s", (employee_name,))
+    documents = cursor.fetchall()
+
+    cursor.close()
+    conn.close()
+
+    if not documents:
+        raise HTTPException(status_code=404, detail="No documents found for this employee")
+
+    return documents
+
+# View/download a document by name
+@router.get("/employees/{employee_name}/documents/{type}")
+def view_document(employee_name: str, type: str):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    query = "SELECT url FROM employee_documents WHERE employee_name = %s and type =%s"
+    cursor.execute(query, (employee_name,type))
+    result = cursor.fetchone()
+
+    cursor.close()
+    conn.close()
+
+    if not result:
+        raise HTTPException(status_code=404, detail="Document not found")
+
+    file_path = result["url"]
+
+    if not os.path.exists(file_path):
+        raise HTTPException(status_code=404, detail="File not found on server")
+
+    return FileResponse(path=file_path, filename=os.path.basename(file_path))
+
+#delete documnet
+@router.delete("/employees/{employee_name}/documents/{type}")
+def delete_document(employee_name: str, type: str):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    # Get file path first
+    cursor.execute(
+        "SELECT url FROM employee_documents WHERE employee_name = %s AND type = %s",
+        (employee_name, type)
+    )
+    result = cursor.fetchone()
+
+    if not result:
+        cursor.close()
+        conn.close()
+        raise HTTPException(status_code=404, detail="Document not found")
+
+    file_path = result["url"]
+
+    # Delete file from disk
+    if os.path.exists(file_path):
+        os.remove(file_path)
+
+    # Delete DB record
+    cursor.execute(
+        "DELETE FROM employee_documents WHERE employee_name = %s AND type = %s",
+        (employee_name, type)
+    )
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+    return {"message": f"{type} document deleted for {employee_name}"}
+
+#upload document by type
+@router.post("/employees/{employee_name}/documents/{type}/upload", response_model=Document)
+def upload_document(employee_name: str, type: str,    file: UploadFile = File(...)):
+    # Save the file to a directory
+    uploads_dir = "EmployeeDocs"
+    os.makedirs(uploads_dir, exist_ok=True)
+
+    file_path = os.path.join(uploads_dir, f"{employee_name}_{type}_{file.filename}")
+    
+    with open(file_path, "wb") as buffer:
+        shutil.copyfileobj(file.file, buffer)
+
+    uploadDate = datetime.datetime.today().strftime('%Y-%m-%d')
+
+    # Insert into DB
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    query = """
+        INSERT INTO employee_documents (type, url, uploadDate, employee_name)
+        VALUES (%s, %s, %s, %s)
+    """
+    values = (type, file_path, uploadDate, employee_name)
+    cursor.execute(query, values)
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+    return {
+        "type": type,
+        "url": file_path,
+        "uploadDate": uploadDate,
+        "employee_name": employee_name
+    }
+
+#------------------------------------------------document-trucks-------------------------------------------
+
+# Pydantic model for truck document
+class TruckDocument(BaseModel):
+    type: str
+    url: str
+    uploadDate: Optional[str]
+    truck_number: str
+
+    @validator('uploadDate', pre=True)
+    def format_upload_date(cls, v):
+        if isinstance(v, datetime.date):
+            return v.strftime('%d-%m-%Y')  
+        return v
+
+
+# Get all documents for a truck
+@router.get("/trucks/{truck_number}/documents", response_model=List[TruckDocument])
+def get_truck_documents(truck_number: str):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    cursor.execute("SELECT * FROM truck_documents WHERE truck_number = %s", (truck_number,))
+    documents = cursor.fetchall()
+
+    cursor.close()
+    conn.close()
+
+    if not documents:
+        raise HTTPException(status_code=404, detail="No documents found for this truck")
+
+    return documents
+
+# View/download a truck document
+@router.get("/trucks/{truck_number}/documents/{type}")
+def view_truck_document(truck_number: str, type: str):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    query = "SELECT url FROM truck_documents WHERE truck_number = %s and type = %s"
+    cursor.execute(query, (truck_number, type))
+    result = cursor.fetchone()
+
+    cursor.close()
+    conn.close()
+
+    if not result:
+        raise HTTPException(status_code=404, detail="Document not found")
+
+    file_path = result["url"]
+
+    if not os.path.exists(file_path):
+        raise HTTPException(status_code=404, detail="File not found on server")
+
+    return FileResponse(path=file_path, filename=os.path.basename(file_path))
+
+# Delete a truck document
+@router.delete("/trucks/{truck_number}/documents/{type}")
+def delete_truck_document(truck_number: str, type: str):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    # Get file path first
+    cursor.execute(
+        "SELECT url FROM truck_documents WHERE truck_number = %s AND type = %s",
+        (truck_number, type)
+    )
+    result = cursor.fetchone()
+
+    if not result:
+        cursor.close()
+        conn.close()
+        raise HTTPException(status_code=404, detail="Document not found")
+
+    file_path = result["url"]
+
+    # Delete file from disk
+    if os.path.exists(file_path):
+        os.remove(file_path)
+
+    # Delete DB record
+    cursor.execute(
+        "DELETE FROM truck_documents WHERE truck_number = %s AND type = %s",
+        (truck_number, type)
+    )
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+    return {"message": f"{type} document deleted for truck {truck_number}"}
+
+# Upload a truck document
+@router.post("/trucks/{truck_number}/documents/{type}/upload", response_model=TruckDocument)
+def upload_truck_document(truck_number: str, type: str, file: UploadFile = File(...)):
+    uploads_dir = "TruckDocs"
+    os.makedirs(uploads_dir, exist_ok=True)
+
+    file_path = os.path.join(uploads_dir, f"{truck_number}_{type}_{file.filename}")
+    
+    with open(file_path, "wb") as buffer:
+        shutil.copyfileobj(file.file, buffer)
+
+    uploadDate = datetime.datetime.today().strftime('%Y-%m-%d')
+
+    # Insert into DB
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    query = """
+        INSERT INTO truck_documents (type, url, uploadDate, truck_number)
+        VALUES (%s, %s, %s, %s)
+    """
+    values = (type, file_path, uploadDate, truck_number)
+    cursor.execute(query, values)
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+    return {
+        "type": type,
+        "url": file_path,
+        "uploadDate": uploadDate,
+        "truck_number": truck_number
+    }
+
+#-------------------------------------------------------trailer-documents--------------------------------------------------------------------
+class TrailerDocument(BaseModel):
+    type: str
+    url: str
+    uploadDate: Optional[str]
+    trailer_number: str
+
+    @validator('uploadDate', pre=True)
+    def format_upload_date(cls, v):
+        if isinstance(v, datetime.date):
+            return v.strftime('%d-%m-%Y')  
+        return v
+
+# Get all documents for a trailer
+@router.get("/trailers/{trailer_number}/documents", response_model=List[TrailerDocument])
+def get_trailer_documents(trailer_number: str):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    cursor.execute("SELECT * FROM trailer_documents WHERE trailer_number = %s", (trailer_number,))
+    documents = cursor.fetchall()
+
+    cursor.close()
+    conn.close()
+
+    if not documents:
+        raise HTTPException(status_code=404, detail="No documents found for this trailer")
+
+    return documents
+
+# View/download a trailer document
+@router.get("/trailers/{trailer_number}/documents/{type}")
+def view_trailer_document(trailer_number: str, type: str):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    query = "SELECT url FROM trailer_documents WHERE trailer_number = %s and type = %s"
+    cursor.execute(query, (trailer_number, type))
+    result = cursor.fetchone()
+
+    cursor.close()
+    conn.close()
+
+    if not result:
+        raise HTTPException(status_code=404, detail="Document not found")
+
+    file_path = result["url"]
+
+    if not os.path.exists(file_path):
+        raise HTTPException(status_code=404, detail="File not found on server")
+
+    return FileResponse(path=file_path, filename=os.path.basename(file_path))
+
+# Delete a trailer document
+@router.delete("/trailers/{trailer_number}/documents/{type}")
+def delete_trailer_document(trailer_number: str, type: str):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    cursor.execute(
+        "SELECT url FROM trailer_documents WHERE trailer_number = %s AND type = %s",
+        (trailer_number, type)
+    )
+    result = cursor.fetchone()
+
+    if not result:
+        cursor.close()
+        conn.close()
+        raise HTTPException(status_code=404, detail="Document not found")
+
+    file_path = result["url"]
+
+    if os.path.exists(file_path):
+        os.remove(file_path)
+
+    cursor.execute(
+        "DELETE FROM trailer_documents WHERE trailer_number = %s AND type = %s",
+        (trailer_number, type)
+    )
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+    return {"message": f"{type} document deleted for trailer {trailer_number}"}
+
+# Upload a trailer document
+@router.post("/trailers/{trailer_number}/documents/{type}/upload", response_model=TrailerDocument)
+def upload_trailer_document(trailer_number: str, type: str, file: UploadFile = File(...)):
+    uploads_dir = "TrailerDocs"
+    os.makedirs(uploads_dir, exist_ok=True)
+
+    file_path = os.path.join(uploads_dir, f"{trailer_number}_{type}_{file.filename}")
+    
+    with open(file_path, "wb") as buffer:
+        shutil.copyfileobj(file.file, buffer)
+
+    uploadDate = datetime.datetime.today().strftime('%Y-%m-%d')
+
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    query = """
+        INSERT INTO trailer_documents (type, url, uploadDate, trailer_number)
+        VALUES (%s, %s, %s, %s)
+    """
+    values = (type, file_path, uploadDate, trailer_number)
+    cursor.execute(query, values)
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+    return {
+        "type": type,
+        "url": file_path,
+        "uploadDate": uploadDate,
+        "trailer_number": trailer_number
+    }
+
+#---------------------------------truckmaint-doc--------------------------------------------------------------
+class TruckMaintenanceDocument(BaseModel):
+    truck_number: Optional[str]
+    url: str
+    uploaded_at: Optional[str]
+    truck_maintenance_id: int
+
+    @validator('uploaded_at', pre=True)
+    def format_upload_date(cls, v):
+        if isinstance(v, datetime.date):
+            return v.strftime('%d-%m-%Y')  
+        return v
+
+
+# Upload document
+@router.post("/truck-maintenance/{truck_maintenance_id}/documents/upload", response_model=TruckMaintenanceDocument)
+def upload_maintenance_doc(
+    truck_maintenance_id: int,
+    truck_number: Optional[str] = None,
+    file: UploadFile = File(...)
+):
+
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+        # Check if a document already exists for this truck_maintenance_id
+    cursor.execute("SELECT url FROM truckmaintenance_receipts WHERE truck_maintenance_id = %s", (truck_maintenance_id,))
+    existing_doc = cursor.fetchone()
+
+    # If found, delete the file and the record
+    if existing_doc:
+        old_file_path = existing_doc["url"]
+        if os.path.exists(old_file_path):
+            os.remove(old_file_path)
+        cursor.execute("DELETE FROM truckmaintenance_receipts WHERE truck_maintenance_id = %s", (truck_maintenance_id,))
+        conn.commit()
+
+    uploads_dir = "TruckMaintenanceDocs"
+    os.makedirs(uploads_dir, exist_ok=True)
+
+    file_path = os.path.join(uploads_dir, f"{truck_maintenance_id}_{file.filename}")
+    with open(file_path, "wb") as buffer:
+        shutil.copyfileobj(file.file, buffer)
+
+    uploaded_at = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    query = """
+        INSERT INTO truckmaintenance_receipts (truck_number, url, uploaded_at, truck_maintenance_id)
+        VALUES (%s, %s, %s, %s)
+    """
+    cursor.execute(query, (truck_number, file_path, uploaded_at, truck_maintenance_id))
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+    return {
+        "truck_number": truck_number,
+        "url": file_path,
+        "uploaded_at": uploaded_at,
+        "truck_maintenance_id": truck_maintenance_id
+    }
+
+# Get all documents for a truck_maintenance_id
+@router.get("/truck-maintenance/{truck_maintenance_id}/documents", response_model=List[TruckMaintenanceDocument])
+def get_docs_by_maintenance_id(truck_maintenance_id: int):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    cursor.execute("SELECT * FROM truckmaintenance_receipts WHERE truck_maintenance_id = %s", (truck_maintenance_id,))
+    docs = cursor.fetchall()
+    cursor.close()
+    conn.close()
+
+    if not docs:
+        raise HTTPException(status_code=404, detail="No documents found")
+
+    return docs
+
+# Download document by truck_maintenance_id and filename
+@router.get("/truck-maintenance/{truck_maintenance_id}/documents/view")
+def download_doc_by_filename(truck_maintenance_id: int):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    cursor.execute(
+        "SELECT url FROM truckmaintenance_receipts WHERE truck_maintenance_id = %s",
+        (truck_maintenance_id,)
+    )
+    doc = cursor.fetchone()
+    cursor.close()
+    conn.close()
+
+    if not doc:
+        raise HTTPException(status_code=404, detail="Document not found")
+
+    file_path = doc["url"]
+    if not os.path.exists(file_path):
+        raise HTTPException(status_code=404, detail="File not found on server")
+
+    return FileResponse(path=file_path, filename=os.path.basename(file_path))
+
+# Delete all documents for a truck_maintenance_id
+@router.delete("/truck-maintenance/{truck_maintenance_id}/documents")
+def delete_docs_by_maintenance_id(truck_maintenance_id: int):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    cursor.execute("SELECT url FROM truckmaintenance_receipts WHERE truck_maintenance_id = %s", (truck_maintenance_id,))
+    docs = cursor.fetchall()
+
+    if not docs:
+        cursor.close()
+        conn.close()
+        raise HTTPException(status_code=404, detail="No documents found")
+
+    for doc in docs:
+        if os.path.exists(doc["url"]):
+            os.remove(doc["url"])
+
+    cursor.execute("DELETE FROM truckmaintenance_receipts WHERE truck_maintenance_id = %s", (truck_maintenance_id,))
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+    return {"message": f"All documents for truck_maintenance_id {truck_maintenance_id} deleted"}
+
+#----------------------------------------------------fine-document--------------------------------------------------------------
+class FineDocument(BaseModel):
+    url: str
+    uploaded_at: Optional[str]
+    fine_id: int
+
+    @validator('uploaded_at', pre=True)
+    def format_upload_date(cls, v):
+        if isinstance(v, datetime.date):
+            return v.strftime('%d-%m-%Y')
+        return v
+    
+#upload fine
+@router.post("/fines/{fine_id}/documents/upload", response_model=FineDocument)
+def upload_fine_doc(
+    fine_id: int,
+    file: UploadFile = File(...)
+):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    cursor.execute("SELECT url FROM fine_documents WHERE fine_id = %s", (fine_id,))
+    existing_doc = cursor.fetchone()
+
+    if existing_doc:
+        old_file_path = existing_doc["url"]
+        if os.path.exists(old_file_path):
+            os.remove(old_file_path)
+        cursor.execute("DELETE FROM fine_documents WHERE fine_id = %s", (fine_id,))
+        conn.commit()
+
+    uploads_dir = "FineDocs"
+    os.makedirs(uploads_dir, exist_ok=True)
+
+    file_path = os.path.join(uploads_dir, f"{fine_id}_{file.filename}")
+    with open(file_path, "wb") as buffer:
+        shutil.copyfileobj(file.file, buffer)
+
+    uploaded_at = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    cursor.execute(
+        "INSERT INTO fine_documents (url, uploaded_at, fine_id) VALUES (%s, %s, %s)",
+        (file_path, uploaded_at, fine_id)
+    )
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+    return {
+        "url": file_path,
+        "uploaded_at": uploaded_at,
+        "fine_id": fine_id
+    }
+
+#get doc
+@router.get("/fines/{fine_id}/documents", response_model=List[FineDocument])
+def get_fine_docs(fine_id: int):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    cursor.execute("SELECT * FROM fine_documents WHERE fine_id = %s", (fine_id,))
+    docs = cursor.fetchall()
+    cursor.close()
+    conn.close()
+
+    if not docs:
+        raise HTTPException(status_code=404, detail="No documents found")
+
+    return docs
+
+
+#view doc
+@router.get("/fines/{fine_id}/documents/view")
+def view_fine_doc(fine_id: int):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    cursor.execute("SELECT url FROM fine_documents WHERE fine_id = %s", (fine_id,))
+    doc = cursor.fetchone()
+    cursor.close()
+    conn.close()
+
+    if not doc:
+        raise HTTPException(status_code=404, detail="Document not found")
+
+    file_path = doc["url"]
+    if not os.path.exists(file_path):
+        raise HTTPException(status_code=404, detail="File not found on server")
+
+    return FileResponse(path=file_path, filename=os.path.basename(file_path))
+
+
+#delete doc
+@router.delete("/fines/{fine_id}/documents")
+def delete_fine_docs(fine_id: int):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    cursor.execute("SELECT url FROM fine_documents WHERE fine_id = %s", (fine_id,))
+    docs = cursor.fetchall()
+
+    if not docs:
+        cursor.close()
+        conn.close()
+        raise HTTPException(status_code=404, detail="No documents found")
+
+    for doc in docs:
+        if os.path.exists(doc["url"]):
+            os.remove(doc["url"])
+
+    cursor.execute("DELETE FROM fine_documents WHERE fine_id = %s", (fine_id,))
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+    return {"message": f"All documents for fine_id {fine_id} deleted"}
+
+
+#----------------------------------------------------salary-documents--------------------------------------------------------------
+class SalaryDocument(BaseModel):
+    salary_id: int
+    url: str
+    uploaded_at: Optional[datetime.date]
+
+    @validator('uploaded_at', pre=True)
+    def format_upload_date(cls, v):
+        if isinstance(v, datetime.date):
+            return v.strftime('%d-%m-%Y')  
+        return v
+
+@router.post("/salaries/{salary_id}/documents", response_model=SalaryDocument)
+def upload_salary_document(salary_id: int, file: UploadFile = File(...)):
+    uploads_dir = "SalaryDocs"
+    os.makedirs(uploads_dir, exist_ok=True)
+
+    file_path = os.path.join(uploads_dir, f"salary_{salary_id}_{file.filename}")
+    with open(file_path, "wb") as buffer:
+        shutil.copyfileobj(file.file, buffer)
+
+    uploaded_at = datetime.datetime.today().strftime('%Y-%m-%d')
+
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    query = """
+        INSERT INTO salary_documents (salary_id, url, uploaded_at)
+        VALUES (%s, %s, %s)
+    """
+    cursor.execute(query, (salary_id, file_path, uploaded_at))
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+    return {
+        "salary_id": salary_id,
+        "url": file_path,
+        "uploaded_at": uploaded_at
+    }
+
+
+@router.get("/salaries/{salary_id}/documents", response_model=List[SalaryDocument])
+def get_salary_documents(salary_id: int):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    cursor.execute("SELECT * FROM salary_documents WHERE salary_id = %s", (salary_id,))
+    docs = cursor.fetchall()
+    cursor.close()
+    conn.close()
+
+    if not docs:
+        raise HTTPException(status_code=404, detail="No salary documents found")
+
+    return docs
+
+
+@router.get("/salaries/{salary_id}/documents/view")
+def view_salary_document(salary_id: int):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    cursor.execute("SELECT url FROM salary_documents WHERE salary_id = %s", (salary_id,))
+    doc = cursor.fetchone()
+    cursor.close()
+    conn.close()
+
+    if not doc:
+        raise HTTPException(status_code=404, detail="Salary document not found")
+
+    file_path = doc["url"]
+    if not os.path.exists(file_path):
+        raise HTTPException(status_code=404, detail="File not found on server")
+
+    return FileResponse(path=file_path, filename=os.path.basename(file_path))
+
+
+@router.delete("/salaries/{salary_id}/documents")
+def delete_salary_document(salary_id: int):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    cursor.execute("SELECT url FROM salary_documents WHERE salary_id = %s", (salary_id,))
+    doc = cursor.fetchone()
+
+    if not doc:
+        cursor.close()
+        conn.close()
+        raise HTTPException(status_code=404, detail="Salary document not found")
+
+    file_path = doc["url"]
+    if os.path.exists(file_path):
+        os.remove(file_path)
+
+    cursor.execute("DELETE FROM salary_documents WHERE salary_id = %s", (salary_id,))
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+    return {"message": f"Salary document for salary_id {salary_id} deleted"}
+
+#------------------------------------------------document-other-trucks-------------------------------------------
+class OtherTruckDocument(BaseModel):
+    type: str
+    url: str
+    uploadDate: Optional[str]
+    other_truck_number: str
+
+    @validator('uploadDate', pre=True)
+    def format_upload_date(cls, v):
+        if isinstance(v, datetime.date):
+            return v.strftime('%d-%m-%Y')  
+        return v
+
+# Get all documents for an other truck
+@router.get("/other-trucks/{other_truck_number}/documents", response_model=List[OtherTruckDocument])
+def get_other_truck_documents(other_truck_number: str):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    cursor.execute("SELECT * FROM other_trucks_documents WHERE other_truck_number = %s", (other_truck_number,))
+    documents = cursor.fetchall()
+
+    cursor.close()
+    conn.close()
+
+    if not documents:
+        raise HTTPException(status_code=404, detail="No documents found for this other truck")
+
+    return documents
+
+
+# View/download a document
+@router.get("/other-trucks/{other_truck_number}/documents/{type}")
+def view_other_truck_document(other_truck_number: str, type: str):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    query = "SELECT url FROM other_trucks_documents WHERE other_truck_number = %s AND type = %s"
+    cursor.execute(query, (other_truck_number, type))
+    result = cursor.fetchone()
+
+    cursor.close()
+    conn.close()
+
+    if not result:
+        raise HTTPException(status_code=404, detail="Document not found")
+
+    file_path = result["url"]
+    if not os.path.exists(file_path):
+        raise HTTPException(status_code=404, detail="File not found on server")
+
+    return FileResponse(path=file_path, filename=os.path.basename(file_path))
+
+
+# Delete a document
+@router.delete("/other-trucks/{other_truck_number}/documents/{type}")
+def delete_other_truck_document(other_truck_number: str, type: str):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    cursor.execute("SELECT url FROM other_trucks_documents WHERE other_truck_number = %s AND type = %s",
+                   (other_truck_number, type))
+    result = cursor.fetchone()
+
+    if not result:
+        cursor.close()
+        conn.close()
+        raise HTTPException(status_code=404, detail="Document not found")
+
+    file_path = result["url"]
+    if os.path.exists(file_path):
+        os.remove(file_path)
+
+    cursor.execute("DELETE FROM other_trucks_documents WHERE other_truck_number = %s AND type = %s",
+                   (other_truck_number, type))
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+    return {"message": f"{type} document deleted for other truck {other_truck_number}"}
+
+
+# Upload a document
+@router.post("/other-trucks/{other_truck_number}/documents/{type}/upload", response_model=OtherTruckDocument)
+def upload_other_truck_document(other_truck_number: str, type: str, file: UploadFile = File(...)):
+    uploads_dir = "OtherTruckDocs"
+    os.makedirs(uploads_dir, exist_ok=True)
+
+    file_path = os.path.join(uploads_dir, f"{other_truck_number}_{type}_{file.filename}")
+    with open(file_path, "wb") as buffer:
+        shutil.copyfileobj(file.file, buffer)
+
+    uploadDate = datetime.datetime.today().strftime('%Y-%m-%d')
+
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    cursor.execute("""
+        INSERT INTO other_trucks_documents (type, url, uploadDate, other_truck_number)
+        VALUES (%s, %s, %s, %s)
+    """, (type, file_path, uploadDate, other_truck_number))
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+    return {
+        "type": type,
+        "url": file_path,
+        "uploadDate": uploadDate,
+        "other_truck_number": other_truck_number
+    }
+
+#-------------------------------------------document-other-trailer----------------------------------------------------
+class OtherTrailerDocument(BaseModel):
+    type: str
+    url: str
+    uploadDate: Optional[str]
+    other_trailer_number: str
+
+    @validator('uploadDate', pre=True)
+    def format_upload_date(cls, v):
+        if isinstance(v, datetime.date):
+            return v.strftime('%d-%m-%Y')  
+        return v
+
+# Get all documents for an other trailer
+@router.get("/other-trailers/{other_trailer_number}/documents", response_model=List[OtherTrailerDocument])
+def get_other_trailer_documents(other_trailer_number: str):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    cursor.execute("SELECT * FROM other_trailers_documents WHERE other_trailer_number = %s", (other_trailer_number,))
+    documents = cursor.fetchall()
+
+    cursor.close()
+    conn.close()
+
+    if not documents:
+        raise HTTPException(status_code=404, detail="No documents found for this other trailer")
+
+    return documents
+
+
+# View/download a document
+@router.get("/other-trailers/{other_trailer_number}/documents/{type}")
+def view_other_trailer_document(other_trailer_number: str, type: str):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    cursor.execute(
+        "SELECT url FROM other_trailers_documents WHERE other_trailer_number = %s AND type = %s",
+        (other_trailer_number, type)
+    )
+    result = cursor.fetchone()
+
+    cursor.close()
+    conn.close()
+
+    if not result:
+        raise HTTPException(status_code=404, detail="Document not found")
+
+    file_path = result["url"]
+    if not os.path.exists(file_path):
+        raise HTTPException(status_code=404, detail="File not found on server")
+
+    return FileResponse(path=file_path, filename=os.path.basename(file_path))
+
+
+# Delete a document
+@router.delete("/other-trailers/{other_trailer_number}/documents/{type}")
+def delete_other_trailer_document(other_trailer_number: str, type: str):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    cursor.execute(
+        "SELECT url FROM other_trailers_documents WHERE other_trailer_number = %s AND type = %s",
+        (other_trailer_number, type)
+    )
+    result = cursor.fetchone()
+
+    if not result:
+        cursor.close()
+        conn.close()
+        raise HTTPException(status_code=404, detail="Document not found")
+
+    file_path = result["url"]
+    if os.path.exists(file_path):
+        os.remove(file_path)
+
+    cursor.execute(
+        "DELETE FROM other_trailers_documents WHERE other_trailer_number = %s AND type = %s",
+        (other_trailer_number, type)
+    )
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+    return {"message": f"{type} document deleted for other trailer {other_trailer_number}"}
+
+
+# Upload a document
+@router.post("/other-trailers/{other_trailer_number}/documents/{type}/upload", response_model=OtherTrailerDocument)
+def upload_other_trailer_document(other_trailer_number: str, type: str, file: UploadFile = File(...)):
+    uploads_dir = "OtherTrailerDocs"
+    os.makedirs(uploads_dir, exist_ok=True)
+
+    file_path = os.path.join(uploads_dir, f"{other_trailer_number}_{type}_{file.filename}")
+    with open(file_path, "wb") as buffer:
+        shutil.copyfileobj(file.file, buffer)
+
+    uploadDate = datetime.datetime.today().strftime('%Y-%m-%d')
+
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    cursor.execute("""
+        INSERT INTO other_trailers_documents (type, url, uploadDate, other_trailer_number)
+        VALUES (%s, %s, %s, %s)
+    """, (type, file_path, uploadDate, other_trailer_number))
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+    return {
+        "type": type,
+        "url": file_path,
+        "uploadDate": uploadDate,
+        "other_trailer_number": other_trailer_number
+    }
+
+#-----------------------------------------documents-other-employee----------------------------------------------------------------
+class OtherEmployeeDocument(BaseModel):
+    type: str
+    url: str
+    uploadDate: Optional[str]
+    other_employee_name: str
+
+    @validator('uploadDate', pre=True)
+    def format_upload_date(cls, v):
+        if isinstance(v, datetime.date):
+            return v.strftime('%d-%m-%Y')  
+        return v
+
+# Get all documents for an other employee
+@router.get("/other-employees/{other_employee_name}/documents", response_model=List[OtherEmployeeDocument])
+def get_other_employee_documents(other_employee_name: str):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    cursor.execute("SELECT * FROM other_employee_documents WHERE other_employee_name = %s", (other_employee_name,))
+    documents = cursor.fetchall()
+
+    cursor.close()
+    conn.close()
+
+    if not documents:
+        raise HTTPException(status_code=404, detail="No documents found for this other employee")
+
+    return documents
+
+
+# View/download a specific document
+@router.get("/other-employees/{other_employee_name}/documents/{type}")
+def view_other_employee_document(other_employee_name: str, type: str):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    cursor.execute(
+        "SELECT url FROM other_employee_documents WHERE other_employee_name = %s AND type = %s",
+        (other_employee_name, type)
+    )
+    result = cursor.fetchone()
+
+    cursor.close()
+    conn.close()
+
+    if not result:
+        raise HTTPException(status_code=404, detail="Document not found")
+
+    file_path = result["url"]
+    if not os.path.exists(file_path):
+        raise HTTPException(status_code=404, detail="File not found on server")
+
+    return FileResponse(path=file_path, filename=os.path.basename(file_path))
+
+
+# Delete a document
+@router.delete("/other-employees/{other_employee_name}/documents/{type}")
+def delete_other_employee_document(other_employee_name: str, type: str):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    cursor.execute(
+        "SELECT url FROM other_employee_documents WHERE other_employee_name = %s AND type = %s",
+        (other_employee_name, type)
+    )
+    result = cursor.fetchone()
+
+    if not result:
+        cursor.close()
+        conn.close()
+        raise HTTPException(status_code=404, detail="Document not found")
+
+    file_path = result["url"]
+    if os.path.exists(file_path):
+        os.remove(file_path)
+
+    cursor.execute(
+        "DELETE FROM other_employee_documents WHERE other_employee_name = %s AND type = %s",
+        (other_employee_name, type)
+    )
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+    return {"message": f"{type} document deleted for other employee {other_employee_name}"}
+
+
+# Upload a document
+@router.post("/other-employees/{other_employee_name}/documents/{type}/upload", response_model=OtherEmployeeDocument)
+def upload_other_employee_document(other_employee_name: str, type: str, file: UploadFile = File(...)):
+    uploads_dir = "OtherEmployeeDocs"
+    os.makedirs(uploads_dir, exist_ok=True)
+
+    file_path = os.path.join(uploads_dir, f"{other_employee_name}_{type}_{file.filename}")
+    with open(file_path, "wb") as buffer:
+        shutil.copyfileobj(file.file, buffer)
+
+    uploadDate = datetime.datetime.today().strftime('%Y-%m-%d')
+
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    cursor.execute("""
+        INSERT INTO other_employee_documents (type, url, uploadDate, other_employee_name)
+        VALUES (%s, %s, %s, %s)
+    """, (type, file_path, uploadDate, other_employee_name))
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+    return {
+        "type": type,
+        "url": file_path,
+        "uploadDate": uploadDate,
+        "other_employee_name": other_employee_name
+    }
+
+#-----------------------------------------------------includes-------------------------------------------------------------
+INCLUDES["employees"]["documents"] = ("employee_documents", "employee_name", Document)
+INCLUDES["trucks"]["documents"] = ("truck_documents", "truck_number", TruckDocument)
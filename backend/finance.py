@@ -0,0 +1,1404 @@
+# Clients, suppliers, investors, salaries and the ledger
+import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Body, HTTPException, Header
+from pydantic import BaseModel, validator
+
+from .archive import date_range_clause
+from .cache import cache
+from .db import (
+    add_index_if_missing, expected_version, get_db_connection, raise_if_stale, release_db_connection, stream_rows,
+)
+from .includes import INCLUDES
+from .patch import patch_record
+from .sync import record_tombstone
+
+router = APIRouter()
+
+#---------------------------------------clients--------------------------------------------
+# Pydantic models
+class clients(BaseModel):
+    name: str
+    address: Optional[str] = None
+    tel_no: Optional[int] = None
+    po_box: Optional[int] = None
+    trn_no: Optional[int] = None
+    contact_person: Optional[str] = None
+    person_number: Optional[int] = None
+    version: Optional[int] = None
+
+#add new client
+@router.post("/clients")
+def add_client(client: clients):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    query = """
+    INSERT INTO clients (name, address, tel_no, po_box, trn_no, contact_person, person_number)
+    VALUES (%s, %s, %s, %s, %s, %s, %s);
+    """
+    values = (client.name, client.address, client.tel_no, client.po_box, client.trn_no, client.contact_person, client.person_number)
+    cursor.execute(query, values)
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return {"message": "Client added successfully!"}
+
+# fetch all
+@router.get("/clients", response_model=List[clients])
+def get_all_clients():
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("SELECT * FROM clients;")
+    result = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    return result
+
+#fetch specific
+@router.get("/clients/{client_name}", response_model=clients)
+def get_client(client_name: str):
+    cached = cache.get(f"clients:{client_name}")
+    if cached is not None:
+        return cached
+    version = cache.version(f"clients:{client_name}")
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("SELECT * FROM clients WHERE name = %s;", (client_name,))
+    result = cursor.fetchone()
+    cursor.close()
+    conn.close()
+    if result:
+        result = clients(**result).dict()
+        cache.set(f"clients:{client_name}", result, version)
+        return result
+    else:
+        raise HTTPException(status_code=404, detail="Client not found")
+
+#update client
+@router.put("/clients/{client_name}")
+def update_client(client_name: str, client: clients, if_match: Optional[str] = Header(None)):
+    expected = expected_version(if_match, client)
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        query = """
+        UPDATE clients SET name=%s, address=%s, tel_no=%s, po_box=%s, trn_no=%s, contact_person=%s ,person_number=%s, version=version+1
+        WHERE name=%s AND version=COALESCE(%s, version);
+        """
+        values = (client.name, client.address, client.tel_no, client.po_box, client.trn_no, client.contact_person, client.person_number, client_name, expected)
+        cursor.execute(query, values)
+        if cursor.rowcount == 0:
+            raise_if_stale(cursor, "clients", "name", client_name)
+            raise HTTPException(status_code=404, detail="Client not found")
+        if client.name != client_name:
+            record_tombstone(cursor, "clients", client_name)
+        conn.commit()
+        cache.invalidate(f"clients:{client_name}", f"clients:{client.name}")
+    finally:
+        release_db_connection(conn, cursor)
+    return {"message": "Client updated successfully!"}
+
+#delete client
+@router.delete("/clients/{client_name}")
+def delete_client(client_name: str):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM clients WHERE name = %s;", (client_name,))
+    if cursor.rowcount == 0:
+        raise HTTPException(status_code=404, detail="Client not found")
+    record_tombstone(cursor, "clients", client_name)
+    conn.commit()
+    cache.invalidate(f"clients:{client_name}")
+    cursor.close()
+    conn.close()
+    return {"message": f"Client '{client_name}' deleted successfully"}
+
+#all clients name
+@router.get("/clients/names", response_model=List[str])
+def get_client_names():
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT name FROM clients;")
+    clients = [row[0] for row in cursor.fetchall()]
+    cursor.close()
+    conn.close()
+    return clients
+
+#--------------------------------------supplier--------------------------------------------------------
+
+# Pydantic models
+class supplier(BaseModel):
+    name: str
+    tel_no: Optional[int] = None
+    contact_person: Optional[str] = None
+    phone_no: Optional[int] = None
+    about: Optional[str] = None
+    version: Optional[int] = None
+
+#add supplier
+@router.post("/suppliers")
+def add_supplier(supp: supplier):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    query = """
+        INSERT INTO suppliers (name, tel_no, contact_person, phone_no, about)
+        VALUES (%s, %s, %s, %s, %s);
+    """
+    values = (supp.name, supp.tel_no, supp.contact_person, supp.phone_no, supp.about)
+    cursor.execute(query, values)
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return {"message": "Supplier added successfully!"}
+
+#get all supplier
+@router.get("/suppliers", response_model=List[supplier])
+def get_all_suppliers():
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("SELECT * FROM suppliers;")
+    suppliers = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    return suppliers
+
+#get supplier by name
+@router.get("/suppliers/{name}", response_model=supplier)
+def get_supplier(name: str):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("SELECT * FROM suppliers WHERE name = %s;", (name,))
+    result = cursor.fetchone()
+    cursor.close()
+    conn.close()
+    if result:
+        return result
+    raise HTTPException(status_code=404, detail="Supplier not found")
+
+#update supplier
+@router.put("/suppliers/{name}")
+def update_supplier(name: str, supp: supplier, if_match: Optional[str] = Header(None)):
+    expected = expected_version(if_match, supp)
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        query = """
+            UPDATE suppliers SET
+            name=%s, tel_no=%s, contact_person=%s, phone_no=%s, about=%s, version=version+1
+            WHERE name=%s AND version=COALESCE(%s, version);
+        """
+        values = (
+            supp.name, supp.tel_no, supp.contact_person, supp.phone_no, supp.about, name, expected
+        )
+        cursor.execute(query, values)
+        if cursor.rowcount == 0:
+            raise_if_stale(cursor, "suppliers", "name", name)
+            raise HTTPException(status_code=404, detail="Supplier not found")
+        conn.commit()
+    finally:
+        release_db_connection(conn, cursor)
+    return {"message": "Supplier updated successfully!"}
+
+#delete supplier
+@router.delete("/suppliers/{name}")
+def delete_supplier(name: str):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM suppliers WHERE name = %s;", (name,))
+    if cursor.rowcount == 0:
+        raise HTTPException(status_code=404, detail="Supplier not found")
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return {"message": f"Supplier '{name}' deleted successfully!"}
+
+#fetch supplier names
+@router.get("/suppliers/names/code", response_model=List[str])
+def get_supplier_names():
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT name FROM suppliers;")
+    rows = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    return [row[0] for row in rows]
+
+
+#--------------------------------------investors--------------------------------------------------------
+class Investor(BaseModel):
+    id: int
+    name: int
+    contact_no: Optional[int] = None
+    details: Optional[str] = None
+    version: Optional[int] = None
+
+
+# Get all investors
+@router.get("/investors", response_model=List[Investor])
+def get_all_investors():
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("SELECT * FROM investors;")
+    investors = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    return investors
+
+# Get investor by ID
+@router.get("/investors/{investor_id}", response_model=Investor)
+def get_investor(investor_id: int):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("SELECT * FROM investors WHERE id = %s;", (investor_id,))
+    investor = cursor.fetchone()
+    cursor.close()
+    conn.close()
+    if not investor:
+        raise HTTPException(status_code=404, detail="Investor not found")
+    return investor
+
+# Add new investor
+@router.post("/investors")
+def add_investor(investor: Investor):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        INSERT INTO investors (id, name, contact_no, details)
+        VALUES (%s, %s, %s, %s)
+    """, (investor.id, investor.name, investor.contact_no, investor.details))
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return {"message": "Investor added successfully"}
+
+# Update investor
+@router.put("/investors/{investor_id}")
+def update_investor(investor_id: int, investor: Investor, if_match: Optional[str] = Header(None)):
+    expected = expected_version(if_match, investor)
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            UPDATE investors SET name=%s, contact_no=%s, details=%s, version=version+1 WHERE id=%s AND version=COALESCE(%s, version)
+        """, (investor.name, investor.contact_no, investor.details, investor_id, expected))
+        if cursor.rowcount == 0:
+            raise_if_stale(cursor, "investors", "id", investor_id)
+            raise HTTPException(status_code=404, detail="Investor not found")
+        conn.commit()
+    finally:
+        release_db_connection(conn, cursor)
+    return {"message": "Investor updated successfully"}
+
+# Delete investor
+@router.delete("/investors/{investor_id}")
+def delete_investor(investor_id: int):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM investors WHERE id = %s;", (investor_id,))
+    if cursor.rowcount == 0:
+        raise HTTPException(status_code=404, detail="Investor not found")
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return {"message": f"Investor with ID {investor_id} deleted successfully"}
+
+#--------------------------------------investor1_aacounts--------------------------------------------------------
+class Investor1Account(BaseModel):
+    id: int
+    investor_id: Optional[int] = None
+    trip_id: Optional[int] = None
+    fixed_tir_price: Optional[float] = None
+    sold_tir_price: Optional[float] = None
+    amount_due: Optional[float] = None
+    paid: Optional[bool] = False
+    version: Optional[int] = None
+
+
+# Get all records
+@router.get("/investor1-accounts", response_model=List[Investor1Account])
+def get_all_investor1_accounts():
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("SELECT * FROM investor1_accounts;")
+    records = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    return records
+
+# Get one by ID
+@router.get("/investor1-accounts/{record_id}", response_model=Investor1Account)
+def get_investor1_account(record_id: int):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("SELECT * FROM investor1_accounts WHERE id = %s;", (record_id,))
+    record = cursor.fetchone()
+    cursor.close()
+    conn.close()
+    if not record:
+        raise HTTPException(status_code=404, detail="Record not found")
+    return record
+
+# Add new record
+@router.post("/investor1-accounts")
+def add_investor1_account(data: Investor1Account):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        INSERT INTO investor1_accounts (
+            trip_id, fixed_tir_price, sold_tir_price, amount_due, paid
+        ) VALUES (%s, %s, %s, %s, %s)
+    """, (
+        data.trip_id, data.fixed_tir_price,
+        data.sold_tir_price, data.amount_due, data.paid
+    ))
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return {"message": "Investor1 account record added successfully"}
+
+# Update record
+@router.put("/investor1-accounts/{record_id}")
+def update_investor1_account(record_id: int, data: Investor1Account, if_match: Optional[str] = Header(None)):
+    expected = expected_version(if_match, data)
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            UPDATE investor1_accounts SET 
+                trip_id=%s, fixed_tir_price=%s, sold_tir_price=%s,
+                amount_due=%s, paid=%s, version=version+1
+            WHERE id=%s AND version=COALESCE(%s, version)
+        """, (
+            data.trip_id, data.fixed_tir_price,
+            data.sold_tir_price, data.amount_due, data.paid, record_id, expected
+        ))
+        if cursor.rowcount == 0:
+            raise_if_stale(cursor, "investor1_accounts", "id", record_id)
+            raise HTTPException(status_code=404, detail="Record not found")
+        reverse_entries(cursor, "investor1_account", record_id)
+        conn.commit()
+    finally:
+        release_db_connection(conn, cursor)
+    return {"message": "Investor1 account updated successfully"}
+
+# Delete record
+@router.delete("/investor1-accounts/{record_id}")
+def delete_investor1_account(record_id: int):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM investor1_accounts WHERE id = %s;", (record_id,))
+    if cursor.rowcount == 0:
+        raise HTTPException(status_code=404, detail="Record not found")
+    reverse_entries(cursor, "investor1_account", record_id)
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return {"message": f"Investor1 account with ID {record_id} deleted successfully"}
+
+#--------------------------------------investor2_accounts--------------------------------------------------------
+class Investor2Account(BaseModel):
+    id: int
+    investor_id: Optional[int] = None
+    trip_id: Optional[int] = None
+    amount_due: Optional[float] = None
+    paid: Optional[bool] = False
+    version: Optional[int] = None
+
+
+# Get all records
+@router.get("/investor2-accounts", response_model=List[Investor2Account])
+def get_all_investor2_accounts():
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("SELECT * FROM investor2_accounts;")
+    records = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    return records
+
+# Get one by ID
+@router.get("/investor2-accounts/{record_id}", response_model=Investor2Account)
+def get_investor2_account(record_id: int):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("SELECT * FROM investor2_accounts WHERE id = %s;", (record_id,))
+    record = cursor.fetchone()
+    cursor.close()
+    conn.close()
+    if not record:
+        raise HTTPException(status_code=404, detail="Record not found")
+    return record
+
+# Add new record
+@router.post("/investor2-accounts")
+def add_investor2_account(data: Investor2Account):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        INSERT INTO investor2_accounts (
+            trip_id, amount_due, paid
+        ) VALUES (%s, %s, %s)
+    """, (
+        data.trip_id, data.amount_due, data.paid
+    ))
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return {"message": "Investor2 account record added successfully"}
+
+# Update record
+@router.put("/investor2-accounts/{record_id}")
+def update_investor2_account(record_id: int, data: Investor2Account, if_match: Optional[str] = Header(None)):
+    expected = expected_version(if_match, data)
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            UPDATE investor2_accounts SET 
+                trip_id=%s, amount_due=%s, paid=%s, version=version+1
+            WHERE id=%s AND version=COALESCE(%s, version)
+        """, (
+            data.trip_id, data.amount_due, data.paid, record_id, expected
+        ))
+        if cursor.rowcount == 0:
+            raise_if_stale(cursor, "investor2_accounts", "id", record_id)
+            raise HTTPException(status_code=404, detail="Record not found")
+        reverse_entries(cursor, "investor2_account", record_id)
+        conn.commit()
+    finally:
+        release_db_connection(conn, cursor)
+    return {"message": "Investor2 account updated successfully"}
+
+# Delete record
+@router.delete("/investor2-accounts/{record_id}")
+def delete_investor2_account(record_id: int):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM investor2_accounts WHERE id = %s;", (record_id,))
+    if cursor.rowcount == 0:
+        raise HTTPException(status_code=404, detail="Record not found")
+    reverse_entries(cursor, "investor2_account", record_id)
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return {"message": f"Investor2 account with ID {record_id} deleted successfully"}
+
+#--------------------------------------investor_shares--------------------------------------------------------
+# Normalized (trip_id, investor_id, share) rows replace the five fixed
+# investorN_share columns, and investor_settlements holds one amount due per
+# investor per trip. Settlements are regenerated in bulk whenever trips change,
+# so balances and statements are plain indexed aggregates.
+class TripInvestorShare(BaseModel):
+    investor_id: int
+    share: float
+
+
+LEGACY_SHARE_COLUMNS = 5
+
+
+@router.on_event("startup")
+def ensure_investor_share_schema():
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("SHOW TABLES LIKE 'trip_investor_shares'")
+    backfill = cursor.fetchone() is None
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS trip_investor_shares (
+            trip_id INT NOT NULL,
+            investor_id INT NOT NULL,
+            share DECIMAL(12, 2) NOT NULL,
+            PRIMARY KEY (trip_id, investor_id),
+            INDEX idx_investor_trip (investor_id, trip_id)
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS investor_settlements (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            investor_id INT NOT NULL,
+            trip_id INT NOT NULL,
+            amount_due DECIMAL(12, 2) NOT NULL,
+            paid BOOLEAN NOT NULL DEFAULT FALSE,
+            paid_at DATETIME NULL,
+            UNIQUE KEY uq_investor_trip (investor_id, trip_id),
+            INDEX idx_trip (trip_id),
+            INDEX idx_investor_paid (investor_id, paid, amount_due)
+        )
+    """)
+    if backfill:
+        # One-off copy of the legacy columns; investorN_share belongs to investor id N
+        for n in range(1, LEGACY_SHARE_COLUMNS + 1):
+            cursor.execute(f"""
+                INSERT IGNORE INTO trip_investor_shares (trip_id, investor_id, share)
+                SELECT trip_id, {n}, investor{n}_share FROM trips
+                WHERE investor{n}_share IS NOT NULL AND investor{n}_share <> 0
+            """)
+        settle_all_trips(cursor)
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+
+def trip_shares(trip):
+    if trip.investor_shares is not None:
+        return [s for s in trip.investor_shares if s.share]
+    return [
+        TripInvestorShare(investor_id=n, share=getattr(trip, f"investor{n}_share"))
+        for n in range(1, LEGACY_SHARE_COLUMNS + 1)
+        if getattr(trip, f"investor{n}_share")
+    ]
+
+
+# Keep the legacy columns readable by older screens when explicit shares are sent
+def with_legacy_share_columns(trip):
+    if trip.investor_shares is None:
+        return trip
+    by_investor = {s.investor_id: s.share for s in trip.investor_shares}
+    return trip.copy(update={
+        f"investor{n}_share": (int(by_investor[n]) if n in by_investor else None)
+        for n in range(1, LEGACY_SHARE_COLUMNS + 1)
+    })
+
+
+def save_trip_shares(cursor, trip_id, shares):
+    cursor.execute("DELETE FROM trip_investor_shares WHERE trip_id = %s", (trip_id,))
+    if shares:
+        cursor.executemany(
+            "INSERT INTO trip_investor_shares (trip_id, investor_id, share) VALUES (%s, %s, %s)",
+            [(trip_id, s.investor_id, s.share) for s in shares]
+        )
+
+
+# Upsert the amount due for every share of the given trips and drop unpaid
+# settlements whose share no longer exists. Paid rows are never rewritten.
+def settle_trips(cursor, trip_ids):
+    if not trip_ids:
+        return
+    placeholders = ", ".join(["%s"] * len(trip_ids))
+    cursor.execute(f"""
+        INSERT INTO investor_settlements (investor_id, trip_id, amount_due)
+        SELECT investor_id, trip_id, share FROM trip_investor_shares
+        WHERE trip_id IN ({placeholders})
+        ON DUPLICATE KEY UPDATE amount_due = IF(paid, amount_due, VALUES(amount_due))
+    """, tuple(trip_ids))
+    cursor.execute(f"""
+        DELETE s FROM investor_settlements s
+        LEFT JOIN trip_investor_shares t ON t.trip_id = s.trip_id AND t.investor_id = s.investor_id
+        WHERE s.trip_id IN ({placeholders}) AND t.trip_id IS NULL AND s.paid = FALSE
+    """, tuple(trip_ids))
+
+
+def settle_all_trips(cursor, batch_size=10000):
+    cursor.execute("SELECT DISTINCT trip_id FROM investor_settlements UNION SELECT DISTINCT trip_id FROM trip_investor_shares")
+    trip_ids = sorted(row[0] for row in cursor.fetchall())
+    for i in range(0, len(trip_ids), batch_size):
+        settle_trips(cursor, trip_ids[i:i + batch_size])
+    return len(trip_ids)
+
+
+class InvestorBalance(BaseModel):
+    investor_id: int
+    total_due: float
+    paid: float
+    outstanding: float
+    trips: int
+
+
+class InvestorStatementLine(BaseModel):
+    trip_id: int
+    date: Optional[str] = None
+    client: Optional[str] = None
+    destination_country: Optional[str] = None
+    amount_due: float
+    paid: bool
+    paid_at: Optional[str] = None
+    running_outstanding: float
+
+    @validator('date', 'paid_at', pre=True)
+    def format_dates(cls, v):
+        if isinstance(v, datetime.date):
+            return v.strftime('%d-%m-%Y')
+        return v
+
+
+class InvestorSettle(BaseModel):
+    trip_ids: Optional[List[int]] = None  # None settles everything outstanding
+
+
+BALANCE_QUERY = """
+    SELECT investor_id,
+           COALESCE(SUM(amount_due), 0) AS total_due,
+           COALESCE(SUM(IF(paid, amount_due, 0)), 0) AS paid,
+           COALESCE(SUM(IF(paid, 0, amount_due)), 0) AS outstanding,
+           COUNT(*) AS trips
+    FROM investor_settlements
+"""
+
+# Balances for all investors
+@router.get("/investor-balances", response_model=List[InvestorBalance])
+def get_investor_balances():
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute(BALANCE_QUERY + " GROUP BY investor_id ORDER BY investor_id")
+    balances = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    return balances
+
+# Balance for one investor
+@router.get("/investors/{investor_id}/balance", response_model=InvestorBalance)
+def get_investor_balance(investor_id: int):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute(BALANCE_QUERY + " WHERE investor_id = %s GROUP BY investor_id", (investor_id,))
+    balance = cursor.fetchone()
+    cursor.close()
+    conn.close()
+    if not balance:
+        return {"investor_id": investor_id, "total_due": 0, "paid": 0, "outstanding": 0, "trips": 0}
+    return balance
+
+# Statement: one line per trip with a running outstanding balance
+@router.get("/investors/{investor_id}/statement", response_model=List[InvestorStatementLine])
+def get_investor_statement(investor_id: int, from_date: Optional[datetime.date] = None, to_date: Optional[datetime.date] = None):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    where, params = date_range_clause("t.date", from_date, to_date)
+    where = where.replace(" WHERE ", " AND ")
+    cursor.execute(f"""
+        SELECT s.trip_id, t.date, t.client, t.destination_country, s.amount_due, s.paid, s.paid_at
+        FROM investor_settlements s
+        LEFT JOIN trips t ON t.trip_id = s.trip_id
+        WHERE s.investor_id = %s{where}
+        ORDER BY t.date, s.trip_id
+    """, (investor_id,) + params)
+    lines = cursor.fetchall()
+    cursor.close()
+    conn.close()
+
+    running = 0.0
+    for line in lines:
+        if not line["paid"]:
+            running += float(line["amount_due"])
+        line["running_outstanding"] = round(running, 2)
+    return lines
+
+# Mark settlements as paid
+@router.post("/investors/{investor_id}/settle")
+def settle_investor(investor_id: int, data: InvestorSettle):
+    where = "WHERE investor_id = %s AND paid = FALSE"
+    params = (investor_id,)
+    if data.trip_ids is not None:
+        if not data.trip_ids:
+            raise HTTPException(status_code=400, detail="trip_ids is empty")
+        where += f" AND trip_id IN ({', '.join(['%s'] * len(data.trip_ids))})"
+        params += tuple(data.trip_ids)
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT COALESCE(SUM(amount_due), 0) FROM investor_settlements {where} FOR UPDATE", params)
+    amount = cursor.fetchone()[0]
+    cursor.execute(f"UPDATE investor_settlements SET paid = TRUE, paid_at = NOW() {where}", params)
+    settled = cursor.rowcount
+    post_entry(cursor, datetime.date.today(), "investor_settlement", investor_id, f"Investor {investor_id} payout",
+               transfer("investor_payable", "cash", amount))
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return {"message": f"{settled} settlements marked as paid"}
+
+#--------------------------------------salary--------------------------------------------------------
+class Salary(BaseModel):
+    id: int
+    employee: Optional[str] = None
+    month_year: Optional[str] = None  # Format: YYYY-MM
+    base_salary: Optional[float] = None
+    working_days: Optional[int] = None
+    trip_allowance: Optional[float] = None
+    visa_deduction: Optional[float] = None
+    fine_deduction: Optional[float] = None
+    advance_deduction: Optional[float] = None
+    net_salary: Optional[float] = None
+    generated_at: Optional[str] = None  # Optional override (auto-set by DB)
+    version: Optional[int] = None
+
+
+# Get all salaries
+@router.get("/salaries", response_model=List[Salary])
+def get_all_salaries(accept: Optional[str] = Header(None)):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM salary;")
+    return stream_rows(conn, cursor, Salary, accept=accept)
+
+# Get salary by ID
+@router.get("/salaries/{salary_id}", response_model=Salary)
+def get_salary(salary_id: int):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("SELECT * FROM salary WHERE id = %s;", (salary_id,))
+    record = cursor.fetchone()
+    cursor.close()
+    conn.close()
+    if not record:
+        raise HTTPException(status_code=404, detail="Salary record not found")
+    return record
+
+#by name
+@router.get("/salaries/by-employee/{employee_name}", response_model=List[Salary])
+def get_salaries_by_employee(employee_name: str):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("SELECT * FROM salary WHERE employee = %s;", (employee_name,))
+    salaries = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    return salaries
+
+#by month-year
+@router.get("/salaries/by-month/{month_year}", response_model=List[Salary])
+def get_salaries_by_month(month_year: str):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("SELECT * FROM salary WHERE month_year = %s;", (month_year,))
+    salaries = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    return salaries
+
+
+# Add salary (manual entry or system generated)
+@router.post("/salaries")
+def add_salary(data: Salary):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        INSERT INTO salary (
+            employee, month_year, base_salary, working_days,
+            trip_allowance, visa_deduction, fine_deduction,
+            advance_deduction, net_salary
+        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+    """, (
+        data.employee, data.month_year, data.base_salary,
+        data.working_days, data.trip_allowance, data.visa_deduction,
+        data.fine_deduction, data.advance_deduction, data.net_salary
+    ))
+    post_entry(cursor, data.month_year, "salary", cursor.lastrowid, f"Salary {data.employee} {data.month_year}",
+               salary_ledger_lines(data))
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return {"message": "Salary record added successfully"}
+
+# Update salary
+@router.put("/salaries/{salary_id}")
+def update_salary(salary_id: int, data: Salary, if_match: Optional[str] = Header(None)):
+    expected = expected_version(if_match, data)
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            UPDATE salary SET 
+                employee=%s, month_year=%s, base_salary=%s, working_days=%s,
+                trip_allowance=%s, visa_deduction=%s, fine_deduction=%s,
+                advance_deduction=%s, net_salary=%s, version=version+1
+            WHERE id=%s AND version=COALESCE(%s, version)
+        """, (
+            data.employee, data.month_year, data.base_salary,
+            data.working_days, data.trip_allowance, data.visa_deduction,
+            data.fine_deduction, data.advance_deduction, data.net_salary, salary_id, expected
+        ))
+        if cursor.rowcount == 0:
+            raise_if_stale(cursor, "salary", "id", salary_id)
+            raise HTTPException(status_code=404, detail="Salary record not found")
+        repost_entry(cursor, data.month_year, "salary", salary_id, f"Salary {data.employee} {data.month_year}",
+                     salary_ledger_lines(data))
+        conn.commit()
+    finally:
+        release_db_connection(conn, cursor)
+    return {"message": "Salary updated successfully"}
+
+# Delete salary
+@router.delete("/salaries/{salary_id}")
+def delete_salary(salary_id: int):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM salary WHERE id = %s;", (salary_id,))
+    if cursor.rowcount == 0:
+        raise HTTPException(status_code=404, detail="Salary record not found")
+    record_tombstone(cursor, "salary", salary_id)
+    reverse_entries(cursor, "salary", salary_id)
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return {"message": f"Salary record with ID {salary_id} deleted successfully"}
+
+#-----------------------------------------------------ledger---------------------------------------------------------------
+# Double-entry general ledger. Financial writes post balanced journal entries;
+# ledger_accounts keeps each account's running balance (debit - credit) and
+# ledger_period_balances keeps per-month totals, so balances are a primary-key
+# read and P&L is bounded by accounts x months rather than by history.
+# Corrections never edit lines: the previous entry is reversed and a new one
+# is posted.
+#
+# Investor shares are booked once, by the trip (investor_share expense against
+# investor_payable), and paid out by /investors/{id}/settle. The legacy
+# investor1/2 account rows describe the same shares, so they post nothing.
+#
+# A record without a valid date is not posted (and logged): booking it on
+# today's date would put it in the wrong period. ledger-backfill posts it
+# once the date is filled in.
+LEDGER_ACCOUNTS = {
+    # code: (name, type)
+    "cash": ("Cash", "asset"),
+    "bank": ("Bank", "asset"),
+    "receivables": ("Client receivables", "asset"),
+    "driver_receivable": ("Recoverable from drivers", "asset"),
+    "employee_advances": ("Employee advances", "asset"),
+    "visa_recoverable": ("Visa costs recoverable", "asset"),
+    "vat_input": ("Input VAT", "asset"),
+    "credit_card": ("Credit card", "liability"),
+    "outsource_payable": ("Payable to other owners", "liability"),
+    "investor_payable": ("Payable to investors", "liability"),
+    "fines_payable": ("Fines payable", "liability"),
+    "supplier_payable": ("Payable to suppliers", "liability"),
+    "trip_revenue": ("Trip revenue", "income"),
+    "diesel_sales": ("Diesel sales", "income"),
+    "diesel_expense": ("Diesel", "expense"),
+    "border_expense": ("Border fees", "expense"),
+    "tir_expense": ("TIR", "expense"),
+    "customs_expense": ("Customs", "expense"),
+    "driver_trip_pay": ("Driver trip pay", "expense"),
+    "outsource_cost": ("Outsourced trips", "expense"),
+    "investor_share": ("Investor shares", "expense"),
+    "maintenance_expense": ("Maintenance", "expense"),
+    "fines_expense": ("Fines", "expense"),
+    "salary_expense": ("Salaries", "expense"),
+}
+CREDIT_NORMAL = {"liability", "equity", "income"}
+
+
+@router.on_event("startup")
+def ensure_ledger_schema():
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS ledger_accounts (
+            code VARCHAR(32) PRIMARY KEY,
+            name VARCHAR(64) NOT NULL,
+            type VARCHAR(16) NOT NULL,
+            balance DECIMAL(16, 2) NOT NULL DEFAULT 0
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS journal_entries (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            entry_date DATE NOT NULL,
+            source VARCHAR(32) NOT NULL,
+            source_id VARCHAR(64) NOT NULL,
+            memo VARCHAR(255),
+            reversal_of INT NULL,
+            reversed BOOLEAN NOT NULL DEFAULT FALSE,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            INDEX idx_source (source, source_id),
+            INDEX idx_date (entry_date)
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS journal_lines (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            entry_id INT NOT NULL,
+            account_code VARCHAR(32) NOT NULL,
+            debit DECIMAL(14, 2) NOT NULL DEFAULT 0,
+            credit DECIMAL(14, 2) NOT NULL DEFAULT 0,
+            INDEX idx_entry (entry_id),
+            INDEX idx_account (account_code, entry_id)
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS ledger_period_balances (
+            account_code VARCHAR(32) NOT NULL,
+            period CHAR(7) NOT NULL,
+            debit DECIMAL(16, 2) NOT NULL DEFAULT 0,
+            credit DECIMAL(16, 2) NOT NULL DEFAULT 0,
+            PRIMARY KEY (account_code, period),
+            INDEX idx_period (period)
+        )
+    """)
+    cursor.executemany(
+        "INSERT IGNORE INTO ledger_accounts (code, name, type) VALUES (%s, %s, %s)",
+        [(code, name, kind) for code, (name, kind) in LEDGER_ACCOUNTS.items()]
+    )
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+
+def parse_entry_date(value):
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    if value:
+        for fmt in ("%Y-%m-%d", "%d-%m-%Y", "%Y-%m"):
+            try:
+                return datetime.datetime.strptime(str(value)[:10], fmt).date()
+            except ValueError:
+                pass
+    return None
+
+
+def transfer(debit_account, credit_account, amount):
+    amount = round(float(amount or 0), 2)
+    if amount == 0:
+        return []
+    if amount < 0:
+        debit_account, credit_account, amount = credit_account, debit_account, -amount
+    return [(debit_account, amount, 0.0), (credit_account, 0.0, amount)]
+
+
+def post_entry(cursor, entry_date, source, source_id, memo, lines, reversal_of=None):
+    if not lines:
+        return None
+    if abs(sum(d - c for _, d, c in lines)) > 0.005:
+        raise HTTPException(status_code=500, detail=f"Unbalanced journal entry for {source} {source_id}")
+    for account, _, _ in lines:
+        if account not in LEDGER_ACCOUNTS:
+            raise HTTPException(status_code=500, detail=f"Unknown ledger account '{account}'")
+
+    when = parse_entry_date(entry_date)
+    if when is None:
+        print(f"Not posting {source} {source_id} to the ledger: no valid date ({entry_date!r})")
+        return None
+    entry_date = when
+    cursor.execute("""
+        INSERT INTO journal_entries (entry_date, source, source_id, memo, reversal_of)
+        VALUES (%s, %s, %s, %s, %s)
+    """, (entry_date, source, str(source_id), memo, reversal_of))
+    entry_id = cursor.lastrowid
+    cursor.executemany(
+        "INSERT INTO journal_lines (entry_id, account_code, debit, credit) VALUES (%s, %s, %s, %s)",
+        [(entry_id, account, debit, credit) for account, debit, credit in lines]
+    )
+
+    # Fold the lines per account before touching the running balances
+    totals = {}
+    for account, debit, credit in lines:
+        d, c = totals.get(account, (0.0, 0.0))
+        totals[account] = (d + debit, c + credit)
+    period = entry_date.strftime("%Y-%m")
+    cursor.executemany(
+        "UPDATE ledger_accounts SET balance = balance + %s WHERE code = %s",
+        [(round(d - c, 2), account) for account, (d, c) in totals.items()]
+    )
+    cursor.executemany("""
+        INSERT INTO ledger_period_balances (account_code, period, debit, credit) VALUES (%s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE debit = debit + VALUES(debit), credit = credit + VALUES(credit)
+    """, [(account, period, round(d, 2), round(c, 2)) for account, (d, c) in totals.items()])
+    return entry_id
+
+
+# Reverse every live entry of a source record (on the original date, so the
+# period it was booked in is corrected)
+def reverse_entries(cursor, source, source_id):
+    cursor.execute("""
+        SELECT id, entry_date, memo FROM journal_entries
+        WHERE source = %s AND source_id = %s AND reversal_of IS NULL AND reversed = FALSE
+    """, (source, str(source_id)))
+    for entry_id, entry_date, memo in cursor.fetchall():
+        cursor.execute("SELECT account_code, debit, credit FROM journal_lines WHERE entry_id = %s", (entry_id,))
+        lines = [(account, float(credit), float(debit)) for account, debit, credit in cursor.fetchall()]
+        post_entry(cursor, entry_date, source, source_id, f"Reversal: {memo}", lines, reversal_of=entry_id)
+        cursor.execute("UPDATE journal_entries SET reversed = TRUE WHERE id = %s", (entry_id,))
+
+
+def repost_entry(cursor, entry_date, source, source_id, memo, lines):
+    reverse_entries(cursor, source, source_id)
+    return post_entry(cursor, entry_date, source, source_id, memo, lines)
+
+
+def amount_of(record, name):
+    return float((record.get(name) if isinstance(record, dict) else getattr(record, name, None)) or 0)
+
+
+def trip_ledger_lines(t, investor_total):
+    billed = amount_of(t, "company_rate") + amount_of(t, "extra_delivery") + amount_of(t, "extra_charges")
+    driver_cost = amount_of(t, "driver_rate") + amount_of(t, "driver_extra_rate")
+    outsourced = bool(t.get("other_truck_no"))
+    lines = (
+        transfer("receivables", "trip_revenue", billed)
+        + transfer("cash", "diesel_sales", amount_of(t, "diesel_sold"))
+        + transfer("diesel_expense", "cash", amount_of(t, "diesel"))
+        + transfer("border_expense", "cash", amount_of(t, "uae_border") + amount_of(t, "international_border"))
+        + transfer("tir_expense", "cash", amount_of(t, "tir_price"))
+        + transfer("customs_expense", "cash", amount_of(t, "custom"))
+        + transfer("cash", "receivables", amount_of(t, "paid_by_client"))
+        + transfer("investor_share", "investor_payable", investor_total)
+    )
+    if outsourced:
+        lines += transfer("outsource_cost", "outsource_payable", driver_cost)
+        if t.get("payable_status") == "PAID":
+            lines += transfer("outsource_payable", "cash", driver_cost)
+    else:
+        lines += transfer("driver_trip_pay", "cash", driver_cost)
+    return lines
+
+
+def post_trip_entry(cursor, trip_id, t, investor_total):
+    lines = trip_ledger_lines(t, investor_total)
+    memo = f"Trip {trip_id} {t.get('client') or ''} {t.get('destination_country') or ''}".strip()
+    repost_entry(cursor, t.get("date"), "trip", trip_id, memo, lines)
+
+
+def maintenance_ledger_lines(r):
+    return (
+        transfer("maintenance_expense", "credit_card", amount_of(r, "credit_card"))
+        + transfer("maintenance_expense", "bank", amount_of(r, "bank"))
+        + transfer("maintenance_expense", "cash", amount_of(r, "cash"))
+        # VAT is invoiced on top of the split payment and settled with the supplier
+        + transfer("vat_input", "supplier_payable", amount_of(r, "vat"))
+    )
+
+
+def fine_ledger_lines(f):
+    amount = amount_of(f, "amount")
+    driver_fault = f.get("driver_fault") if isinstance(f, dict) else f.driver_fault
+    status = f.get("payment_status") if isinstance(f, dict) else f.payment_status
+    # Driver-fault fines are recovered through salary deductions
+    lines = transfer("driver_receivable" if driver_fault else "fines_expense", "fines_payable", amount)
+    if status == "PAID":
+        lines += transfer("fines_payable", "cash", amount)
+    return lines
+
+
+def salary_ledger_lines(s):
+    deductions = {
+        "visa_recoverable": amount_of(s, "visa_deduction"),
+        "driver_receivable": amount_of(s, "fine_deduction"),
+        "employee_advances": amount_of(s, "advance_deduction"),
+    }
+    lines = transfer("salary_expense", "cash", amount_of(s, "net_salary"))
+    for account, amount in deductions.items():
+        lines += transfer("salary_expense", account, amount)
+    return lines
+
+
+class LedgerAccount(BaseModel):
+    code: str
+    name: str
+    type: str
+    balance: float
+
+
+def normal_balance(kind, balance):
+    return round(-float(balance) if kind in CREDIT_NORMAL else float(balance), 2)
+
+# All accounts with their running balances (shown on each account's normal side)
+@router.get("/ledger/accounts", response_model=List[LedgerAccount])
+def get_ledger_accounts():
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("SELECT code, name, type, balance FROM ledger_accounts ORDER BY type, code")
+    accounts = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    for account in accounts:
+        account["balance"] = normal_balance(account["type"], account["balance"])
+    return accounts
+
+# Single account balance
+@router.get("/ledger/accounts/{code}", response_model=LedgerAccount)
+def get_ledger_account(code: str):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("SELECT code, name, type, balance FROM ledger_accounts WHERE code = %s", (code,))
+    account = cursor.fetchone()
+    cursor.close()
+    conn.close()
+    if not account:
+        raise HTTPException(status_code=404, detail="Ledger account not found")
+    account["balance"] = normal_balance(account["type"], account["balance"])
+    return account
+
+# Profit & loss between two periods (YYYY-MM, inclusive) from the period snapshots
+@router.get("/ledger/pnl")
+def get_profit_and_loss(from_period: Optional[str] = None, to_period: Optional[str] = None):
+    where = []
+    params = []
+    if from_period:
+        where.append("p.period >= %s")
+        params.append(from_period)
+    if to_period:
+        where.append("p.period <= %s")
+        params.append(to_period)
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute(f"""
+        SELECT a.code, a.name, a.type, SUM(p.debit) AS debit, SUM(p.credit) AS credit
+        FROM ledger_period_balances p
+        JOIN ledger_accounts a ON a.code = p.account_code
+        WHERE a.type IN ('income', 'expense'){''.join(' AND ' + w for w in where)}
+        GROUP BY a.code, a.name, a.type
+        ORDER BY a.type, a.code
+    """, tuple(params))
+    rows = cursor.fetchall()
+    cursor.close()
+    conn.close()
+
+    income = {r["code"]: normal_balance("income", r["debit"] - r["credit"]) for r in rows if r["type"] == "income"}
+    expenses = {r["code"]: normal_balance("expense", r["debit"] - r["credit"]) for r in rows if r["type"] == "expense"}
+    total_income = round(sum(income.values()), 2)
+    total_expenses = round(sum(expenses.values()), 2)
+    return {
+        "from_period": from_period,
+        "to_period": to_period,
+        "income": income,
+        "expenses": expenses,
+        "total_income": total_income,
+        "total_expenses": total_expenses,
+        "net_profit": round(total_income - total_expenses, 2),
+    }
+
+# Journal entries for one source record, e.g. /ledger/entries?source=trip&source_id=42
+@router.get("/ledger/entries")
+def get_journal_entries(source: str, source_id: str):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("""
+        SELECT e.id, e.entry_date, e.memo, e.reversal_of, e.reversed, l.account_code, l.debit, l.credit
+        FROM journal_entries e JOIN journal_lines l ON l.entry_id = e.id
+        WHERE e.source = %s AND e.source_id = %s
+        ORDER BY e.id, l.id
+    """, (source, source_id))
+    rows = cursor.fetchall()
+    cursor.close()
+    conn.close()
+
+    entries = {}
+    for row in rows:
+        entry = entries.setdefault(row["id"], {
+            "id": row["id"], "entry_date": row["entry_date"], "memo": row["memo"],
+            "reversal_of": row["reversal_of"], "reversed": bool(row["reversed"]), "lines": [],
+        })
+        entry["lines"].append({"account": row["account_code"], "debit": row["debit"], "credit": row["credit"]})
+    return list(entries.values())
+
+
+# Post entries for existing records that have none yet
+LEDGER_BACKFILL = {
+    # source: (table, key, date column)
+    "trip": ("trips", "trip_id", "date"),
+    "maintenance": ("truckmaintenance", "id", "date"),
+    "fine": ("fines", "id", "fine_date"),
+    "salary": ("salary", "id", "month_year"),
+}
+
+
+def backfill_ledger(batch_size=5000):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    posted = 0
+    undated = 0
+    for source, (table, key, date_column) in LEDGER_BACKFILL.items():
+        last_id = 0
+        while True:
+            cursor.execute(f"""
+                SELECT r.* FROM {table} r
+                WHERE r.{key} > %s AND NOT EXISTS (
+                    SELECT 1 FROM journal_entries e WHERE e.source = %s AND e.source_id = r.{key}
+                )
+                ORDER BY r.{key} LIMIT %s
+            """, (last_id, source, batch_size))
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            for row in rows:
+                if source == "trip":
+                    cursor.execute(
+                        "SELECT COALESCE(SUM(share), 0) AS total FROM trip_investor_shares WHERE trip_id = %s",
+                        (row[key],)
+                    )
+                    lines = trip_ledger_lines(row, cursor.fetchone()["total"])
+                elif source == "maintenance":
+                    lines = maintenance_ledger_lines(row)
+                elif source == "fine":
+                    lines = fine_ledger_lines(row)
+                else:
+                    lines = salary_ledger_lines(row)
+                if post_entry(cursor, row[date_column], source, row[key], f"Backfill {source} {row[key]}", lines):
+                    posted += 1
+                elif parse_entry_date(row[date_column]) is None:
+                    undated += 1
+            conn.commit()
+            last_id = rows[-1][key]
+
+    # Investor account rows used to post the investor shares a second time
+    cursor.close()
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT DISTINCT source, source_id FROM journal_entries
+        WHERE source IN ('investor1_account', 'investor2_account') AND reversal_of IS NULL AND reversed = FALSE
+    """)
+    duplicates = cursor.fetchall()
+    for source, source_id in duplicates:
+        reverse_entries(cursor, source, source_id)
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return f"posted {posted} entries, {undated} records without a valid date, reversed {len(duplicates)} investor account postings"
+
+#-----------------------------------------------------aging----------------------------------------------------------------
+# Outstanding client receivables and other-owner payables live in a small
+# open_items table that the trip handlers keep current, so aging reports scan
+# only what is still unpaid instead of the whole trips history.
+AGING_BUCKETS = [("d0_30", 0, 30), ("d31_60", 31, 60), ("d61_90", 61, 90), ("over_90", 91, None)]
+
+
+@router.on_event("startup")
+def ensure_open_items_schema():
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    add_index_if_missing(cursor, "trips", "idx_receivable_status_date", "receivable_status, date")
+    add_index_if_missing(cursor, "trips", "idx_payable_status_date", "payable_status, date")
+    cursor.execute("SHOW TABLES LIKE 'open_items'")
+    backfill = cursor.fetchone() is None
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS open_items (
+            kind VARCHAR(10) NOT NULL,
+            trip_id INT NOT NULL,
+            party VARCHAR(255) NOT NULL,
+            item_date DATE NOT NULL,
+            amount DECIMAL(14, 2) NOT NULL,
+            PRIMARY KEY (kind, trip_id),
+            INDEX idx_trip (trip_id),
+            INDEX idx_kind_party_date (kind, party, item_date, amount)
+        )
+    """)
+    if backfill:
+        rebuild_open_items(cursor)
+    else:
+        # Trips with a NULL status were skipped by the first backfill
+        rebuild_open_items(cursor, where="t.receivable_status IS NULL OR t.payable_status IS NULL")
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+
+# Set-based refresh_open_items for the trips t selected by join and where;
+# a NULL status counts as unpaid there too
+def rebuild_open_items(cursor, join="", where="TRUE"):
+    cursor.execute(f"DELETE o FROM open_items o JOIN trips t ON t.trip_id = o.trip_id {join} WHERE ({where})")
+    for kind, party, amount, status in (
+        ("receivable", "client", "receivable_client", "receivable_status"),
+        ("payable", "other_owner", "outsource_payment", "payable_status"),
+    ):
+        cursor.execute(f"""
+            INSERT INTO open_items (kind, trip_id, party, item_date, amount)
+            SELECT %s, t.trip_id, t.{party}, COALESCE(t.date, CURDATE()), t.{amount} FROM trips t {join}
+            WHERE ({where}) AND COALESCE(t.{status}, '') <> 'PAID' AND t.{amount} > 0 AND COALESCE(t.{party}, '') <> ''
+        """, (kind,))
+
+
+# Replace the open items of one trip from its current row (an empty row clears them)
+def refresh_open_items(cursor, trip_id, t):
+    cursor.execute("DELETE FROM open_items WHERE trip_id = %s", (trip_id,))
+    if not t:
+        return
+    item_date = parse_entry_date(t.get("date")) or datetime.date.today()  # as the backfill's CURDATE()
+    items = []
+    if t.get("receivable_status") != "PAID" and (t.get("receivable_client") or 0) > 0 and t.get("client"):
+        items.append(("receivable", trip_id, t["client"], item_date, t["receivable_client"]))
+    if t.get("payable_status") != "PAID" and (t.get("outsource_payment") or 0) > 0 and t.get("other_owner"):
+        items.append(("payable", trip_id, t["other_owner"], item_date, t["outsource_payment"]))
+    if items:
+        cursor.executemany(
+            "INSERT INTO open_items (kind, trip_id, party, item_date, amount) VALUES (%s, %s, %s, %s, %s)",
+            items
+        )
+
+
+def aging_report(kind, party=None, as_of=None):
+    as_of = as_of or datetime.date.today()
+    buckets = []
+    params = []
+    for name, low, high in AGING_BUCKETS:
+        condition = f">= {low}" if high is None else f"BETWEEN {low} AND {high}"
+        buckets.append(f"COALESCE(SUM(IF(DATEDIFF(%s, item_date) {condition}, amount, 0)), 0) AS {name}")
+        params.append(as_of)
+    query = f"""
+        SELECT party, {', '.join(buckets)}, SUM(amount) AS total, COUNT(*) AS items
+        FROM open_items WHERE kind = %s
+    """
+    params.append(kind)
+    if party:
+        query += " AND party = %s"
+        params.append(party)
+    query += " GROUP BY party ORDER BY total DESC"
+
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute(query, tuple(params))
+    rows = cursor.fetchall()
+    cursor.close()
+    conn.close()
+
+    keys = [name for name, _, _ in AGING_BUCKETS] + ["total"]
+    totals = {key: round(sum(float(r[key]) for r in rows), 2) for key in keys}
+    return {"as_of": as_of, "parties": rows, "totals": totals}
+
+# Outstanding client receivables by age bucket
+@router.get("/receivables/aging")
+def get_receivables_aging(client: Optional[str] = None, as_of: Optional[datetime.date] = None):
+    return aging_report("receivable", client, as_of)
+
+# Outstanding payments to other owners by age bucket
+@router.get("/payables/aging")
+def get_payables_aging(other_owner: Optional[str] = None, as_of: Optional[datetime.date] = None):
+    return aging_report("payable", other_owner, as_of)
+
+#-----------------------------------------------------patch----------------------------------------------------------------
+# Partial updates; see patch_record
+# Update only the supplied client fields
+@router.patch("/clients/{client_name}")
+def patch_client(client_name: str, body: dict = Body(...), if_match: Optional[str] = Header(None)):
+    return patch_record("Client", "clients", "name", client_name, clients, body, if_match,
+                        renamable=True, sync_table="clients", cache_prefix="clients")
+
+# Update only the supplied supplier fields
+@router.patch("/suppliers/{name}")
+def patch_supplier(name: str, body: dict = Body(...), if_match: Optional[str] = Header(None)):
+    return patch_record("Supplier", "suppliers", "name", name, supplier, body, if_match, renamable=True)
+
+# Update only the supplied investor fields
+@router.patch("/investors/{investor_id}")
+def patch_investor(investor_id: int, body: dict = Body(...), if_match: Optional[str] = Header(None)):
+    return patch_record("Investor", "investors", "id", investor_id, Investor, body, if_match)
+
+# Update only the supplied investor1 account fields
+@router.patch("/investor1-accounts/{record_id}")
+def patch_investor1_account(record_id: int, body: dict = Body(...), if_match: Optional[str] = Header(None)):
+    def after(cursor, key, current, record, changes):
+        reverse_entries(cursor, "investor1_account", key)
+
+    return patch_record("Record", "investor1_accounts", "id", record_id, Investor1Account, body, if_match,
+                        after=after)
+
+# Update only the supplied investor2 account fields
+@router.patch("/investor2-accounts/{record_id}")
+def patch_investor2_account(record_id: int, body: dict = Body(...), if_match: Optional[str] = Header(None)):
+    def after(cursor, key, current, record, changes):
+        reverse_entries(cursor, "investor2_account", key)
+
+    return patch_record("Record", "investor2_accounts", "id", record_id, Investor2Account, body, if_match,
+                        after=after)
+
+# Update only the supplied salary fields
+@router.patch("/salaries/{salary_id}")
+def patch_salary(salary_id: int, body: dict = Body(...), if_match: Optional[str] = Header(None)):
+    def after(cursor, key, current, record, changes):
+        repost_entry(cursor, record["month_year"], "salary", key,
+                     f"Salary {record['employee']} {record['month_year']}", salary_ledger_lines(record))
+
+    return patch_record("Salary record", "salary", "id", salary_id, Salary, body, if_match, after=after)
+
+#-----------------------------------------------------includes-------------------------------------------------------------
+INCLUDES["employees"]["salaries"] = ("salary", "employee", Salary)
@@ -0,0 +1,1950 @@
+# Trucks, trailers, maintenance, fines and trips, with the schedule and fleet series built on them
+import datetime
+import os
+from bisect import bisect_right
+from typing import List, Optional
+
+from fastapi import APIRouter, Body, HTTPException, Header
+from pydantic import BaseModel, validator
+
+from .archive import date_range_clause, find_archived, read_archived
+from .cache import cache
+from .db import (
+    add_column_if_missing, add_index_if_missing, expected_version, get_db_connection, raise_if_stale,
+    raise_if_stale_version, release_db_connection, stream_rows,
+)
+from .finance import (
+    LEGACY_SHARE_COLUMNS, TripInvestorShare, amount_of, fine_ledger_lines, maintenance_ledger_lines,
+    parse_entry_date, post_entry, post_trip_entry, rebuild_open_items, refresh_open_items, repost_entry,
+    reverse_entries, save_trip_shares, settle_trips, trip_shares, with_legacy_share_columns,
+)
+from .includes import INCLUDES, attach_includes, parse_includes, select_by_keys, split_keys
+from .patch import patch_record
+from .sync import record_tombstone
+
+router = APIRouter()
+
+#-----------------------------------------------------trucks-----------------------------------------
+# Pydantic models
+class truck(BaseModel):
+    truck_number: str
+    driver: Optional[str] = None
+    year: Optional[int] = None
+    vehicle_under: str
+    trailer_no: Optional[str] = None
+    country:str
+    mulkiya_exp:Optional[str] = None
+    ins_exp:Optional[str] = None
+    truck_value: Optional[int] = None
+    version: Optional[int] = None
+
+             # Validator to ensure load_date is formatted as a string
+    @validator('mulkiya_exp', pre=True)
+    def format_load_datet1(cls, v):
+        if isinstance(v, datetime.date):
+            return v.strftime('%d-%m-%Y')  # Convert to string in 'YYYY-MM-DD' format
+        return v
+    
+                 # Validator to ensure load_date is formatted as a string
+    @validator('ins_exp', pre=True)
+    def format_load_datet2(cls, v):
+        if isinstance(v, datetime.date):
+            return v.strftime('%d-%m-%Y')  # Convert to string in 'YYYY-MM-DD' format
+        return v
+
+# fetch all (or only ?numbers=a,b), optionally with ?include=documents,fines,maintenance
+@router.get("/trucks", response_model=List[dict])
+def get_all_clients(numbers: Optional[str] = None, include: Optional[str] = None):
+    includes = parse_includes("trucks", include)
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    if numbers:
+        rows = select_by_keys(cursor, "Trucks", "truck_number", split_keys(numbers))
+    else:
+        cursor.execute("SELECT * FROM Trucks;")
+        rows = cursor.fetchall()
+    rows = attach_includes(cursor, "trucks", [truck(**row).dict() for row in rows], "truck_number", includes)
+    cursor.close()
+    conn.close()
+    return rows
+
+
+# Fetch truck numbers
+@router.get("/trucks-num", response_model=List[str])
+def get_truck_numbers():
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT truck_number FROM Trucks;")
+    trucks = [row[0] for row in cursor.fetchall()]
+    cursor.close()
+    conn.close()
+    return trucks
+
+#add new truck
+@router.post("/trucks")
+def add_truck(truck_data: truck):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    query = """
+    INSERT INTO Trucks (
+        truck_number, driver, year, vehicle_under, trailer_no, country, 
+        mulkiya_exp, ins_exp, truck_value
+    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s);
+    """
+    values = (
+        truck_data.truck_number, truck_data.driver,
+        truck_data.year, truck_data.vehicle_under, truck_data.trailer_no,truck_data.country,
+        truck_data.mulkiya_exp,
+        truck_data.ins_exp, truck_data.truck_value
+    )
+    cursor.execute(query, values)
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return {"message": "Truck added successfully!"}
+
+# Delete truck by number and its associated documents
+@router.delete("/trucks/{truck_number}")
+def delete_truck(truck_number: str):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    # Fetch document file paths to delete from disk
+    cursor.execute("SELECT url FROM truck_documents WHERE truck_number = %s", (truck_number,))
+    document_paths = cursor.fetchall()
+
+    # Delete documents from disk
+    for doc in document_paths:
+        file_path = doc["url"]
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+    # Delete documents from DB
+    cursor.execute("DELETE FROM truck_documents WHERE truck_number = %s", (truck_number,))
+
+    # Delete truck record
+    cursor.execute("DELETE FROM trucks WHERE truck_number = %s", (truck_number,))
+    if cursor.rowcount == 0:
+        conn.rollback()
+        cursor.close()
+        conn.close()
+        raise HTTPException(status_code=404, detail="Truck not found")
+    record_tombstone(cursor, "trucks", truck_number)
+
+    conn.commit()
+    cache.invalidate(f"trucks:{truck_number}")
+    cursor.close()
+    conn.close()
+
+    return {"message": f"Truck '{truck_number}' and associated documents deleted successfully"}
+
+
+#update truck
+@router.put("/trucks/{truck_number}")
+def update_truck(truck_number: str, truck_data: truck, if_match: Optional[str] = Header(None)):
+    expected = expected_version(if_match, truck_data)
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        query = """
+        UPDATE Trucks SET 
+            truck_number=%s, driver=%s, year=%s, vehicle_under=%s, trailer_no=%s, country=%s,
+            mulkiya_exp=%s, ins_exp=%s, truck_value=%s, version=version+1
+        WHERE truck_number=%s AND version=COALESCE(%s, version);
+        """
+        values = (
+            truck_data.truck_number, truck_data.driver,
+            truck_data.year, truck_data.vehicle_under, truck_data.trailer_no, truck_data.country,
+            truck_data.mulkiya_exp,
+            truck_data.ins_exp, truck_data.truck_value, truck_number, expected
+        )
+        cursor.execute(query, values)
+        if cursor.rowcount == 0:
+            raise_if_stale(cursor, "Trucks", "truck_number", truck_number)
+            raise HTTPException(status_code=404, detail="Truck not found")
+        if truck_data.truck_number != truck_number:
+            record_tombstone(cursor, "trucks", truck_number)
+        conn.commit()
+        cache.invalidate(f"trucks:{truck_number}", f"trucks:{truck_data.truck_number}")
+    finally:
+        release_db_connection(conn, cursor)
+    return {"message": "Truck updated successfully!"}
+
+#get truck driver name
+@router.get("/trucks/by-driver/{driver_name}", response_model=List[str])
+def get_trucks_by_driver(driver_name: str):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT truck_number FROM Trucks WHERE driver = %s;", (driver_name,))
+    trucks = [row[0] for row in cursor.fetchall()]
+    cursor.close()
+    conn.close()
+    return trucks
+
+#get full truck details
+@router.get("/trucks/{truck_number}", response_model=truck)
+def get_truck(truck_number: str):
+    cached = cache.get(f"trucks:{truck_number}")
+    if cached is not None:
+        return cached
+    version = cache.version(f"trucks:{truck_number}")
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("SELECT * FROM Trucks WHERE truck_number = %s;", (truck_number,))
+    truck_data = cursor.fetchone()
+    cursor.close()
+    conn.close()
+    if truck_data:
+        truck_data = truck(**truck_data).dict()
+        cache.set(f"trucks:{truck_number}", truck_data, version)
+        return truck_data
+    else:
+        raise HTTPException(status_code=404, detail="Truck not found")
+
+#-----------------------------------------------------other_trucks-----------------------------------------
+# Pydantic models
+class other_truck(BaseModel):
+    truck_number: str
+    owner: str
+    driver: Optional[str] = None
+    year: Optional[int] = None
+    vehicle_under: str
+    trailer_no: Optional[str] = None
+    country:str
+    mulkiya_exp:Optional[str] = None
+    ins_exp:Optional[str] = None
+    version: Optional[int] = None
+
+
+             # Validator to ensure load_date is formatted as a string
+    @validator('mulkiya_exp', pre=True)
+    def format_load_datet1(cls, v):
+        if isinstance(v, datetime.date):
+            return v.strftime('%d-%m-%Y')  # Convert to string in 'YYYY-MM-DD' format
+        return v
+    
+                 # Validator to ensure load_date is formatted as a string
+    @validator('ins_exp', pre=True)
+    def format_load_datet2(cls, v):
+        if isinstance(v, datetime.date):
+            return v.strftime('%d-%m-%Y')  # Convert to string in 'YYYY-MM-DD' format
+        return v
+
+# fetch all
+@router.get("/other-trucks", response_model=List[other_truck])
+def get_all_clients():
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("SELECT * FROM other_Trucks;")
+    trucks = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    return trucks
+
+
+# Fetch truck numbers
+@router.get("/other-trucks-num", response_model=List[str])
+def get_truck_numbers():
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT truck_number FROM other_Trucks;")
+    trucks = [row[0] for row in cursor.fetchall()]
+    cursor.close()
+    conn.close()
+    return trucks
+
+#add new truck
+@router.post("/other-trucks")
+def add_truck(truck_data: other_truck):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    query = """
+    INSERT INTO other_Trucks (
+        truck_number, owner, driver, year, vehicle_under, trailer_no, country, 
+        mulkiya_exp, ins_exp
+    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s);
+    """
+    values = (
+        truck_data.truck_number, truck_data.owner, truck_data.driver,
+        truck_data.year, truck_data.vehicle_under, truck_data.trailer_no,truck_data.country,
+        truck_data.mulkiya_exp,
+        truck_data.ins_exp
+    )
+    cursor.execute(query, values)
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return {"message": "Truck added successfully!"}
+
+#delete truck
+@router.delete("/other-trucks/{truck_number}")
+def delete_truck(truck_number: str):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM other_Trucks WHERE truck_number = %s;", (truck_number,))
+    if cursor.rowcount == 0:
+        raise HTTPException(status_code=404, detail="Truck not found")
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return {"message": f"Truck '{truck_number}' deleted successfully"}
+
+#update truck
+@router.put("/other-trucks/{truck_number}")
+def update_truck(truck_number: str, truck_data: other_truck, if_match: Optional[str] = Header(None)):
+    expected = expected_version(if_match, truck_data)
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        query = """
+        UPDATE other_Trucks SET 
+            truck_number=%s, owner=%s, driver=%s, year=%s, vehicle_under=%s, trailer_no=%s, country=%s,
+            mulkiya_exp=%s, ins_exp=%s, version=version+1
+        WHERE truck_number=%s AND version=COALESCE(%s, version);
+        """
+        values = (
+            truck_data.truck_number, truck_data.owner, truck_data.driver,
+            truck_data.year, truck_data.vehicle_under, truck_data.trailer_no, truck_data.country,
+            truck_data.mulkiya_exp,
+            truck_data.ins_exp, truck_number, expected
+        )
+        cursor.execute(query, values)
+        if cursor.rowcount == 0:
+            raise_if_stale(cursor, "other_Trucks", "truck_number", truck_number)
+            raise HTTPException(status_code=404, detail="Truck not found")
+        conn.commit()
+    finally:
+        release_db_connection(conn, cursor)
+    return {"message": "Truck updated successfully!"}
+
+#get truck driver name
+@router.get("/other-trucks/by-driver/{driver_name}", response_model=List[str])
+def get_trucks_by_driver(driver_name: str):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT truck_number FROM other_Trucks WHERE driver = %s;", (driver_name,))
+    trucks = [row[0] for row in cursor.fetchall()]
+    cursor.close()
+    conn.close()
+    return trucks
+
+#get full truck details
+@router.get("/other-trucks/{truck_number}", response_model=other_truck)
+def get_truck(truck_number: str):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("SELECT * FROM other_Trucks WHERE truck_number = %s;", (truck_number,))
+    truck_data = cursor.fetchone()
+    cursor.close()
+    conn.close()
+    if truck_data:
+        return truck_data
+    else:
+        raise HTTPException(status_code=404, detail="Truck not found")
+    
+#---------------------------------------trailer--------------------------------------------
+class Trailer(BaseModel):
+    trailer_no: str
+    company_under: str
+    mulkiya_exp: Optional[str] = None
+    oman_ins_exp: Optional[str] = None
+    asset_value: Optional[int] = None
+    version: Optional[int] = None
+
+    @validator('mulkiya_exp', pre=True)
+    def format_mulkiya_date(cls, v):
+        if isinstance(v, datetime.date):
+            return v.strftime('%d-%m-%Y')
+        return v
+
+    @validator('oman_ins_exp', pre=True)
+    def format_insurance_date(cls, v):
+        if isinstance(v, datetime.date):
+            return v.strftime('%d-%m-%Y')
+        return v
+
+
+# Fetch all trailers
+@router.get("/trailers", response_model=List[Trailer])
+def get_all_trailers():
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("SELECT * FROM trailers;")
+    trailers = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    return trailers
+
+# Fetch a single trailer by number
+@router.get("/trailers/{trailer_no}", response_model=Trailer)
+def get_trailer(trailer_no: str):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("SELECT * FROM trailers WHERE trailer_no = %s;", (trailer_no,))
+    trailer = cursor.fetchone()
+    cursor.close()
+    conn.close()
+    if not trailer:
+        raise HTTPException(status_code=404, detail="Trailer not found")
+    return trailer
+
+# Add a trailer
+@router.post("/trailers")
+def add_trailer(trailer: Trailer):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    query = """
+    INSERT INTO trailers (trailer_no, company_under, mulkiya_exp, oman_ins_exp, asset_value)
+    VALUES (%s, %s, %s, %s, %s);
+    """
+    values = (
+        trailer.trailer_no, trailer.company_under,
+        trailer.mulkiya_exp, trailer.oman_ins_exp, trailer.asset_value
+    )
+    cursor.execute(query, values)
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return {"message": "Trailer added successfully!"}
+
+# Update a trailer
+@router.put("/trailers/{trailer_no}")
+def update_trailer(trailer_no: str, trailer: Trailer, if_match: Optional[str] = Header(None)):
+    expected = expected_version(if_match, trailer)
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        query = """
+        UPDATE trailers SET company_under=%s, mulkiya_exp=%s, oman_ins_exp=%s, asset_value=%s, version=version+1
+        WHERE trailer_no=%s AND version=COALESCE(%s, version);
+        """
+        values = (
+            trailer.company_under, trailer.mulkiya_exp,
+            trailer.oman_ins_exp, trailer.asset_value, trailer_no, expected
+        )
+        cursor.execute(query, values)
+        if cursor.rowcount == 0:
+            raise_if_stale(cursor, "trailers", "trailer_no", trailer_no)
+            raise HTTPException(status_code=404, detail="Trailer not found")
+        conn.commit()
+    finally:
+        release_db_connection(conn, cursor)
+    return {"message": "Trailer updated successfully!"}
+
+
+# Delete a trailer and associated documents
+@router.delete("/trailers/{trailer_no}")
+def delete_trailer(trailer_no: str):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    # Fetch trailer document file paths
+    cursor.execute("SELECT url FROM trailer_documents WHERE trailer_number = %s", (trailer_no,))
+    document_paths = cursor.fetchall()
+
+    # Delete documents from disk
+    for doc in document_paths:
+        file_path = doc["url"]
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+    # Delete documents from DB
+    cursor.execute("DELETE FROM trailer_documents WHERE trailer_number = %s", (trailer_no,))
+
+    # Delete the trailer
+    cursor.execute("DELETE FROM trailers WHERE trailer_no = %s;", (trailer_no,))
+    if cursor.rowcount == 0:
+        conn.rollback()
+        cursor.close()
+        conn.close()
+        raise HTTPException(status_code=404, detail="Trailer not found")
+    record_tombstone(cursor, "trailers", trailer_no)
+
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return {"message": f"Trailer '{trailer_no}' and its documents were deleted successfully"}
+
+#---------------------------------------other_trailer--------------------------------------------
+class OtherTrailer(BaseModel):
+    trailer_no: str
+    owner: str
+    company_under: str
+    mulkiya_exp: Optional[str] = None
+    oman_ins_exp: Optional[str] = None
+    version: Optional[int] = None
+
+    @validator('mulkiya_exp', pre=True)
+    def format_mulkiya_date(cls, v):
+        if isinstance(v, datetime.date):
+            return v.strftime('%d-%m-%Y')
+        return v
+
+    @validator('oman_ins_exp', pre=True)
+    def format_insurance_date(cls, v):
+        if isinstance(v, datetime.date):
+            return v.strftime('%d-%m-%Y')
+        return v
+
+
+# Fetch all other trailers
+@router.get("/other-trailers", response_model=List[OtherTrailer])
+def get_all_other_trailers():
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("SELECT * FROM other_trailer;")
+    trailers = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    return trailers
+
+# Get one by trailer number
+@router.get("/other-trailers/{trailer_no}", response_model=OtherTrailer)
+def get_other_trailer(trailer_no: str):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("SELECT * FROM other_trailer WHERE trailer_no = %s;", (trailer_no,))
+    trailer = cursor.fetchone()
+    cursor.close()
+    conn.close()
+    if not trailer:
+        raise HTTPException(status_code=404, detail="Trailer not found")
+    return trailer
+
+# Add trailer
+@router.post("/other-trailers")
+def add_other_trailer(trailer: OtherTrailer):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        INSERT INTO other_trailer (trailer_no, owner, company_under, mulkiya_exp, oman_ins_exp)
+        VALUES (%s, %s, %s, %s, %s)
+    """, (trailer.trailer_no, trailer.owner, trailer.company_under, trailer.mulkiya_exp, trailer.oman_ins_exp))
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return {"message": "Other trailer added successfully"}
+
+# Update trailer
+@router.put("/other-trailers/{trailer_no}")
+def update_other_trailer(trailer_no: str, trailer: OtherTrailer, if_match: Optional[str] = Header(None)):
+    expected = expected_version(if_match, trailer)
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            UPDATE other_trailer SET owner=%s, company_under=%s, mulkiya_exp=%s, oman_ins_exp=%s, version=version+1
+            WHERE trailer_no=%s AND version=COALESCE(%s, version)
+        """, (trailer.owner, trailer.company_under, trailer.mulkiya_exp, trailer.oman_ins_exp, trailer_no, expected))
+        if cursor.rowcount == 0:
+            raise_if_stale(cursor, "other_trailer", "trailer_no", trailer_no)
+            raise HTTPException(status_code=404, detail="Trailer not found")
+        conn.commit()
+    finally:
+        release_db_connection(conn, cursor)
+    return {"message": "Other trailer updated successfully"}
+
+# Delete trailer
+@router.delete("/other-trailers/{trailer_no}")
+def delete_other_trailer(trailer_no: str):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM other_trailer WHERE trailer_no = %s;", (trailer_no,))
+    if cursor.rowcount == 0:
+        raise HTTPException(status_code=404, detail="Trailer not found")
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return {"message": f"Trailer '{trailer_no}' deleted successfully"}
+
+#--------------------------------------maintenance--------------------------------------------------------
+# Define one model for creating records (no `id`)
+class MaintenanceCreate(BaseModel):
+    date: str
+    driver_name: Optional[str] = None
+    truck_number: Optional[str] = None
+    vehicle_under: Optional[str] = None
+    maintenance_detail: Optional[str] = None
+    credit_card: float
+    bank: float
+    cash: float
+    vat: float
+    total: Optional[float] = None
+    status: str
+    supplier:Optional[str] = None
+
+
+class Maintenance(BaseModel):
+    id: int
+    date: str
+    driver_name: Optional[str] = None
+    truck_number: Optional[str] = None
+    vehicle_under: Optional[str] = None
+    maintenance_detail: Optional[str] = None
+    credit_card: float
+    bank: float
+    cash: float
+    vat: float
+    total: Optional[float] = None
+    status: str
+    supplier:Optional[str] = None
+    version: Optional[int] = None
+
+       # Validator to ensure load_date is formatted as a string
+    @validator('date', pre=True)
+    def format_load_datemain(cls, v):
+        if isinstance(v, datetime.date):
+            return v.strftime('%d-%m-%Y')  # Convert to string in 'YYYY-MM-DD' format
+        return v
+
+# Fetch all maintenance records (optionally within a date range)
+@router.get("/maintenance", response_model=List[Maintenance])
+def get_all_maintenance(from_date: Optional[datetime.date] = None, to_date: Optional[datetime.date] = None,
+                        accept: Optional[str] = Header(None)):
+    archived = read_archived("truckmaintenance", "date", from_date, to_date)
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    where, params = date_range_clause("date", from_date, to_date)
+    cursor.execute(f"SELECT * FROM truckmaintenance{where};", params)
+    return stream_rows(conn, cursor, Maintenance, archived, accept)
+
+
+# Fetch a specific maintenance record by ID
+@router.get("/maintenance/{record_id}", response_model=Maintenance)
+def get_maintenance_by_id(record_id: int):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("SELECT * FROM truckmaintenance WHERE id = %s;", (record_id,))
+    record = cursor.fetchone()
+    cursor.close()
+    conn.close()
+    if not record:
+        raise HTTPException(status_code=404, detail="Maintenance record not found")
+    return record
+
+
+# Add a new maintenance record
+@router.post("/maintenance")
+def add_maintenance(record: MaintenanceCreate):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    query = """
+        INSERT INTO truckmaintenance (
+            date, driver_name, truck_number, vehicle_under,
+            maintenance_detail, credit_card, bank, cash, vat, status, supplier
+        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s);
+    """
+    values = (
+        record.date, record.driver_name, record.truck_number,
+        record.vehicle_under, record.maintenance_detail,
+        record.credit_card, record.bank, record.cash,
+        record.vat, record.status, record.supplier
+    )
+
+    cursor.execute(query, values)
+    record_id = cursor.lastrowid
+    post_entry(cursor, record.date, "maintenance", record_id, f"Maintenance {record.truck_number or ''}".strip(),
+               maintenance_ledger_lines(record))
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return {"message": "Maintenance record added successfully!"}
+
+
+# Update an existing maintenance record
+@router.put("/maintenance/{record_id}")
+def update_maintenance(record_id: int, record: Maintenance, if_match: Optional[str] = Header(None)):
+    expected = expected_version(if_match, record)
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        # Calculate total as sum of credit_card + bank + cash + vat
+        total = record.credit_card + record.bank + record.cash + record.vat
+    
+        query = """
+            UPDATE truckmaintenance SET
+                date=%s, driver_name=%s, truck_number=%s, vehicle_under=%s,
+                maintenance_detail=%s, credit_card=%s, bank=%s, cash=%s,
+                vat=%s, total=%s, status=%s, supplier=%s, version=version+1
+            WHERE id=%s AND version=COALESCE(%s, version);
+        """
+        values = (
+            record.date, record.driver_name, record.truck_number,
+            record.vehicle_under, record.maintenance_detail,
+            record.credit_card, record.bank, record.cash,
+            record.vat, total, record.status, record.supplier, record_id, expected
+        )
+    
+        cursor.execute(query, values)
+        if cursor.rowcount == 0:
+            raise_if_stale(cursor, "truckmaintenance", "id", record_id)
+            raise HTTPException(status_code=404, detail="Record not found")
+        repost_entry(cursor, record.date, "maintenance", record_id, f"Maintenance {record.truck_number or ''}".strip(),
+                     maintenance_ledger_lines(record))
+    
+        conn.commit()
+    finally:
+        release_db_connection(conn, cursor)
+    return {"message": "Maintenance record updated successfully!"}
+
+
+@router.delete("/maintenance/{record_id}")
+def delete_maintenance(record_id: int):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    # Step 1: Find associated receipt (if any)
+    cursor.execute("SELECT url FROM truckmaintenance_receipts WHERE truck_maintenance_id = %s", (record_id,))
+    receipt = cursor.fetchone()
+
+    # Step 2: Delete the receipt file
+    if receipt and receipt["url"] and os.path.exists(receipt["url"]):
+        os.remove(receipt["url"])
+
+    # Step 3: Delete the receipt DB record
+    cursor.execute("DELETE FROM truckmaintenance_receipts WHERE truck_maintenance_id = %s", (record_id,))
+
+    # Step 4: Delete the maintenance record
+    cursor.execute("DELETE FROM truckmaintenance WHERE id = %s;", (record_id,))
+    if cursor.rowcount == 0:
+        conn.rollback()
+        cursor.close()
+        conn.close()
+        raise HTTPException(status_code=404, detail="Record not found")
+    record_tombstone(cursor, "truckmaintenance", record_id)
+    reverse_entries(cursor, "maintenance", record_id)
+
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+    return {"message": f"Maintenance record with ID {record_id} and associated receipt deleted successfully"}
+
+
+# # Delete a maintenance record
+# @router.delete("/maintenance/{record_id}")
+# def delete_maintenance(record_id: int):
+#     conn = get_db_connection()
+#     cursor = conn.cursor()
+#     cursor.execute("DELETE FROM truckmaintenance WHERE id = %s;", (record_id,))
+#     if cursor.rowcount == 0:
+#         raise HTTPException(status_code=404, detail="Record not found")
+#     conn.commit()
+#     cursor.close()
+#     conn.close()
+#     return {"message": f"Record with ID {record_id} deleted successfully"}
+
+#--------------------------------------other_owner--------------------------------------------------------
+class OtherOwner(BaseModel):
+    name: str
+    contact: Optional[int] = None
+    remarks: Optional[int] = None
+    eid: Optional[int] = None
+    version: Optional[int] = None
+
+
+# Get all other owners
+@router.get("/other-owners", response_model=List[OtherOwner])
+def get_all_other_owners():
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("SELECT * FROM other_owner;")
+    owners = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    return owners
+
+# Get a single owner by name
+@router.get("/other-owners/{name}", response_model=OtherOwner)
+def get_other_owner(name: str):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("SELECT * FROM other_owner WHERE name = %s;", (name,))
+    owner = cursor.fetchone()
+    cursor.close()
+    conn.close()
+    if not owner:
+        raise HTTPException(status_code=404, detail="Other owner not found")
+    return owner
+
+# Add a new other owner
+@router.post("/other-owners")
+def add_other_owner(owner: OtherOwner):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        INSERT INTO other_owner (name, contact, remarks, eid)
+        VALUES (%s, %s, %s, %s)
+    """, (owner.name, owner.contact, owner.remarks, owner.eid))
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return {"message": "Other owner added successfully"}
+
+# Update an existing other owner
+@router.put("/other-owners/{name}")
+def update_other_owner(name: str, owner: OtherOwner, if_match: Optional[str] = Header(None)):
+    expected = expected_version(if_match, owner)
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            UPDATE other_owner SET contact=%s, remarks=%s, eid=%s, version=version+1 WHERE name=%s AND version=COALESCE(%s, version)
+        """, (owner.contact, owner.remarks, owner.eid, name, expected))
+        if cursor.rowcount == 0:
+            raise_if_stale(cursor, "other_owner", "name", name)
+            raise HTTPException(status_code=404, detail="Other owner not found")
+        conn.commit()
+    finally:
+        release_db_connection(conn, cursor)
+    return {"message": "Other owner updated successfully"}
+
+# Delete an other owner
+@router.delete("/other-owners/{name}")
+def delete_other_owner(name: str):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM other_owner WHERE name = %s;", (name,))
+    if cursor.rowcount == 0:
+        raise HTTPException(status_code=404, detail="Other owner not found")
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return {"message": f"Other owner '{name}' deleted successfully"}
+
+#--------------------------------------inventory--------------------------------------------------------
+class Inventory(BaseModel):
+    id: int
+    name: str
+    supplier: str
+    supplier_contact: int
+    remarks: Optional[str] = None
+    quantity: int
+    version: Optional[int] = None
+
+
+# Get all inventory items
+@router.get("/inventory", response_model=List[Inventory])
+def get_all_inventory():
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("SELECT * FROM inventory;")
+    items = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    return items
+
+# Get single item by ID
+@router.get("/inventory/{item_id}", response_model=Inventory)
+def get_inventory_item(item_id: int):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("SELECT * FROM inventory WHERE id = %s;", (item_id,))
+    item = cursor.fetchone()
+    cursor.close()
+    conn.close()
+    if not item:
+        raise HTTPException(status_code=404, detail="Item not found")
+    return item
+
+# Add new item
+@router.post("/inventory")
+def add_inventory(item: Inventory):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        INSERT INTO inventory (id, name, supplier, supplier_contact, remarks, quantity)
+        VALUES (%s, %s, %s, %s, %s, %s)
+    """, (item.id, item.name, item.supplier, item.supplier_contact, item.remarks, item.quantity))
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return {"message": "Inventory item added successfully"}
+
+# Update inventory item
+@router.put("/inventory/{item_id}")
+def update_inventory(item_id: int, item: Inventory, if_match: Optional[str] = Header(None)):
+    expected = expected_version(if_match, item)
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            UPDATE inventory SET name=%s, supplier=%s, supplier_contact=%s, remarks=%s, quantity=%s, version=version+1
+            WHERE id=%s AND version=COALESCE(%s, version)
+        """, (item.name, item.supplier, item.supplier_contact, item.remarks, item.quantity, item_id, expected))
+        if cursor.rowcount == 0:
+            raise_if_stale(cursor, "inventory", "id", item_id)
+            raise HTTPException(status_code=404, detail="Item not found")
+        conn.commit()
+    finally:
+        release_db_connection(conn, cursor)
+    return {"message": "Inventory item updated successfully"}
+
+# Delete item
+@router.delete("/inventory/{item_id}")
+def delete_inventory(item_id: int):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM inventory WHERE id = %s;", (item_id,))
+    if cursor.rowcount == 0:
+        raise HTTPException(status_code=404, detail="Item not found")
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return {"message": f"Inventory item with ID {item_id} deleted successfully"}
+
+#--------------------------------------fine--------------------------------------------------------
+class Fine(BaseModel):
+    id: int
+    trip_id: Optional[int] = None
+    reason: Optional[str] = None
+    truck_number: Optional[str] = None
+    driver_name: Optional[str] = None
+    driver_fault: Optional[bool] = None
+    fine_date: Optional[str] = None  # format: 'YYYY-MM-DD'
+    amount: float
+    payment_status: str
+    version: Optional[int] = None
+
+         # Validator to ensure load_date is formatted as a string
+    @validator('fine_date', pre=True)
+    def format_load_date(cls, v):
+        if isinstance(v, datetime.date):
+            return v.strftime('%d-%m-%Y')  # Convert to string in 'YYYY-MM-DD' format
+        return v
+
+
+# Get all fines (optionally within a date range)
+@router.get("/fines", response_model=List[Fine])
+def get_all_fines(from_date: Optional[datetime.date] = None, to_date: Optional[datetime.date] = None,
+                  accept: Optional[str] = Header(None)):
+    archived = read_archived("fines", "fine_date", from_date, to_date)
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    where, params = date_range_clause("fine_date", from_date, to_date)
+    cursor.execute(f"SELECT * FROM fines{where};", params)
+    return stream_rows(conn, cursor, Fine, archived, accept)
+
+# Get fine by ID
+@router.get("/fines/{fine_id}", response_model=Fine)
+def get_fine(fine_id: int):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("SELECT * FROM fines WHERE id = %s;", (fine_id,))
+    fine = cursor.fetchone()
+    cursor.close()
+    conn.close()
+    if not fine:
+        raise HTTPException(status_code=404, detail="Fine not found")
+    return fine
+
+#by truck number
+@router.get("/fines/by-truck/{truck_number}", response_model=List[Fine])
+def get_fines_by_truck(truck_number: str):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("""
+        SELECT * FROM fines 
+        WHERE truck_number = %s AND driver_fault = 1 AND payment_status= "UNPAID";
+    """, (truck_number,))
+    fines = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    return fines
+
+#by driver name
+@router.get("/fines/by-driver/{driver_name}", response_model=List[Fine])
+def get_fines_by_driver(driver_name: str):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("""
+        SELECT * FROM fines 
+        WHERE driver_name = %s AND driver_fault = 1 AND payment_status= "UNPAID";
+    """, (driver_name,))
+    fines = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    return fines
+
+
+#not driver fault
+@router.get("/fines/company-fault", response_model=List[Fine])
+def get_company_fault_fines():
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("""
+        SELECT * FROM fines 
+        WHERE driver_fault = 0 AND payment_status= "UNPAID";
+    """)
+    fines = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    return fines
+
+# Add new fine
+@router.post("/fines")
+def add_fine(data: Fine):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    data = match_fine_to_trip(cursor, data)
+    cursor.execute("""
+        INSERT INTO fines (
+            trip_id, reason, truck_number, driver_name, driver_fault, fine_date, amount, payment_status
+        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+    """, (
+        data.trip_id, data.reason, data.truck_number, data.driver_name,
+        data.driver_fault, data.fine_date, data.amount, data.payment_status
+    ))
+    post_entry(cursor, data.fine_date, "fine", cursor.lastrowid, f"Fine {data.truck_number or ''} {data.reason or ''}".strip(),
+               fine_ledger_lines(data))
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return {"message": "Fine added successfully"}
+
+# Update fine
+@router.put("/fines/{fine_id}")
+def update_fine(fine_id: int, data: Fine, if_match: Optional[str] = Header(None)):
+    expected = expected_version(if_match, data)
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            UPDATE fines SET 
+                trip_id=%s, reason=%s, truck_number=%s, driver_name=%s,
+                driver_fault=%s, fine_date=%s, amount=%s, payment_status=%s, version=version+1
+            WHERE id=%s AND version=COALESCE(%s, version)
+        """, (
+            data.trip_id, data.reason, data.truck_number, data.driver_name,
+            data.driver_fault, data.fine_date, data.amount, data.payment_status, fine_id, expected
+        ))
+        if cursor.rowcount == 0:
+            raise_if_stale(cursor, "fines", "id", fine_id)
+            raise HTTPException(status_code=404, detail="Fine not found")
+        repost_entry(cursor, data.fine_date, "fine", fine_id, f"Fine {data.truck_number or ''} {data.reason or ''}".strip(),
+                     fine_ledger_lines(data))
+        conn.commit()
+    finally:
+        release_db_connection(conn, cursor)
+    return {"message": "Fine updated successfully"}
+
+# Delete fine
+@router.delete("/fines/{fine_id}")
+def delete_fine(fine_id: int):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM fines WHERE id = %s;", (fine_id,))
+    if cursor.rowcount == 0:
+        raise HTTPException(status_code=404, detail="Fine not found")
+    record_tombstone(cursor, "fines", fine_id)
+    reverse_entries(cursor, "fine", fine_id)
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return {"message": f"Fine with ID {fine_id} deleted successfully"}
+
+#--------------------------------------trips--------------------------------------------------------
+# -------------------------------
+# Pydantic Model for Trips
+# -------------------------------
+class Trip(BaseModel):
+    return_load: Optional[bool] = None
+    date: Optional[str] = None
+    destination_country: str
+    service_provider: str
+    client: str
+    trip_description: Optional[str] = None
+    truck_no: Optional[str] = None
+    driver: Optional[str] = None
+    other_truck_no: Optional[str] = None
+    other_driver: Optional[str] = None
+    other_driver_contact: Optional[int] = None
+    company_rate: int
+    driver_rate: int
+    diesel: int
+    diesel_sold: Optional[int] = None
+    advance: Optional[int] = 0
+    advance_usage_details: Optional[str] = None
+    advance_expense: Optional[float] = None
+    trip_rate: Optional[int] = None
+    uae_border: Optional[int] = 0
+    uae_border_details: Optional[str] = None
+    international_border: Optional[int] = 0
+    international_border_details: Optional[str] = None
+    extra_delivery: Optional[int] = 0
+    extra_delivery_details: Optional[str] = None
+    driver_extra_rate: Optional[int] = None
+    extra_charges: Optional[float] = 0.0
+    extra_charges_details: Optional[str] = None
+    lpo_no: Optional[str] = None
+    dio_no: Optional[str] = None
+    tir_no: Optional[str] = None
+    tir_price: Optional[int] = None
+    investor1_share: Optional[int] = None
+    investor2_share: Optional[int] = None
+    investor3_share: Optional[int] = None
+    investor4_share: Optional[int] = None
+    investor5_share: Optional[int] = None
+    custom: Optional[float] = None
+    paid_by_client: Optional[float] = None
+    paid_by_client_details: Optional[str] = None
+    receivable_client: Optional[int] = None
+    receivable_status: Optional[str] = "UNPAID"
+    outsource_payment: Optional[int] = None
+    payable_status: Optional[str] = "UNPAID"
+    truck_profit: Optional[float] = None
+    company_profit: Optional[float] = None
+    other_owner: Optional[str] = None
+    other_owner_number: Optional[str] = None
+    end_date: Optional[str] = None  # last day of the trip; single-day trip when empty
+    # Any number of investors; when omitted the investor1..5_share columns are used
+    investor_shares: Optional[List[TripInvestorShare]] = None
+    version: Optional[int] = None  # row version read with the trip; stale updates get 409
+
+             # Validator to ensure load_date is formatted as a string
+    @validator('date', 'end_date', pre=True)
+    def format_load_date(cls, v):
+        if isinstance(v, datetime.date):
+            return v.strftime('%d-%m-%Y')  # Convert to string in 'YYYY-MM-DD' format
+        return v
+
+    # One share per investor; a repeated investor_id would collapse when saved
+    @validator('investor_shares')
+    def unique_investor_shares(cls, v):
+        if v is not None:
+            ids = [s.investor_id for s in v]
+            repeated = sorted({i for i in ids if ids.count(i) > 1})
+            if repeated:
+                raise ValueError(f"investor_id listed more than once: {', '.join(map(str, repeated))}")
+        return v
+
+# Columns actually stored on the trips row
+def trip_row(trip):
+    return trip.dict(exclude={"investor_shares", "version"})
+
+# -------------------------------
+# Trip economics
+# -------------------------------
+# The backend owns truck_profit, company_profit, receivable_client and
+# outsource_payment. compute_trip_economics works on whole columns so the same
+# formulas serve a single create/update and the bulk recompute command.
+TRIP_ECONOMICS_INPUTS = [
+    "company_rate", "driver_rate", "driver_extra_rate", "diesel", "diesel_sold",
+    "uae_border", "international_border", "extra_delivery", "extra_charges",
+    "tir_price", "custom", "paid_by_client",
+]
+TRIP_ECONOMICS_OUTPUTS = ["truck_profit", "company_profit", "receivable_client", "outsource_payment"]
+
+
+def compute_trip_economics(cols, outsourced, investor_total):
+    import numpy as np
+
+    c = {name: np.nan_to_num(np.asarray(cols[name], dtype=float)) for name in TRIP_ECONOMICS_INPUTS}
+    billed = c["company_rate"] + c["extra_delivery"] + c["extra_charges"]
+    costs = c["diesel"] + c["uae_border"] + c["international_border"] + c["tir_price"] + c["custom"]
+    driver_cost = c["driver_rate"] + c["driver_extra_rate"]
+    investors = np.nan_to_num(np.asarray(investor_total, dtype=float))
+
+    truck_profit = billed + c["diesel_sold"] - costs - driver_cost
+    return {
+        "truck_profit": np.round(truck_profit, 2),
+        "company_profit": np.round(truck_profit - investors, 2),
+        "receivable_client": np.rint(billed - c["paid_by_client"]).astype(np.int64),
+        # Outsourced trips pay the driver rate to the other truck's owner
+        "outsource_payment": np.where(outsourced, np.rint(driver_cost), 0).astype(np.int64),
+    }
+
+
+def apply_trip_economics(trip):
+    data = trip.dict()
+    result = compute_trip_economics(
+        {name: [data[name]] for name in TRIP_ECONOMICS_INPUTS},
+        [bool(data["other_truck_no"])],
+        [sum(s.share for s in trip_shares(trip))],
+    )
+    return trip.copy(update={name: result[name][0].item() for name in TRIP_ECONOMICS_OUTPUTS})
+
+
+# Re-derive the economics of every live trip in keyset batches; only rows whose
+# values actually change are written back.
+def recompute_trips(batch_size=50000):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        CREATE TEMPORARY TABLE IF NOT EXISTS trip_economics (
+            trip_id INT PRIMARY KEY, truck_profit DOUBLE, company_profit DOUBLE,
+            receivable_client INT, outsource_payment INT
+        )
+    """)
+    columns = ", ".join(f"t.{name}" for name in TRIP_ECONOMICS_INPUTS)
+    last_id = 0
+    seen = changed = 0
+    while True:
+        cursor.execute(f"""
+            SELECT t.trip_id, t.other_truck_no,
+                   (SELECT COALESCE(SUM(s.share), 0) FROM trip_investor_shares s WHERE s.trip_id = t.trip_id),
+                   {columns}
+            FROM trips t WHERE t.trip_id > %s ORDER BY t.trip_id LIMIT %s
+        """, (last_id, batch_size))
+        rows = cursor.fetchall()
+        if not rows:
+            break
+        values = list(zip(*rows))
+        result = compute_trip_economics(
+            dict(zip(TRIP_ECONOMICS_INPUTS, values[3:])),
+            [bool(v) for v in values[1]],
+            values[2],
+        )
+        cursor.execute("TRUNCATE TABLE trip_economics")
+        cursor.executemany(
+            "INSERT INTO trip_economics VALUES (%s, %s, %s, %s, %s)",
+            list(zip(
+                values[0],
+                result["truck_profit"].tolist(), result["company_profit"].tolist(),
+                result["receivable_client"].tolist(), result["outsource_payment"].tolist(),
+            ))
+        )
+        cursor.execute("""
+            UPDATE trips t JOIN trip_economics e ON e.trip_id = t.trip_id
+            SET t.truck_profit = e.truck_profit, t.company_profit = e.company_profit,
+                t.receivable_client = e.receivable_client, t.outsource_payment = e.outsource_payment
+            WHERE NOT (t.truck_profit <=> e.truck_profit AND t.company_profit <=> e.company_profit
+                       AND t.receivable_client <=> e.receivable_client
+                       AND t.outsource_payment <=> e.outsource_payment)
+        """)
+        changed += cursor.rowcount
+        rebuild_open_items(cursor, join="JOIN trip_economics e ON e.trip_id = t.trip_id")
+        conn.commit()
+        seen += len(rows)
+        last_id = values[0][-1]
+    if changed:
+        rebuild_fleet_days(cursor)
+        conn.commit()
+    cursor.close()
+    conn.close()
+    return f"recomputed {seen} trips, {changed} changed"
+
+# -------------------------------
+# Create Trip
+# -------------------------------
+@router.post("/trips")
+def create_trip(trip: Trip, force: bool = False):
+    trip = apply_trip_economics(with_legacy_share_columns(trip))
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        conflicts = check_trip_conflicts(cursor, None, trip, force)
+        query = '''
+            INSERT INTO trips (
+                return_load, date, destination_country, service_provider, client, trip_description,
+                truck_no, driver, other_truck_no, other_driver, other_driver_contact, company_rate,
+                driver_rate, diesel, diesel_sold, advance, advance_usage_details, advance_expense,
+                trip_rate, uae_border, uae_border_details, international_border, international_border_details,
+                extra_delivery, extra_delivery_details, driver_extra_rate, extra_charges, extra_charges_details,
+                lpo_no, dio_no, tir_no, tir_price, investor1_share, investor2_share, investor3_share,
+                investor4_share, investor5_share, custom, paid_by_client, paid_by_client_details,
+                receivable_client, receivable_status, outsource_payment, payable_status, truck_profit,
+                company_profit, other_owner, other_owner_number, end_date
+            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
+                      %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
+                      %s, %s, %s, %s)
+        '''
+        row = trip_row(trip)
+        values = tuple(row.values())
+        cursor.execute(query, values)
+        trip_id = cursor.lastrowid
+        shares = trip_shares(trip)
+        save_trip_shares(cursor, trip_id, shares)
+        settle_trips(cursor, [trip_id])
+        post_trip_entry(cursor, trip_id, row, sum(s.share for s in shares))
+        refresh_open_items(cursor, trip_id, row)
+        refresh_fleet_days(cursor, [fleet_span(cursor, trip_id)])
+        conn.commit()
+    finally:
+        release_db_connection(conn, cursor)
+    if conflicts:
+        return {"message": "Trip added with scheduling conflicts", "conflicts": conflicts}
+    return {"message": "Trip added successfully"}
+
+# -------------------------------
+# Get All Trips (optionally within a date range)
+# -------------------------------
+@router.get("/trips", response_model=List[dict])
+def get_all_trips(from_date: Optional[datetime.date] = None, to_date: Optional[datetime.date] = None,
+                  accept: Optional[str] = Header(None)):
+    archived = read_archived("trips", "date", from_date, to_date)
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    where, params = date_range_clause("date", from_date, to_date)
+    cursor.execute(f"SELECT * FROM trips{where}", params)
+    return stream_rows(conn, cursor, dict, archived, accept)
+
+# -------------------------------
+# Get Trip By ID
+# -------------------------------
+@router.get("/trips/{trip_id}", response_model=dict)
+def get_trip(trip_id: int):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("SELECT * FROM trips WHERE trip_id = %s", (trip_id,))
+    trip = cursor.fetchone()
+    cursor.close()
+    conn.close()
+    if trip:
+        return trip
+    archived = find_archived("trips", "trip_id", trip_id)
+    if archived:
+        return archived
+    raise HTTPException(status_code=404, detail="Trip not found")
+
+# -------------------------------
+# Update Trip
+# -------------------------------
+@router.put("/trips/{trip_id}")
+def update_trip(trip_id: int, trip: Trip, force: bool = False, if_match: Optional[str] = Header(None)):
+    trip = apply_trip_economics(with_legacy_share_columns(trip))
+    expected = expected_version(if_match, trip)
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        # Lock our own row and check its version before the conflict scan takes
+        # gap locks, so a stale update is turned away without holding them
+        cursor.execute("SELECT version FROM trips WHERE trip_id = %s FOR UPDATE", (trip_id,))
+        current = cursor.fetchone()
+        if not current:
+            raise HTTPException(status_code=404, detail="Trip not found")
+        if expected is not None and current[0] != expected:
+            raise_if_stale_version(current[0])
+        conflicts = check_trip_conflicts(cursor, trip_id, trip, force)
+        previous_span = fleet_span(cursor, trip_id)
+        row = trip_row(trip)
+        set_clause = ", ".join([f"{field}=%s" for field in row.keys()])
+        values = tuple(row.values()) + (trip_id, expected)
+        query = f"""
+            UPDATE trips SET {set_clause}, version=version+1 WHERE trip_id=%s AND version=COALESCE(%s, version)
+        """
+        cursor.execute(query, values)
+        if cursor.rowcount == 0:
+            raise_if_stale(cursor, "trips", "trip_id", trip_id)
+            raise HTTPException(status_code=404, detail="Trip not found")
+        shares = trip_shares(trip)
+        save_trip_shares(cursor, trip_id, shares)
+        settle_trips(cursor, [trip_id])
+        post_trip_entry(cursor, trip_id, row, sum(s.share for s in shares))
+        refresh_open_items(cursor, trip_id, row)
+        refresh_fleet_days(cursor, [previous_span, fleet_span(cursor, trip_id)])
+        conn.commit()
+    finally:
+        release_db_connection(conn, cursor)
+    if conflicts:
+        return {"message": "Trip updated with scheduling conflicts", "conflicts": conflicts}
+    return {"message": "Trip updated successfully"}
+
+# -------------------------------
+# Delete Trip
+# -------------------------------
+@router.delete("/trips/{trip_id}")
+def delete_trip(trip_id: int):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        previous_span = fleet_span(cursor, trip_id)
+        cursor.execute("DELETE FROM trips WHERE trip_id = %s", (trip_id,))
+        if cursor.rowcount == 0:
+            raise HTTPException(status_code=404, detail="Trip not found")
+        record_tombstone(cursor, "trips", trip_id)
+        save_trip_shares(cursor, trip_id, [])
+        settle_trips(cursor, [trip_id])
+        reverse_entries(cursor, "trip", trip_id)
+        refresh_open_items(cursor, trip_id, None)
+        refresh_fleet_days(cursor, [previous_span])
+        conn.commit()
+    finally:
+        release_db_connection(conn, cursor)
+    return {"message": "Trip deleted successfully"}
+
+#--------------------------------------------------------------------------------------------
+#-----------------------------------------------------fine matching--------------------------------------------------------
+# Attach fines to the trip (and driver) they happened on. A truck is taken to
+# be on a trip from the trip date until its next trip starts, capped at
+# FINE_MATCH_WINDOW_DAYS. Single fines use the (truck_no, date) index; the
+# batch backfill builds a per-truck sorted index in memory and bisects it.
+
+FINE_MATCH_WINDOW_DAYS = 14
+FINE_MATCH_BATCH_SIZE = 20000
+
+
+@router.on_event("startup")
+def ensure_fine_matching_indexes():
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    add_index_if_missing(cursor, "trips", "idx_truck_date", "truck_no, date")
+    add_index_if_missing(cursor, "trips", "idx_other_truck_date", "other_truck_no, date")
+    add_index_if_missing(cursor, "fines", "idx_trip_id", "trip_id")
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+
+# Latest trip of the truck that started on or before the fine, within the window
+def match_fine_to_trip(cursor, fine):
+    if fine.trip_id is not None or not fine.truck_number or not fine.fine_date:
+        return fine
+    fine_date = parse_entry_date(fine.fine_date)
+    if fine_date is None:
+        return fine
+    # The driver is the one of whichever truck matched, as in build_trip_interval_index
+    cursor.execute("""
+        SELECT trip_id, driver, date FROM trips
+        WHERE truck_no = %s AND date BETWEEN %s AND %s
+        UNION ALL
+        SELECT trip_id, other_driver, date FROM trips
+        WHERE other_truck_no = %s AND date BETWEEN %s AND %s
+        ORDER BY date DESC, trip_id DESC LIMIT 1
+    """, (fine.truck_number, fine_date - datetime.timedelta(days=FINE_MATCH_WINDOW_DAYS), fine_date) * 2)
+    trip = cursor.fetchone()
+    if not trip:
+        return fine
+    trip_id, driver = trip[0], trip[1]
+    return fine.copy(update={"trip_id": trip_id, "driver_name": fine.driver_name or driver})
+
+
+def build_trip_interval_index(cursor):
+    cursor.execute("""
+        SELECT truck, date, trip_id, driver FROM (
+            SELECT truck_no AS truck, date, trip_id, driver FROM trips WHERE truck_no IS NOT NULL AND date IS NOT NULL
+            UNION ALL
+            SELECT other_truck_no, date, trip_id, other_driver FROM trips WHERE other_truck_no IS NOT NULL AND date IS NOT NULL
+        ) t ORDER BY truck, date, trip_id
+    """)
+    index = {}
+    for truck, date, trip_id, driver in cursor.fetchall():
+        starts, trips = index.setdefault(truck, ([], []))
+        starts.append(date)
+        trips.append((trip_id, driver))
+    return index
+
+
+def lookup_trip(index, truck, fine_date):
+    if truck not in index:
+        return None
+    starts, trips = index[truck]
+    i = bisect_right(starts, fine_date) - 1
+    if i < 0 or (fine_date - starts[i]).days > FINE_MATCH_WINDOW_DAYS:
+        return None
+    return trips[i]
+
+
+# Backfill trip_id (and a missing driver_name) for every unmatched fine
+def match_all_fines():
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    index = build_trip_interval_index(cursor)
+    cursor.execute("""
+        CREATE TEMPORARY TABLE IF NOT EXISTS fine_matches (
+            fine_id INT PRIMARY KEY, trip_id INT NOT NULL, driver VARCHAR(255)
+        )
+    """)
+    last_id = 0
+    seen = matched = 0
+    while True:
+        cursor.execute("""
+            SELECT id, truck_number, fine_date FROM fines
+            WHERE trip_id IS NULL AND id > %s AND truck_number IS NOT NULL AND fine_date IS NOT NULL
+            ORDER BY id LIMIT %s
+        """, (last_id, FINE_MATCH_BATCH_SIZE))
+        fines = cursor.fetchall()
+        if not fines:
+            break
+        matches = []
+        for fine_id, truck, fine_date in fines:
+            trip = lookup_trip(index, truck, fine_date)
+            if trip:
+                matches.append((fine_id, trip[0], trip[1]))
+        if matches:
+            cursor.execute("TRUNCATE TABLE fine_matches")
+            cursor.executemany("INSERT INTO fine_matches VALUES (%s, %s, %s)", matches)
+            cursor.execute("""
+                UPDATE fines f JOIN fine_matches m ON m.fine_id = f.id
+                SET f.trip_id = m.trip_id, f.driver_name = COALESCE(f.driver_name, m.driver), f.version = f.version + 1
+            """)
+            conn.commit()
+        seen += len(fines)
+        matched += len(matches)
+        last_id = fines[-1][0]
+    cursor.close()
+    conn.close()
+    return {"checked": seen, "matched": matched}
+
+# Batch-match all unmatched fines to trips
+@router.post("/fines/match")
+def match_fines():
+    return match_all_fines()
+
+#-----------------------------------------------------scheduling-----------------------------------------------------------
+# A trip occupies its truck and driver from date to end_date (inclusive; a
+# single day when end_date is empty). Writes check for overlaps with an
+# indexed range probe per resource; /schedule/conflicts audits the whole
+# history with one sort-and-sweep per truck and per driver.
+TRIP_MAX_DAYS = 60
+SCHEDULE_COLUMNS = [
+    # (resource, column)
+    ("truck", "truck_no"),
+    ("truck", "other_truck_no"),
+    ("driver", "driver"),
+    ("driver", "other_driver"),
+]
+
+
+@router.on_event("startup")
+def ensure_schedule_schema():
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    add_column_if_missing(cursor, "trips", "end_date", "DATE NULL")
+    add_index_if_missing(cursor, "trips", "idx_driver_date", "driver, date")
+    add_index_if_missing(cursor, "trips", "idx_other_driver_date", "other_driver, date")
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+
+def trip_interval(trip):
+    if not trip.date:
+        return None
+    start = parse_entry_date(trip.date)
+    if start is None:
+        return None
+    end = parse_entry_date(trip.end_date) or start
+    if end < start:
+        raise HTTPException(status_code=422, detail="end_date is before the trip date")
+    if (end - start).days > TRIP_MAX_DAYS:
+        raise HTTPException(status_code=422, detail=f"Trips cannot be longer than {TRIP_MAX_DAYS} days")
+    return start, end
+
+
+# Other trips holding the same truck or driver during this trip. Rows are read
+# FOR UPDATE so two overlapping writes cannot both pass the check.
+def check_trip_conflicts(cursor, trip_id, trip, force=False):
+    interval = trip_interval(trip)
+    if not interval:
+        return []
+    start, end = interval
+    conflicts = []
+    seen = set()
+    for resource, field in SCHEDULE_COLUMNS:
+        value = getattr(trip, field)
+        if not value:
+            continue
+        for other_resource, column in SCHEDULE_COLUMNS:
+            if other_resource != resource:
+                continue
+            cursor.execute(f"""
+                SELECT trip_id, date, COALESCE(end_date, date) FROM trips
+                WHERE {column} = %s AND date BETWEEN %s AND %s
+                  AND COALESCE(end_date, date) >= %s AND trip_id <> %s
+                FOR UPDATE
+            """, (value, start - datetime.timedelta(days=TRIP_MAX_DAYS), end, start, trip_id or 0))
+            for other_id, other_start, other_end in cursor.fetchall():
+                if (resource, value, other_id) in seen:
+                    continue
+                seen.add((resource, value, other_id))
+                conflicts.append({
+                    "resource": resource, "value": value, "trip_id": other_id,
+                    "date": str(other_start), "end_date": str(other_end),
+                })
+    if conflicts and not force:
+        raise HTTPException(status_code=409, detail={
+            "message": "Truck or driver is already assigned during this trip (retry with ?force=true to save anyway)",
+            "conflicts": conflicts,
+        })
+    return conflicts
+
+# Every overlapping truck/driver assignment across the trip history
+@router.get("/schedule/conflicts")
+def get_schedule_conflicts(from_date: Optional[datetime.date] = None, to_date: Optional[datetime.date] = None):
+    where, params = date_range_clause("date", from_date, to_date)
+    where = (where + " AND" if where else " WHERE") + " date IS NOT NULL"
+    columns = ", ".join(column for _, column in SCHEDULE_COLUMNS)
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT trip_id, date, COALESCE(end_date, date), {columns} FROM trips{where}", params)
+    trips = cursor.fetchall()
+    cursor.close()
+    conn.close()
+
+    assignments = []
+    for trip_id, start, end, *values in trips:
+        for (resource, _), value in zip(SCHEDULE_COLUMNS, values):
+            if value:
+                assignments.append((resource, value, start, end, trip_id))
+    assignments.sort()
+
+    conflicts = []
+    active = []
+    current = None
+    for resource, value, start, end, trip_id in assignments:
+        if (resource, value) != current:
+            current = (resource, value)
+            active = []
+        active = [a for a in active if a[1] >= start]
+        for other_id, other_end in active:
+            if other_id != trip_id:
+                conflicts.append({
+                    "resource": resource, "value": value, "trip_ids": [other_id, trip_id],
+                    "overlap_start": start, "overlap_end": min(end, other_end),
+                })
+        active.append((trip_id, end))
+    return {"checked_trips": len(trips), "conflicts": conflicts}
+
+#-----------------------------------------------------fleet series---------------------------------------------------------
+# Daily per-truck buckets (active day, trips started, revenue, profit) kept
+# current by the trip handlers, so utilization and revenue charts read at most
+# trucks x days rows for the requested window regardless of trip history.
+FLEET_RESOLUTIONS = ["day", "week", "month"]
+FLEET_PERIODS = {
+    "day": "day",
+    "week": "DATE_SUB(day, INTERVAL WEEKDAY(day) DAY)",
+    "month": "DATE_SUB(day, INTERVAL DAYOFMONTH(day) - 1 DAY)",
+}
+FLEET_TRIP_COLUMNS = """
+    truck_no, date, COALESCE(end_date, date),
+    COALESCE(company_rate, 0) + COALESCE(extra_delivery, 0) + COALESCE(extra_charges, 0),
+    COALESCE(truck_profit, 0)
+"""
+
+
+@router.on_event("startup")
+def ensure_fleet_days_schema():
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("SHOW TABLES LIKE 'fleet_days'")
+    backfill = cursor.fetchone() is None
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS fleet_days (
+            truck_no VARCHAR(255) NOT NULL,
+            day DATE NOT NULL,
+            active TINYINT NOT NULL DEFAULT 0,
+            trips INT NOT NULL DEFAULT 0,
+            revenue DECIMAL(14, 2) NOT NULL DEFAULT 0,
+            profit DECIMAL(14, 2) NOT NULL DEFAULT 0,
+            PRIMARY KEY (truck_no, day),
+            INDEX idx_day (day)
+        )
+    """)
+    if backfill:
+        rebuild_fleet_days(cursor)
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+
+# Bucket trips by day: a trip makes its truck active on every day it covers
+# and counts its revenue and profit on its first day. Days outside
+# [start, end] are ignored when a window is given.
+def fleet_buckets(trips, start=None, end=None):
+    buckets = {}
+    for truck_no, trip_start, trip_end, revenue, profit in trips:
+        first = max(trip_start, start) if start else trip_start
+        last = min(trip_end, end) if end else trip_end
+        day = first
+        while day <= last:
+            bucket = buckets.setdefault((truck_no, day), [0, 0, 0.0, 0.0])
+            bucket[0] = 1
+            if day == trip_start:
+                bucket[1] += 1
+                bucket[2] += float(revenue)
+                bucket[3] += float(profit)
+            day += datetime.timedelta(days=1)
+    return [(truck_no, day, *bucket) for (truck_no, day), bucket in buckets.items()]
+
+
+def rebuild_fleet_days(cursor):
+    cursor.execute(f"SELECT {FLEET_TRIP_COLUMNS} FROM trips WHERE truck_no IS NOT NULL AND truck_no <> '' AND date IS NOT NULL")
+    rows = fleet_buckets(cursor.fetchall())
+    cursor.execute("DELETE FROM fleet_days")
+    for i in range(0, len(rows), 10000):
+        cursor.executemany(
+            "INSERT INTO fleet_days (truck_no, day, active, trips, revenue, profit) VALUES (%s, %s, %s, %s, %s, %s)",
+            rows[i:i + 10000]
+        )
+    return len(rows)
+
+
+# Truck and days a stored trip occupies, or None when it has neither
+def fleet_span(cursor, trip_id):
+    cursor.execute("SELECT truck_no, date, COALESCE(end_date, date) FROM trips WHERE trip_id = %s", (trip_id,))
+    row = cursor.fetchone()
+    if not row or not row[0] or not row[1]:
+        return None
+    return row
+
+
+# Recompute the buckets covered by the given (truck_no, start, end) spans
+def refresh_fleet_days(cursor, spans):
+    for span in set(s for s in spans if s):
+        truck_no, start, end = span
+        cursor.execute(f"""
+            SELECT {FLEET_TRIP_COLUMNS} FROM trips
+            WHERE truck_no = %s AND date BETWEEN %s AND %s AND COALESCE(end_date, date) >= %s
+        """, (truck_no, start - datetime.timedelta(days=TRIP_MAX_DAYS), end, start))
+        rows = fleet_buckets(cursor.fetchall(), start, end)
+        cursor.execute("DELETE FROM fleet_days WHERE truck_no = %s AND day BETWEEN %s AND %s", (truck_no, start, end))
+        if rows:
+            cursor.executemany(
+                "INSERT INTO fleet_days (truck_no, day, active, trips, revenue, profit) VALUES (%s, %s, %s, %s, %s, %s)",
+                rows
+            )
+
+
+# (calendar start of the period, days of the period inside the window) for
+# each day, ISO week or month touched by the window
+def fleet_periods(from_date, to_date, resolution):
+    periods = []
+    day = from_date
+    while day <= to_date:
+        if resolution == "day":
+            start, following = day, day + datetime.timedelta(days=1)
+        elif resolution == "week":
+            start = day - datetime.timedelta(days=day.weekday())
+            following = start + datetime.timedelta(days=7)
+        else:
+            start = day.replace(day=1)
+            following = (start + datetime.timedelta(days=32)).replace(day=1)
+        following = min(following, to_date + datetime.timedelta(days=1))
+        periods.append((start, (following - day).days))
+        day = following
+    return periods
+
+
+# Merge neighbouring points so at most `points` remain; numeric fields are summed
+# and each merged point keeps the period where it starts.
+def downsample(series, points):
+    if not points or len(series) <= points:
+        return series
+    size = -(-len(series) // points)
+    merged = []
+    for i in range(0, len(series), size):
+        group = series[i:i + size]
+        point = dict(group[0])
+        for other in group[1:]:
+            for key, value in other.items():
+                if key != "period":
+                    point[key] += value
+        merged.append(point)
+    return merged
+
+
+def fleet_window(from_date, to_date, resolution):
+    if resolution not in FLEET_RESOLUTIONS:
+        raise HTTPException(status_code=400, detail=f"resolution must be one of {', '.join(FLEET_RESOLUTIONS)}")
+    to_date = to_date or datetime.date.today()
+    from_date = from_date or to_date - datetime.timedelta(days=89)
+    if from_date > to_date:
+        raise HTTPException(status_code=400, detail="from_date is after to_date")
+    return from_date, to_date
+
+
+def fleet_rows(fields, from_date, to_date, resolution, truck_no=None, by_truck=False):
+    period = FLEET_PERIODS[resolution]
+    group = f"truck_no, {period}" if by_truck else period
+    query = f"SELECT {group}, {fields} FROM fleet_days WHERE day BETWEEN %s AND %s"
+    params = [from_date, to_date]
+    if truck_no:
+        query += " AND truck_no = %s"
+        params.append(truck_no)
+    query += f" GROUP BY {group}"
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute(query, tuple(params))
+    rows = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    return rows
+
+# Active and idle days per truck, per period
+@router.get("/fleet/utilization")
+def get_fleet_utilization(from_date: Optional[datetime.date] = None, to_date: Optional[datetime.date] = None,
+                          resolution: str = "day", points: Optional[int] = None, truck_no: Optional[str] = None):
+    from_date, to_date = fleet_window(from_date, to_date, resolution)
+    periods = fleet_periods(from_date, to_date, resolution)
+    active = {}
+    for truck, period, trip_days in fleet_rows("SUM(active)", from_date, to_date, resolution, truck_no, by_truck=True):
+        active[(truck, parse_entry_date(period))] = int(trip_days)
+
+    if truck_no:
+        trucks = [truck_no]
+    else:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT truck_number FROM Trucks")
+        trucks = sorted({row[0] for row in cursor.fetchall()} | {truck for truck, _ in active})
+        cursor.close()
+        conn.close()
+
+    total_days = (to_date - from_date).days + 1
+    result = []
+    for truck in trucks:
+        series = []
+        for period, days in periods:
+            trip_days = active.get((truck, period), 0)
+            series.append({"period": period, "days": days, "trip_days": trip_days, "idle_days": days - trip_days})
+        trip_days = sum(point["trip_days"] for point in series)
+        result.append({
+            "truck_no": truck,
+            "trip_days": trip_days,
+            "idle_days": total_days - trip_days,
+            "utilization": round(trip_days / total_days, 4),
+            "series": downsample(series, points),
+        })
+    return {"from_date": from_date, "to_date": to_date, "resolution": resolution, "trucks": result}
+
+# Fleet revenue and profit per period
+@router.get("/fleet/revenue-series")
+def get_fleet_revenue_series(from_date: Optional[datetime.date] = None, to_date: Optional[datetime.date] = None,
+                             resolution: str = "day", points: Optional[int] = None, truck_no: Optional[str] = None):
+    from_date, to_date = fleet_window(from_date, to_date, resolution)
+    totals = {}
+    for period, trips, revenue, profit in fleet_rows(
+        "SUM(trips), SUM(revenue), SUM(profit)", from_date, to_date, resolution, truck_no
+    ):
+        totals[parse_entry_date(period)] = (int(trips), float(revenue), float(profit))
+
+    series = []
+    for period, _ in fleet_periods(from_date, to_date, resolution):
+        trips, revenue, profit = totals.get(period, (0, 0.0, 0.0))
+        series.append({"period": period, "trips": trips, "revenue": revenue, "profit": profit})
+    return {
+        "from_date": from_date,
+        "to_date": to_date,
+        "resolution": resolution,
+        "truck_no": truck_no,
+        "trips": sum(point["trips"] for point in series),
+        "revenue": round(sum(point["revenue"] for point in series), 2),
+        "profit": round(sum(point["profit"] for point in series), 2),
+        "series": [
+            dict(point, revenue=round(point["revenue"], 2), profit=round(point["profit"], 2))
+            for point in downsample(series, points)
+        ],
+    }
+
+#-----------------------------------------------------patch----------------------------------------------------------------
+# Partial updates; see patch_record
+# Update only the supplied truck fields
+@router.patch("/trucks/{truck_number}")
+def patch_truck(truck_number: str, body: dict = Body(...), if_match: Optional[str] = Header(None)):
+    return patch_record("Truck", "Trucks", "truck_number", truck_number, truck, body, if_match,
+                        renamable=True, sync_table="trucks", cache_prefix="trucks")
+
+# Update only the supplied other-truck fields
+@router.patch("/other-trucks/{truck_number}")
+def patch_other_truck(truck_number: str, body: dict = Body(...), if_match: Optional[str] = Header(None)):
+    return patch_record("Truck", "other_Trucks", "truck_number", truck_number, other_truck, body, if_match,
+                        renamable=True)
+
+# Update only the supplied trailer fields
+@router.patch("/trailers/{trailer_no}")
+def patch_trailer(trailer_no: str, body: dict = Body(...), if_match: Optional[str] = Header(None)):
+    return patch_record("Trailer", "trailers", "trailer_no", trailer_no, Trailer, body, if_match,
+                        renamable=True, sync_table="trailers")
+
+# Update only the supplied other-trailer fields
+@router.patch("/other-trailers/{trailer_no}")
+def patch_other_trailer(trailer_no: str, body: dict = Body(...), if_match: Optional[str] = Header(None)):
+    return patch_record("Trailer", "other_trailer", "trailer_no", trailer_no, OtherTrailer, body, if_match,
+                        renamable=True)
+
+# Update only the supplied other-owner fields
+@router.patch("/other-owners/{name}")
+def patch_other_owner(name: str, body: dict = Body(...), if_match: Optional[str] = Header(None)):
+    return patch_record("Other owner", "other_owner", "name", name, OtherOwner, body, if_match, renamable=True)
+
+# Update only the supplied inventory fields
+@router.patch("/inventory/{item_id}")
+def patch_inventory(item_id: int, body: dict = Body(...), if_match: Optional[str] = Header(None)):
+    return patch_record("Item", "inventory", "id", item_id, Inventory, body, if_match)
+
+# Update only the supplied maintenance fields
+@router.patch("/maintenance/{record_id}")
+def patch_maintenance(record_id: int, body: dict = Body(...), if_match: Optional[str] = Header(None)):
+    def derive(cursor, key, record, changes):
+        return {"total": sum(amount_of(record, name) for name in ("credit_card", "bank", "cash", "vat"))}
+
+    def after(cursor, key, current, record, changes):
+        repost_entry(cursor, record["date"], "maintenance", key,
+                     f"Maintenance {record['truck_number'] or ''}".strip(), maintenance_ledger_lines(record))
+
+    return patch_record("Record", "truckmaintenance", "id", record_id, Maintenance, body, if_match,
+                        derive=derive, after=after)
+
+# Update only the supplied fine fields
+@router.patch("/fines/{fine_id}")
+def patch_fine(fine_id: int, body: dict = Body(...), if_match: Optional[str] = Header(None)):
+    def after(cursor, key, current, record, changes):
+        repost_entry(cursor, record["fine_date"], "fine", key,
+                     f"Fine {record['truck_number'] or ''} {record['reason'] or ''}".strip(), fine_ledger_lines(record))
+
+    return patch_record("Fine", "fines", "id", fine_id, Fine, body, if_match, after=after)
+
+
+TRIP_SCHEDULE_FIELDS = {"date", "end_date"} | {column for _, column in SCHEDULE_COLUMNS}
+
+
+# Shares of a patched trip: (new shares to store or None when unchanged, total)
+def patched_trip_shares(cursor, trip_id, record, changes):
+    if changes.get("investor_shares") is not None:
+        shares = [TripInvestorShare(**s) for s in changes["investor_shares"] if s["share"]]
+    elif any(f"investor{n}_share" in changes for n in range(1, LEGACY_SHARE_COLUMNS + 1)):
+        shares = trip_shares(Trip.construct(**record))
+    else:
+        cursor.execute("SELECT COALESCE(SUM(share), 0) FROM trip_investor_shares WHERE trip_id = %s", (trip_id,))
+        return None, float(cursor.fetchone()[0])
+    return shares, sum(s.share for s in shares)
+
+# Update only the supplied trip fields; profits, shares, ledger and schedule follow
+@router.patch("/trips/{trip_id}")
+def patch_trip(trip_id: int, body: dict = Body(...), force: bool = False, if_match: Optional[str] = Header(None)):
+    conflicts = []
+
+    def derive(cursor, key, record, changes):
+        updates = {}
+        if changes.get("investor_shares") is not None:
+            by_investor = {s["investor_id"]: s["share"] for s in changes["investor_shares"]}
+            updates = {
+                f"investor{n}_share": (int(by_investor[n]) if n in by_investor else None)
+                for n in range(1, LEGACY_SHARE_COLUMNS + 1)
+            }
+        record = dict(record, **updates)
+        _, investor_total = patched_trip_shares(cursor, key, record, changes)
+        result = compute_trip_economics(
+            {name: [record[name]] for name in TRIP_ECONOMICS_INPUTS},
+            [bool(record["other_truck_no"])],
+            [investor_total],
+        )
+        updates.update({name: result[name][0].item() for name in TRIP_ECONOMICS_OUTPUTS})
+        if TRIP_SCHEDULE_FIELDS & set(changes):
+            conflicts.extend(check_trip_conflicts(cursor, key, Trip.construct(**record), force))
+        return updates
+
+    def after(cursor, key, current, record, changes):
+        shares, investor_total = patched_trip_shares(cursor, key, record, changes)
+        if shares is not None:
+            save_trip_shares(cursor, key, shares)
+        settle_trips(cursor, [key])
+        post_trip_entry(cursor, key, record, investor_total)
+        refresh_open_items(cursor, key, record)
+        previous_span = None
+        if current["truck_no"] and current["date"]:
+            previous_span = (current["truck_no"], current["date"], current["end_date"] or current["date"])
+        refresh_fleet_days(cursor, [previous_span, fleet_span(cursor, key)])
+
+    result = patch_record("Trip", "trips", "trip_id", trip_id, Trip, body, if_match, derive=derive, after=after)
+    if conflicts:
+        result["conflicts"] = conflicts
+    return result
+
+#-----------------------------------------------------includes-------------------------------------------------------------
+INCLUDES["employees"]["trucks"] = ("Trucks", "driver", truck)
+INCLUDES["employees"]["fines"] = ("fines", "driver_name", Fine)
+INCLUDES["trucks"]["fines"] = ("fines", "truck_number", Fine)
+INCLUDES["trucks"]["maintenance"] = ("truckmaintenance", "truck_number", Maintenance)
@@ -0,0 +1,53 @@
+# Related rows for ?include= on the list endpoints
+from fastapi import HTTPException
+
+#-----------------------------------------------------includes-------------------------------------------------------------
+# Related rows for ?include= on the list endpoints. Each relation is loaded
+# with one WHERE ... IN query over all the requested parents (chunked for very
+# long lists), so a page costs one statement per relation, not one per row.
+INCLUDE_CHUNK = 500
+INCLUDES = {
+    # entity: {include: (table, column matching the entity key, model)}; the
+    # modules that own the related tables add their entries
+    "employees": {},
+    "trucks": {},
+}
+
+
+def split_keys(value):
+    return [key.strip() for key in value.split(",") if key.strip()] if value else []
+
+
+def parse_includes(entity, include):
+    names = split_keys(include)
+    unknown = [name for name in names if name not in INCLUDES[entity]]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown include {', '.join(unknown)}; expected any of {', '.join(INCLUDES[entity])}"
+        )
+    return names
+
+
+def select_by_keys(cursor, table, column, keys):
+    rows = []
+    keys = list(dict.fromkeys(keys))
+    for i in range(0, len(keys), INCLUDE_CHUNK):
+        chunk = keys[i:i + INCLUDE_CHUNK]
+        cursor.execute(f"SELECT * FROM {table} WHERE {column} IN ({', '.join(['%s'] * len(chunk))})", tuple(chunk))
+        rows.extend(cursor.fetchall())
+    return rows
+
+
+# Add one list per include to every row, keyed by the row's key_field
+def attach_includes(cursor, entity, rows, key_field, includes):
+    keys = [row[key_field] for row in rows]
+    for name in includes:
+        table, column, model = INCLUDES[entity][name]
+        related = {}
+        if keys:
+            for record in select_by_keys(cursor, table, column, keys):
+                related.setdefault(record[column], []).append(model(**record).dict())
+        for row in rows:
+            row[name] = related.get(row[key_field], [])
+    return rows
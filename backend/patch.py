@@ -0,0 +1,96 @@
+# Partial updates shared by the PATCH routes
+import datetime
+from decimal import Decimal
+from typing import Optional
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from pydantic import ValidationError, create_model
+
+from .cache import cache
+from .db import expected_version, get_db_connection, raise_if_stale, raise_if_stale_version, release_db_connection
+from .sync import record_tombstone
+
+#-----------------------------------------------------patch----------------------------------------------------------------
+# PATCH takes a partial body, validates just the supplied fields against the
+# resource model and UPDATEs only the columns whose value actually differs
+# (bumping the row version). When nothing differs no statement is written.
+
+partial_models = {}
+
+
+# The resource model with every field optional and defaulting to None
+def partial_model(model):
+    if model not in partial_models:
+        fields = {
+            name: (Optional[field.annotation], None)
+            for name, field in model.__fields__.items()
+        }
+        partial_models[model] = create_model(f"{model.__name__}Patch", __base__=model, **fields)
+    return partial_models[model]
+
+
+def same_value(old, new):
+    if old is None or new is None:
+        return old is None and new is None
+    if isinstance(old, (int, float, Decimal)) and isinstance(new, (int, float, Decimal)):
+        return float(old) == float(new)
+    if isinstance(old, datetime.date) and not isinstance(old, datetime.datetime) and isinstance(new, str):
+        return old.isoformat() == new
+    return str(old) == str(new)
+
+
+# Apply a partial body to one row. derive(cursor, key, record, changes) may add
+# computed columns before the write; after(cursor, key, current, record, changes)
+# runs side effects once the row is written.
+def patch_record(name, table, key_column, key, model, body, if_match,
+                 renamable=False, sync_table=None, cache_prefix=None, derive=None, after=None):
+    unknown = sorted(set(body) - set(model.__fields__))
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown field(s): {', '.join(unknown)}")
+    try:
+        changes = partial_model(model)(**body).dict(exclude_unset=True)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=jsonable_encoder(e.errors(), custom_encoder={Exception: str}))
+    body_version = changes.pop("version", None)
+    expected = expected_version(if_match) if if_match else body_version
+    if key_column in changes and not renamable and changes[key_column] != key:
+        raise HTTPException(status_code=422, detail=f"{key_column} cannot be changed")
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"SELECT * FROM {table} WHERE {key_column} = %s", (key,))
+        row = cursor.fetchone()
+        if not row:
+            raise HTTPException(status_code=404, detail=f"{name} not found")
+        current = dict(zip(cursor.column_names, row))
+        if expected is not None and current["version"] != expected:
+            raise_if_stale_version(current["version"])
+
+        record = dict(current)
+        record.update({column: value for column, value in changes.items() if column in current})
+        if derive:
+            record.update(derive(cursor, key, record, changes))
+        diff = {column: record[column] for column in current if not same_value(current[column], record[column])}
+        if not diff and all(field in current for field in changes):
+            return {"message": "Nothing to update", "version": current["version"], "changed": []}
+
+        assignments = "".join(f"{column}=%s, " for column in diff)
+        cursor.execute(
+            f"UPDATE {table} SET {assignments}version=version+1 WHERE {key_column}=%s AND version=%s",
+            tuple(diff.values()) + (key, current["version"])
+        )
+        if cursor.rowcount == 0:
+            raise_if_stale(cursor, table, key_column, key)
+            raise HTTPException(status_code=404, detail=f"{name} not found")
+        if sync_table and key_column in diff:
+            record_tombstone(cursor, sync_table, key)
+        if after:
+            after(cursor, key, current, record, changes)
+        conn.commit()
+    finally:
+        release_db_connection(conn, cursor)
+    if cache_prefix:
+        cache.invalidate(f"{cache_prefix}:{key}", f"{cache_prefix}:{record[key_column]}")
+    return {"message": f"{name} updated successfully", "version": current["version"] + 1, "changed": sorted(diff)}
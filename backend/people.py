@@ -0,0 +1,412 @@
+# Drivers, employees and the companies they are under
+import datetime
+import os
+from typing import List, Optional
+
+from fastapi import APIRouter, Body, HTTPException, Header
+from pydantic import BaseModel, validator
+
+from .cache import cache
+from .db import expected_version, get_db_connection, raise_if_stale, release_db_connection
+from .includes import attach_includes, parse_includes, select_by_keys, split_keys
+from .patch import patch_record
+from .sync import record_tombstone
+
+router = APIRouter()
+
+#------------------------------------------driver----------------------------------------------------------
+# Pydantic models
+class driver(BaseModel):
+    employee: str
+    refered_as: str
+    
+# Fetch driver name
+@router.get("/drivers", response_model=List[driver])
+def get_drivers():
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("SELECT employee, refered_as FROM employees WHERE designation = 'driver';")
+    drivers = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    return drivers
+
+#-----------------------------------------company---------------------------------------------------------
+# Fetch company numbers
+@router.get("/company-under", response_model=List[str])
+def get_comapny_under():
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT Name FROM company;")
+    company = [row[0] for row in cursor.fetchall()]
+    cursor.close()
+    conn.close()
+    return company
+
+#-----------------------------------------employee---------------------------------------------------------
+
+# Pydantic models
+class employees(BaseModel):
+    employee: str
+    refered_as: Optional[str] = None
+    designation: Optional[str] = None
+    contact_no:Optional[int] = None
+    whatsapp_no:Optional[int] = None
+    salary: int
+    visa_outstanding: int
+    advance_avl: int
+    visa_under: str
+    visa_exp:Optional[str] = None
+    nationality:str
+    eid:Optional[int] = None
+    health_ins_exp:Optional[str] = None
+    emp_ins_exp:Optional[str] = None
+    license_exp:Optional[str] = None
+    version: Optional[int] = None
+
+
+         # Validator to ensure load_date is formatted as a string
+    @validator('visa_exp', pre=True)
+    def format_load_date(cls, v):
+        if isinstance(v, datetime.date):
+            return v.strftime('%d-%m-%Y')  
+        return v
+    
+             # Validator to ensure load_date is formatted as a string
+    @validator('health_ins_exp', pre=True)
+    def format_load_date1(cls, v):
+        if isinstance(v, datetime.date):
+            return v.strftime('%d-%m-%Y') 
+        return v
+    
+             # Validator to ensure load_date is formatted as a string
+    @validator('emp_ins_exp', pre=True)
+    def format_load_date2(cls, v):
+        if isinstance(v, datetime.date):
+            return v.strftime('%d-%m-%Y') 
+        return v
+    
+    @validator('license_exp', pre=True)
+    def format_load_date4(cls, v):
+        if isinstance(v, datetime.date):
+            return v.strftime('%d-%m-%Y')  # Convert to string in 'YYYY-MM-DD' format
+        return v
+    
+# Fetch all employees details (or only ?names=a,b), optionally with
+# ?include=documents,trucks,fines,salaries
+@router.get("/employees", response_model=List[dict])
+def get_employees(names: Optional[str] = None, include: Optional[str] = None):
+    includes = parse_includes("employees", include)
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    if names:
+        rows = select_by_keys(cursor, "employees", "employee", split_keys(names))
+    else:
+        cursor.execute("SELECT * FROM employees;")
+        rows = cursor.fetchall()
+    rows = attach_includes(cursor, "employees", [employees(**row).dict() for row in rows], "employee", includes)
+    cursor.close()
+    conn.close()
+    return rows
+
+
+# Add a new employee
+@router.post("/employees")
+def add_employee(emp: employees):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    query = """
+    INSERT INTO employees (
+        employee, refered_as, designation, contact_no, whatsapp_no, salary, visa_outstanding, advance_avl,
+        visa_under, visa_exp, nationality, eid, health_ins_exp,
+        emp_ins_exp,license_exp
+    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,%s, %s);
+    """
+    values = (
+        emp.employee, emp.refered_as, emp.designation, emp.contact_no,emp.whatsapp_no, emp.salary, emp.visa_outstanding,
+        emp.advance_avl, emp.visa_under, emp.visa_exp, emp.nationality, emp.eid,
+        emp.health_ins_exp, emp.emp_ins_exp, emp.license_exp
+    )
+    cursor.execute(query, values)
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return {"message": "Employee added successfully!"}
+
+# Delete employee by name
+@router.delete("/employees/{employee_name}")
+def delete_employee(employee_name: str):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+        # Fetch document file paths to delete from disk
+    cursor.execute("SELECT url FROM employee_documents WHERE employee_name = %s", (employee_name,))
+    document_paths = cursor.fetchall()
+
+    # Delete documents from disk
+    for doc in document_paths:
+        file_path = doc["url"]
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+    # Delete documents from DB
+    cursor.execute("DELETE FROM employee_documents WHERE employee_name = %s", (employee_name,))
+
+    cursor.execute("DELETE FROM employees WHERE employee = %s;", (employee_name,))
+    if cursor.rowcount == 0:
+        conn.rollback()
+        cursor.close()
+        conn.close()
+        raise HTTPException(status_code=404, detail="Employee not found")
+    record_tombstone(cursor, "employees", employee_name)
+    
+    conn.commit()
+    cache.invalidate(f"employees:{employee_name}")
+    cursor.close()
+    conn.close()
+    return {"message": f"Employee '{employee_name}' deleted successfully"}
+
+# Get salary of a specific employee
+@router.get("/employees/{employee_name}/salary")
+def get_employee_salary(employee_name: str):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT salary FROM employees WHERE employee = %s;", (employee_name,))
+    result = cursor.fetchone()
+    cursor.close()
+    conn.close()
+    if result:
+        return {"employee": employee_name, "salary": result[0]}
+    else:
+        raise HTTPException(status_code=404, detail="Employee not found")
+    
+#get vsia outsanding
+@router.get("/employees/{employee_name}/visa-outstanding")
+def get_visa_outstanding(employee_name: str):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT visa_outstanding FROM employees WHERE employee = %s;", (employee_name,))
+    result = cursor.fetchone()
+    cursor.close()
+    conn.close()
+
+    if not result:
+        raise HTTPException(status_code=404, detail="Employee not found")
+
+    return {"employee": employee_name, "visa_outstanding": result[0]}
+
+#get advance available
+@router.get("/employees/{employee_name}/advance-available")
+def get_advance_available(employee_name: str):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT advance_avl FROM employees WHERE employee = %s;", (employee_name,))
+    result = cursor.fetchone()
+    cursor.close()
+    conn.close()
+
+    if not result:
+        raise HTTPException(status_code=404, detail="Employee not found")
+
+    return {"employee": employee_name, "advance_avl": result[0]}
+
+
+# Get employee by name (full details)
+@router.get("/employees/{employee_name}", response_model=employees)
+def get_employee(employee_name: str):
+    cached = cache.get(f"employees:{employee_name}")
+    if cached is not None:
+        return cached
+    version = cache.version(f"employees:{employee_name}")
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("SELECT * FROM employees WHERE employee = %s;", (employee_name,))
+    emp = cursor.fetchone()
+    cursor.close()
+    conn.close()
+    if emp:
+        emp = employees(**emp).dict()
+        cache.set(f"employees:{employee_name}", emp, version)
+        return emp
+    else:
+        raise HTTPException(status_code=404, detail="Employee not found")
+
+# Optional: Update an employee (partial)
+@router.put("/employees/{employee_name}")
+def update_employee(employee_name: str, emp: employees, if_match: Optional[str] = Header(None)):
+    expected = expected_version(if_match, emp)
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        query = """
+        UPDATE employees SET 
+            employee=%s, refered_as=%s, designation=%s, contact_no=%s,whatsapp_no=%s, salary=%s, visa_outstanding=%s, advance_avl=%s,
+            visa_under=%s, visa_exp=%s, nationality=%s, eid=%s, health_ins_exp=%s,
+            emp_ins_exp=%s, license_exp=%s, version=version+1
+        WHERE employee=%s AND version=COALESCE(%s, version);
+        """
+        values = (
+            emp.employee, emp.refered_as, emp.designation, emp.contact_no, emp.whatsapp_no, emp.salary, emp.visa_outstanding, emp.advance_avl,
+            emp.visa_under, emp.visa_exp, emp.nationality, emp.eid,
+            emp.health_ins_exp, emp.emp_ins_exp, emp.license_exp, employee_name, expected
+        )
+        cursor.execute(query, values)
+        if cursor.rowcount == 0:
+            raise_if_stale(cursor, "employees", "employee", employee_name)
+            raise HTTPException(status_code=404, detail="Employee not found")
+        if emp.employee != employee_name:
+            record_tombstone(cursor, "employees", employee_name)
+        conn.commit()
+        cache.invalidate(f"employees:{employee_name}", f"employees:{emp.employee}")
+    finally:
+        release_db_connection(conn, cursor)
+    return {"message": "Employee updated successfully!"}
+
+#-----------------------------------------other_employee---------------------------------------------------------
+# Pydantic models
+class other_employees(BaseModel):
+    employee: str
+    owner: str
+    refered_as: Optional[str] = None
+    designation: Optional[str] = None
+    contact_no:Optional[int] = None
+    whatsapp_no:Optional[int] = None
+    visa_under: str
+    visa_exp:Optional[str] = None
+    nationality:str
+    eid:Optional[int] = None
+    health_ins_exp:Optional[str] = None
+    emp_ins_exp:Optional[str] = None
+    license_exp:Optional[str] = None
+    version: Optional[int] = None
+
+
+         # Validator to ensure load_date is formatted as a string
+    @validator('visa_exp', pre=True)
+    def format_load_date(cls, v):
+        if isinstance(v, datetime.date):
+            return v.strftime('%d-%m-%Y')  # Convert to string in 'YYYY-MM-DD' format
+        return v
+    
+             # Validator to ensure load_date is formatted as a string
+    @validator('health_ins_exp', pre=True)
+    def format_load_date1(cls, v):
+        if isinstance(v, datetime.date):
+            return v.strftime('%d-%m-%Y')  # Convert to string in 'YYYY-MM-DD' format
+        return v
+    
+             # Validator to ensure load_date is formatted as a string
+    @validator('emp_ins_exp', pre=True)
+    def format_load_date2(cls, v):
+        if isinstance(v, datetime.date):
+            return v.strftime('%d-%m-%Y')  # Convert to string in 'YYYY-MM-DD' format
+        return v
+    
+    @validator('license_exp', pre=True)
+    def format_load_date4(cls, v):
+        if isinstance(v, datetime.date):
+            return v.strftime('%d-%m-%Y')  # Convert to string in 'YYYY-MM-DD' format
+        return v
+    
+# Fetch all employees details
+@router.get("/other-employees", response_model=List[other_employees])
+def get_employees():
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("SELECT * FROM other_employees;")
+    employees = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    return employees
+
+
+# Add a new employee
+@router.post("/other-employees")
+def add_employee(emp: other_employees):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    query = """
+    INSERT INTO other_employees (
+        employee, owner, refered_as, designation, contact_no, whatsapp_no,
+        visa_under, visa_exp, nationality, eid, health_ins_exp,
+        emp_ins_exp,license_exp
+    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s);
+    """
+    values = (
+        emp.employee, emp.owner, emp.refered_as, emp.designation, emp.contact_no,emp.whatsapp_no, emp.visa_under, emp.visa_exp, emp.nationality, emp.eid,
+        emp.health_ins_exp, emp.emp_ins_exp, emp.license_exp
+    )
+    cursor.execute(query, values)
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return {"message": "Employee added successfully!"}
+
+# Delete employee by name
+@router.delete("/other-employees/{employee_name}")
+def delete_employee(employee_name: str):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM other_employees WHERE employee = %s;", (employee_name,))
+    if cursor.rowcount == 0:
+        raise HTTPException(status_code=404, detail="Employee not found")
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return {"message": f"Employee '{employee_name}' deleted successfully"}
+
+# Get employee by name (full details)
+@router.get("/other-employees/{employee_name}", response_model=other_employees)
+def get_employee(employee_name: str):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("SELECT * FROM other_employees WHERE employee = %s;", (employee_name,))
+    emp = cursor.fetchone()
+    cursor.close()
+    conn.close()
+    if emp:
+        return emp
+    else:
+        raise HTTPException(status_code=404, detail="Employee not found")
+
+# Optional: Update an employee (partial)
+@router.put("/other-employees/{employee_name}")
+def update_employee(employee_name: str, emp: other_employees, if_match: Optional[str] = Header(None)):
+    expected = expected_version(if_match, emp)
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        query = """
+        UPDATE other_employees SET 
+            employee=%s, owner=%s, refered_as=%s, designation=%s, contact_no=%s,whatsapp_no=%s,
+            visa_under=%s, visa_exp=%s, nationality=%s, eid=%s, health_ins_exp=%s,
+            emp_ins_exp=%s, license_exp=%s, version=version+1
+        WHERE employee=%s AND version=COALESCE(%s, version);
+        """
+        values = (
+            emp.employee, emp.owner, emp.refered_as, emp.designation, emp.contact_no, emp.whatsapp_no,
+            emp.visa_under, emp.visa_exp, emp.nationality, emp.eid,
+            emp.health_ins_exp, emp.emp_ins_exp, emp.license_exp, employee_name, expected
+        )
+        cursor.execute(query, values)
+        if cursor.rowcount == 0:
+            raise_if_stale(cursor, "other_employees", "employee", employee_name)
+            raise HTTPException(status_code=404, detail="Employee not found")
+        conn.commit()
+    finally:
+        release_db_connection(conn, cursor)
+    return {"message": "Employee updated successfully!"}
+
+
+#-----------------------------------------------------patch----------------------------------------------------------------
+# Partial updates; see patch_record
+# Update only the supplied employee fields
+@router.patch("/employees/{employee_name}")
+def patch_employee(employee_name: str, body: dict = Body(...), if_match: Optional[str] = Header(None)):
+    return patch_record("Employee", "employees", "employee", employee_name, employees, body, if_match,
+                        renamable=True, sync_table="employees", cache_prefix="employees")
+
+# Update only the supplied other-employee fields
+@router.patch("/other-employees/{employee_name}")
+def patch_other_employee(employee_name: str, body: dict = Body(...), if_match: Optional[str] = Header(None)):
+    return patch_record("Employee", "other_employees", "employee", employee_name, other_employees, body, if_match,
+                        renamable=True)
@@ -0,0 +1,165 @@
+# Change feed for offline clients
+import base64
+import datetime
+import json
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException
+
+from .db import add_column_if_missing, add_index_if_missing, get_db_connection
+
+router = APIRouter()
+
+#-----------------------------------------------------sync-----------------------------------------------------------------
+# Delta sync for the offline tablet client. Every synced table carries an
+# indexed updated_at column, deletes (and primary-key renames) leave a row in
+# sync_tombstones, and /sync returns only what changed since the client's token.
+#
+# updated_at (and a tombstone's id) is set when the statement runs, not when
+# its transaction commits, so a slow transaction can commit a change that
+# sorts behind a cursor that already moved past it. /sync only serves changes
+# older than SYNC_SAFETY_LAG, by which time every transaction that made them
+# has committed.
+
+SYNC_TABLES = {
+    "trucks": "truck_number",
+    "trailers": "trailer_no",
+    "employees": "employee",
+    "clients": "name",
+    "trips": "trip_id",
+}
+SYNC_TRIP_DAYS = 90               # only recent trips are kept on the device
+SYNC_TOMBSTONE_RETENTION_DAYS = 90
+SYNC_PAGE_SIZE = 500
+SYNC_SAFETY_LAG = 60                # seconds; longer than any write transaction runs
+
+
+@router.on_event("startup")
+def ensure_sync_schema():
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    for table in SYNC_TABLES:
+        add_column_if_missing(
+            cursor, table, "updated_at",
+            "TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6)"
+        )
+        add_index_if_missing(cursor, table, "idx_updated_at", "updated_at")
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS sync_tombstones (
+            id BIGINT AUTO_INCREMENT PRIMARY KEY,
+            table_name VARCHAR(32) NOT NULL,
+            row_key VARCHAR(255) NOT NULL,
+            deleted_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+            INDEX idx_table_id (table_name, id)
+        )
+    """)
+    cursor.execute(
+        "DELETE FROM sync_tombstones WHERE deleted_at < NOW() - INTERVAL %s DAY",
+        (SYNC_TOMBSTONE_RETENTION_DAYS,)
+    )
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+
+# Called by the delete handlers inside their own transaction
+def record_tombstone(cursor, table, key):
+    cursor.execute(
+        "INSERT INTO sync_tombstones (table_name, row_key) VALUES (%s, %s)",
+        (table, str(key))
+    )
+
+
+def encode_sync_token(state):
+    raw = json.dumps(state, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_sync_token(token):
+    try:
+        state = json.loads(base64.urlsafe_b64decode(token.encode()))
+        tables = state["tables"]
+        if not isinstance(tables, dict) or any(not isinstance(v, list) or len(v) != 3 for v in tables.values()):
+            raise ValueError("tables")
+        if state.get("issued"):
+            datetime.datetime.fromisoformat(state["issued"])
+        return state
+    except (ValueError, TypeError, KeyError):
+        raise HTTPException(status_code=400, detail="Invalid sync token")
+
+
+# Delta sync. Clients apply "deletes" before "upserts" and keep calling with
+# the returned token while has_more is true.
+@router.get("/sync")
+def sync(since: Optional[str] = None, limit: int = SYNC_PAGE_SIZE):
+    limit = max(1, min(limit, 5000))
+    state = decode_sync_token(since) if since else {"tables": {}}
+
+    issued = state.get("issued")
+    if issued:
+        age = datetime.datetime.utcnow() - datetime.datetime.fromisoformat(issued)
+        if age.days >= SYNC_TOMBSTONE_RETENTION_DAYS:
+            raise HTTPException(status_code=410, detail="Sync token expired, full resync required")
+
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("SELECT NOW(6) - INTERVAL %s SECOND AS cutoff", (SYNC_SAFETY_LAG,))
+    cutoff = cursor.fetchone()["cutoff"]
+
+    result = {}
+    next_tables = {}
+    has_more = False
+    for table, key in SYNC_TABLES.items():
+        last_ts, last_key, last_del = state["tables"].get(table, [None, None, None])
+
+        # Changed rows, keyset-paginated on (updated_at, primary key)
+        where = ["updated_at < %s"]
+        params = [cutoff]
+        if last_ts is not None:
+            where.append(f"(updated_at > %s OR (updated_at = %s AND {key} > %s))")
+            params += [last_ts, last_ts, last_key]
+        if table == "trips":
+            where.append("date >= CURDATE() - INTERVAL %s DAY")
+            params.append(SYNC_TRIP_DAYS)
+        query = f"SELECT * FROM {table} WHERE " + " AND ".join(where) + f" ORDER BY updated_at, {key} LIMIT %s"
+        cursor.execute(query, tuple(params) + (limit + 1,))
+        rows = cursor.fetchall()
+        table_more = len(rows) > limit
+        rows = rows[:limit]
+        if rows:
+            last_ts = str(rows[-1]["updated_at"])
+            last_key = rows[-1][key]
+
+        # Tombstones since the last seen id; a first sync has nothing to delete
+        deletes = []
+        if last_del is None:
+            cursor.execute(
+                "SELECT COALESCE(MAX(id), 0) AS id FROM sync_tombstones WHERE table_name = %s AND deleted_at < %s",
+                (table, cutoff)
+            )
+            last_del = cursor.fetchone()["id"]
+        else:
+            cursor.execute("""
+                SELECT id, row_key FROM sync_tombstones
+                WHERE table_name = %s AND id > %s AND deleted_at < %s
+                ORDER BY id LIMIT %s
+            """, (table, last_del, cutoff, limit + 1))
+            tombstones = cursor.fetchall()
+            table_more = table_more or len(tombstones) > limit
+            tombstones = tombstones[:limit]
+            if tombstones:
+                last_del = tombstones[-1]["id"]
+            deletes = [t["row_key"] for t in tombstones]
+
+        result[table] = {"upserts": rows, "deletes": deletes, "has_more": table_more}
+        next_tables[table] = [last_ts, last_key, last_del]
+        has_more = has_more or table_more
+
+    cursor.close()
+    conn.close()
+
+    token = encode_sync_token({
+        "issued": issued if has_more and issued else datetime.datetime.utcnow().isoformat(),
+        "tables": next_tables,
+    })
+    return {"tables": result, "next": token, "has_more": has_more}
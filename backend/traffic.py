@@ -0,0 +1,791 @@
+# Request middleware: idempotency, admission control, single flight, statement deadlines, stale responses and
+# compression
+import asyncio
+import datetime
+import hashlib
+import itertools
+import json
+import time
+import zlib
+from collections import OrderedDict, namedtuple
+
+import mysql.connector
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+
+from .archive import PARTITIONED_TABLES, archived_years
+from .db import (
+    STATEMENT_DEADLINES, STATEMENT_DEADLINE_ROUTES, DatabaseUnavailable, StreamAborted, accept_values,
+    add_column_if_missing, count_statement_event, db_breaker, get_db_connection, kill_queries, mark_stream_failed,
+    module_installed, request_statements, route_of, running_statements, running_statements_lock,
+)
+from .sync import SYNC_SAFETY_LAG
+
+router = APIRouter()
+
+#-----------------------------------------------------idempotency----------------------------------------------------------
+# POST requests carrying an Idempotency-Key run once: the first request claims
+# the key, runs, and its response is stored for IDEMPOTENCY_TTL; retries with
+# the same key get that stored response without touching the handler again,
+# and reusing a key with a different query string or body gets 422.
+# A retry that arrives while the first attempt is still running gets 409, and
+# server errors release the key so the retry can run for real. A claim is a
+# lease of IDEMPOTENCY_LEASE: if the worker running it dies, a retry after the
+# lease takes the key over, and the stale claim can no longer record a result.
+
+IDEMPOTENCY_TTL = datetime.timedelta(hours=24)
+IDEMPOTENCY_LEASE = datetime.timedelta(minutes=2)  # longer than any write's deadline and admission wait
+IDEMPOTENCY_MAX_RESPONSE = 1024 * 1024
+IDEMPOTENCY_EVICT_EVERY = 100
+idempotency_writes = 0
+
+
+@router.on_event("startup")
+def ensure_idempotency_schema():
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS idempotency_keys (
+            key_hash CHAR(64) PRIMARY KEY,
+            request_hash CHAR(64) NOT NULL,
+            status SMALLINT NULL,
+            headers TEXT NULL,
+            body MEDIUMBLOB NULL,
+            expires_at DATETIME NOT NULL,
+            claimed_at DATETIME(6) NULL,
+            INDEX idx_expires_at (expires_at)
+        )
+    """)
+    add_column_if_missing(cursor, "idempotency_keys", "claimed_at", "DATETIME(6) NULL")
+    cursor.execute("DELETE FROM idempotency_keys WHERE expires_at < NOW()")
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+
+# Claim the key (taking over an expired key or a lapsed claim). Returns
+# (claimed_at, None) when claimed, else (None, stored) with stored the
+# (request_hash, status, headers, body) and status None while still running
+def claim_idempotency_key(key_hash, request_hash):
+    now = datetime.datetime.now()
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        DELETE FROM idempotency_keys
+        WHERE key_hash = %s AND (expires_at < NOW() OR (status IS NULL AND (claimed_at IS NULL OR claimed_at < %s)))
+    """, (key_hash, now - IDEMPOTENCY_LEASE))
+    cursor.execute(
+        "INSERT IGNORE INTO idempotency_keys (key_hash, request_hash, expires_at, claimed_at) VALUES (%s, %s, %s, %s)",
+        (key_hash, request_hash, now + IDEMPOTENCY_TTL, now)
+    )
+    claimed, stored = now, None
+    if cursor.rowcount == 0:
+        cursor.execute(
+            "SELECT request_hash, status, headers, body FROM idempotency_keys WHERE key_hash = %s", (key_hash,)
+        )
+        claimed, stored = None, cursor.fetchone()
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return claimed, stored
+
+
+# Only the claim that is still current records its result
+def finish_idempotency_key(key_hash, claimed_at, status, headers, body):
+    global idempotency_writes
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    if status is None or status >= 500 or len(body) > IDEMPOTENCY_MAX_RESPONSE:
+        cursor.execute(
+            "DELETE FROM idempotency_keys WHERE key_hash = %s AND claimed_at = %s AND status IS NULL",
+            (key_hash, claimed_at)
+        )
+    else:
+        cursor.execute(
+            """
+            UPDATE idempotency_keys SET status = %s, headers = %s, body = %s
+            WHERE key_hash = %s AND claimed_at = %s
+            """,
+            (status, json.dumps(headers), body, key_hash, claimed_at)
+        )
+    idempotency_writes += 1
+    if idempotency_writes % IDEMPOTENCY_EVICT_EVERY == 0:
+        cursor.execute("DELETE FROM idempotency_keys WHERE expires_at < NOW() LIMIT 1000")
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+
+async def idempotency_middleware(request: Request, call_next):
+    key = request.headers.get("idempotency-key")
+    if request.method != "POST" or not key:
+        return await call_next(request)
+
+    body = await request.body()
+    key_hash = hashlib.sha256(f"{request.url.path}\n{key}".encode()).hexdigest()
+    # the query string is part of the request (?force=true is a different write)
+    request_hash = hashlib.sha256(f"{request.url.query}\n".encode() + body).hexdigest()
+    claimed_at, stored = await run_in_threadpool(claim_idempotency_key, key_hash, request_hash)
+    if stored:
+        stored_hash, status, headers, content = stored
+        if stored_hash != request_hash:
+            return JSONResponse(status_code=422, content={"detail": "Idempotency-Key was already used for a different request"})
+        if status is None:
+            return JSONResponse(
+                status_code=409, content={"detail": "A request with this Idempotency-Key is still in progress"},
+                headers={"Retry-After": "1"}
+            )
+        headers = dict(json.loads(headers), **{"idempotent-replayed": "true"})
+        return Response(content=bytes(content), status_code=status, headers=headers)
+
+    try:
+        response = await call_next(request)
+        content = b"".join([chunk async for chunk in response.body_iterator])
+    except Exception:
+        await run_in_threadpool(finish_idempotency_key, key_hash, claimed_at, None, None, b"")
+        raise
+    headers = {name: value for name, value in response.headers.items() if name != "content-length"}
+    await run_in_threadpool(finish_idempotency_key, key_hash, claimed_at, response.status_code, headers, content)
+    return Response(content=content, status_code=response.status_code, headers=headers)
+
+#-----------------------------------------------------admission control----------------------------------------------------
+# Bounds how many requests work against MySQL at once. Requests are sorted
+# into classes, each with its own concurrency cap, queue length and maximum
+# wait, under one overall capacity. When a slot frees up the highest-priority
+# waiter that fits goes next, so interactive lookups get ahead of dumps and
+# uploads. A request that finds its queue full, or waits too long, is shed
+# with 503 and Retry-After instead of piling more load on the database.
+
+AdmissionClass = namedtuple("AdmissionClass", "priority limit queue wait retry_after")
+
+ADMISSION_CAPACITY = 32
+ADMISSION_CLASSES = {
+    # name: (priority, concurrent limit, queue length, max wait seconds, Retry-After seconds)
+    "light": AdmissionClass(0, 24, 200, 2.0, 1),
+    "write": AdmissionClass(1, 12, 100, 5.0, 2),
+    "heavy": AdmissionClass(2, 6, 50, 10.0, 5),
+    "upload": AdmissionClass(3, 4, 20, 15.0, 5),
+}
+HEAVY_PATHS = {
+    "/trips", "/fines", "/maintenance", "/salaries", "/sync", "/dashboard", "/schedule/conflicts",
+    "/investor-balances", "/receivables/aging", "/payables/aging",
+}
+HEAVY_PREFIXES = ("/analytics", "/ledger", "/fleet")
+HEAVY_POSTS = {"/analytics/query", "/fines/match"}
+# /batch is only a wrapper: its sub-requests are admitted one by one
+ADMISSION_EXEMPT = {"/batch"}
+
+
+def admission_class(method, path):
+    if path in ADMISSION_EXEMPT or path.startswith("/metrics"):
+        return None
+    if method in ("POST", "PUT") and (path.endswith("/upload") or path.endswith("/documents")):
+        return "upload"
+    if path in HEAVY_POSTS or (method == "GET" and (path in HEAVY_PATHS or path.startswith(HEAVY_PREFIXES))):
+        return "heavy"
+    if method in ("GET", "HEAD", "OPTIONS"):
+        return "light"
+    return "write"
+
+
+class AdmissionShed(Exception):
+    pass
+
+
+class AdmissionController:
+    def __init__(self, capacity, classes):
+        self.capacity = capacity
+        self.classes = classes
+        self.running = 0
+        self.active = {name: 0 for name in classes}
+        self.queued = {name: 0 for name in classes}
+        self.waiters = []
+        self.order = itertools.count()
+        self.stats = {name: {"admitted": 0, "queued": 0, "shed": 0, "timed_out": 0} for name in classes}
+
+    def fits(self, name):
+        return self.running < self.capacity and self.active[name] < self.classes[name].limit
+
+    def grant(self, name):
+        self.running += 1
+        self.active[name] += 1
+        self.stats[name]["admitted"] += 1
+
+    async def acquire(self, name):
+        spec = self.classes[name]
+        if self.queued[name] >= spec.queue:
+            self.stats[name]["shed"] += 1
+            raise AdmissionShed(name)
+        future = asyncio.get_running_loop().create_future()
+        self.waiters.append((spec.priority, next(self.order), name, future))
+        self.dispatch()
+        if future.done():
+            return
+        self.queued[name] += 1
+        self.stats[name]["queued"] += 1
+        try:
+            await asyncio.wait_for(asyncio.shield(future), spec.wait)
+        except asyncio.TimeoutError:
+            pass
+        except asyncio.CancelledError:
+            # The client went away while waiting
+            if future.done():
+                self.release(name)
+            else:
+                future.cancel()
+                self.forget(future)
+            raise
+        finally:
+            self.queued[name] -= 1
+        if future.done():
+            return
+        future.cancel()
+        self.forget(future)
+        self.stats[name]["timed_out"] += 1
+        raise AdmissionShed(name)
+
+    def forget(self, future):
+        self.waiters = [w for w in self.waiters if w[3] is not future]
+
+    def release(self, name):
+        self.running -= 1
+        self.active[name] -= 1
+        self.dispatch()
+
+    # Wake waiters in priority order, skipping classes that are at their cap
+    def dispatch(self):
+        for waiter in sorted(self.waiters):
+            if self.running >= self.capacity:
+                break
+            _, _, name, future = waiter
+            if self.fits(name):
+                self.forget(future)
+                self.grant(name)
+                future.set_result(None)
+
+
+admission = AdmissionController(ADMISSION_CAPACITY, ADMISSION_CLASSES)
+
+
+async def admission_middleware(request: Request, call_next):
+    name = admission_class(request.method, request.url.path)
+    if name is None:
+        return await call_next(request)
+    try:
+        await admission.acquire(name)
+    except AdmissionShed:
+        return JSONResponse(
+            status_code=503, content={"detail": "Server is busy, please retry shortly"},
+            headers={"Retry-After": str(ADMISSION_CLASSES[name].retry_after)}
+        )
+    try:
+        return await call_next(request)
+    finally:
+        admission.release(name)
+
+# Per-class admission counters and current load
+@router.get("/metrics/admission")
+def get_admission_metrics():
+    return {
+        name: dict(admission.stats[name], active=admission.active[name], waiting=admission.queued[name],
+                   limit=spec.limit, queue=spec.queue, wait=spec.wait)
+        for name, spec in ADMISSION_CLASSES.items()
+    }
+
+#-----------------------------------------------------single flight--------------------------------------------------------
+# Identical concurrent GETs on the big list routes share one execution: the
+# first request runs the handler and every identical request that arrives
+# within the route's window (measured from when that first request started)
+# gets the same status, headers and body. The window bounds how stale a
+# shared response can be.
+#
+# The leader's body is teed to its followers chunk by chunk rather than
+# buffered, so streamed lists stay streamed. The chunks sent so far are kept
+# for requests that join late only up to SINGLE_FLIGHT_MAX_BUFFER; past that
+# the flight takes no new followers. If the leader goes away before its
+# response starts, waiting followers run the handler themselves; if it fails
+# mid-body, their responses fail with it.
+SINGLE_FLIGHT_WINDOWS = {
+    # path: seconds
+    "/trips": 1.0,
+    "/trucks": 0.5,
+    "/employees": 0.5,
+    "/fines": 1.0,
+    "/maintenance": 1.0,
+}
+SINGLE_FLIGHT_MAX_BUFFER = 1024 * 1024
+single_flights = {}
+single_flight_stats = {path: {"executed": 0, "coalesced": 0} for path in SINGLE_FLIGHT_WINDOWS}
+
+
+class LeaderGone(Exception):
+    pass
+
+
+def single_flight_key(request):
+    return (
+        request.url.path,
+        tuple(sorted(request.query_params.multi_items())),
+        request.headers.get("accept", ""),
+        request.headers.get("accept-encoding", ""),
+        request.headers.get("if-none-match", ""),
+    )
+
+
+async def follow_flight(flight, seen, queue, scope):
+    for chunk in seen:
+        yield chunk
+    if queue is None:
+        return
+    try:
+        while True:
+            chunk = await queue.get()
+            if chunk is None:
+                return
+            if isinstance(chunk, BaseException):
+                mark_stream_failed(scope)
+                raise chunk
+            yield chunk
+    finally:
+        if queue in flight["followers"]:
+            flight["followers"].remove(queue)
+
+
+async def single_flight_middleware(request: Request, call_next):
+    window = SINGLE_FLIGHT_WINDOWS.get(request.url.path)
+    if request.method != "GET" or window is None:
+        return await call_next(request)
+
+    key = single_flight_key(request)
+    stats = single_flight_stats[request.url.path]
+    flight = single_flights.get(key)
+    if flight and time.monotonic() - flight["started"] <= window:
+        try:
+            status, headers = await asyncio.shield(flight["result"])
+        except LeaderGone:
+            return await call_next(request)
+        if flight["chunks"] is None or flight["failed"]:
+            return await call_next(request)
+        # Nothing awaits between the snapshot and subscribing, so no chunk is missed
+        seen = list(flight["chunks"])
+        queue = None if flight["done"] else asyncio.Queue()
+        if queue is not None:
+            flight["followers"].append(queue)
+        stats["coalesced"] += 1
+        return StreamingResponse(follow_flight(flight, seen, queue, request.scope), status_code=status, headers=headers)
+
+    loop = asyncio.get_running_loop()
+    flight = {
+        "started": time.monotonic(), "result": loop.create_future(), "chunks": [], "size": 0, "followers": [],
+        "done": False, "failed": False,
+    }
+    single_flights[key] = flight
+    stats["executed"] += 1
+
+    def land():
+        if single_flights.get(key) is flight:
+            del single_flights[key]
+
+    try:
+        response = await call_next(request)
+    except BaseException as e:
+        flight["result"].set_exception(e if isinstance(e, Exception) else LeaderGone())
+        flight["result"].exception()  # waiters re-raise it; nobody else needs to see it
+        land()
+        raise
+    headers = {name: value for name, value in response.headers.items() if name != "content-length"}
+    flight["result"].set_result((response.status_code, headers))
+
+    async def lead():
+        end = LeaderGone()
+        try:
+            async for chunk in response.body_iterator:
+                if flight["chunks"] is not None:
+                    flight["chunks"].append(chunk)
+                    flight["size"] += len(chunk)
+                    if flight["size"] > SINGLE_FLIGHT_MAX_BUFFER:
+                        flight["chunks"] = None
+                        land()
+                for queue in flight["followers"]:
+                    queue.put_nowait(chunk)
+                yield chunk
+            # the handler's body failing part-way only shows as a flag; the
+            # chunks themselves just stop
+            if request.scope.get("stream_failed"):
+                raise StreamAborted(request.url.path)
+            end = None
+        except Exception as e:
+            end = e
+            raise
+        finally:
+            flight["done"] = True
+            flight["failed"] = end is not None
+            for queue in flight["followers"]:
+                queue.put_nowait(end)
+            if end is None:
+                loop.call_later(max(0.0, flight["started"] + window - time.monotonic()), land)
+            else:
+                land()
+
+    return StreamingResponse(lead(), status_code=response.status_code, headers=headers)
+
+# How many requests each coalesced route executed and how many rode along
+@router.get("/metrics/single-flight")
+def get_single_flight_metrics():
+    return {
+        path: dict(stats, window=SINGLE_FLIGHT_WINDOWS[path], joinable=sum(1 for key in single_flights if key[0] == path))
+        for path, stats in single_flight_stats.items()
+    }
+
+#-----------------------------------------------------statement deadlines--------------------------------------------------
+# Gives each request its deadline (see the statement deadlines section in
+# db.py) and kills its queries if the client goes away before the response.
+class StatementDeadlineMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        name = admission_class(scope["method"], scope["path"]) or "light"
+        seconds = STATEMENT_DEADLINE_ROUTES.get(scope["path"], STATEMENT_DEADLINES[name])
+        statements = {
+            "deadline": time.monotonic() + seconds,
+            "read_only": scope["method"] == "GET",
+            "connections": [],
+            "scope": scope,
+        }
+        token = request_statements.set(statements)
+        finished = False
+
+        # Read the client's messages ourselves so a disconnect is seen even
+        # while the handler is blocked in MySQL; body chunks are handed over
+        # one at a time so uploads are not buffered here
+        messages = asyncio.Queue()
+
+        async def next_message():
+            message = await messages.get()
+            messages.task_done()
+            return message
+
+        async def pump():
+            while True:
+                message = await receive()
+                messages.put_nowait(message)
+                if message.get("more_body"):
+                    await messages.join()
+                if message["type"] == "http.disconnect":
+                    if not finished and statements["connections"]:
+                        count_statement_event(route_of(scope), "cancelled")
+                        await run_in_threadpool(kill_queries, list(statements["connections"]))
+                    return
+
+        # Once the last body chunk is out the server reports a disconnect too
+        async def send_and_note(message):
+            nonlocal finished
+            if message["type"] == "http.response.body" and not message.get("more_body"):
+                finished = True
+            await send(message)
+
+        pump_task = asyncio.create_task(pump())
+        try:
+            await self.app(scope, next_message, send_and_note)
+        finally:
+            finished = True
+            pump_task.cancel()
+            request_statements.reset(token)
+            with running_statements_lock:
+                for connection_id in statements["connections"]:
+                    running_statements.pop(connection_id, None)
+
+#-----------------------------------------------------stale responses------------------------------------------------------
+# While the database circuit is open the read routes in STALE_ROUTES answer
+# with the last good response they produced, marked with Age and Warning
+# headers; the probe that gets through refreshes it.
+STALE_ROUTES = {
+    "/dashboard",
+    "/drivers", "/company-under", "/trucks-num", "/other-trucks-num", "/clients/names", "/suppliers/names/code",
+    "/trucks/by-driver/{driver_name}", "/other-trucks/by-driver/{driver_name}",
+    "/clients", "/suppliers", "/trailers", "/other-owners", "/investors", "/ledger/accounts",
+    "/employees/{employee_name}", "/other-employees/{employee_name}", "/trucks/{truck_number}",
+    "/other-trucks/{truck_number}", "/trailers/{trailer_no}", "/other-trailers/{trailer_no}",
+    "/clients/{client_name}", "/suppliers/{name}", "/other-owners/{name}", "/investors/{investor_id}",
+    "/inventory/{item_id}", "/maintenance/{record_id}", "/fines/{fine_id}", "/salaries/{salary_id}",
+    "/trips/{trip_id}",
+}
+STALE_MAX_BYTES = 32 * 1024 * 1024
+
+
+stale_responses = OrderedDict()  # key: (stored_at, headers, content)
+stale_stats = {"stored_bytes": 0, "served": 0}
+
+
+def remember_response(key, headers, content):
+    old = stale_responses.pop(key, None)
+    if old:
+        stale_stats["stored_bytes"] -= len(old[2])
+    stale_responses[key] = (time.time(), headers, content)
+    stale_stats["stored_bytes"] += len(content)
+    while stale_stats["stored_bytes"] > STALE_MAX_BYTES and stale_responses:
+        _, (_, _, dropped) = stale_responses.popitem(last=False)
+        stale_stats["stored_bytes"] -= len(dropped)
+
+
+async def stale_response_middleware(request: Request, call_next):
+    if request.method != "GET":
+        return await call_next(request)
+    response = await call_next(request)
+    route = request.scope.get("route")
+    if route is None or route.path not in STALE_ROUTES:
+        return response
+
+    key = single_flight_key(request)
+    if response.status_code == 200:
+        content = b"".join([chunk async for chunk in response.body_iterator])
+        headers = {name: value for name, value in response.headers.items() if name != "content-length"}
+        if not request.scope.get("stream_failed"):
+            remember_response(key, headers, content)
+        return Response(content=content, status_code=200, headers=headers)
+    if response.status_code == 503 and "x-circuit" in response.headers and key in stale_responses:
+        stored_at, headers, content = stale_responses[key]
+        stale_responses.move_to_end(key)
+        stale_stats["served"] += 1
+        headers = dict(
+            headers,
+            age=str(int(time.time() - stored_at)),
+            warning='110 - "Response is Stale"',
+        )
+        headers["x-circuit"] = response.headers["x-circuit"]
+        return Response(content=content, status_code=200, headers=headers)
+    return response
+
+# Breaker state and how often stale responses stood in for the database
+@router.get("/metrics/database")
+def get_database_metrics():
+    return {
+        "state": db_breaker.state,
+        "failures": db_breaker.failures,
+        **db_breaker.stats,
+        "stale": {"entries": len(stale_responses), **stale_stats},
+    }
+
+#-----------------------------------------------------compression----------------------------------------------------------
+# Responses of COMPRESS_MIN_SIZE bytes or more are compressed with the best
+# encoding the client accepts (br when the brotli module is installed, then
+# gzip). Streamed bodies are compressed chunk by chunk and flushed after each
+# one, so rows still reach the client while the query is running.
+#
+# The list routes in ETAG_ROUTES also get a weak ETag (etag_middleware, which
+# runs inside admission control and statement deadlines). It is built from
+# the table's newest updated_at and newest sync tombstone (two index lookups),
+# its archived years, the query string and the Accept and Origin headers. As
+# with /sync, only changes older than SYNC_SAFETY_LAG are settled, so while a
+# table has newer ones its list gets no ETag. A matching If-None-Match gets a
+# 304, and compressed bodies are kept per (ETag, encoding) so a repeat hit is
+# answered without running the list query or compressing it again.
+COMPRESS_MIN_SIZE = 1024
+COMPRESSIBLE_TYPES = (
+    "application/json", "application/msgpack", "application/x-msgpack", "application/vnd.apache.arrow.stream", "text/",
+)
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+ETAG_ROUTES = {
+    # path: table whose updated_at and tombstones validate it
+    "/trips": "trips",
+    "/employees": "employees",
+    "/trucks": "trucks",
+}
+COMPRESSED_CACHE_MAX_BYTES = 64 * 1024 * 1024
+COMPRESSED_CACHE_MAX_ENTRY = 8 * 1024 * 1024
+
+
+class GzipStream:
+    def __init__(self):
+        self.compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, chunk):
+        return self.compressor.compress(chunk) + self.compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self.compressor.flush()
+
+
+class BrotliStream:
+    def __init__(self):
+        import brotli
+
+        self.compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, chunk):
+        return self.compressor.process(chunk) + self.compressor.flush()
+
+    def finish(self):
+        return self.compressor.finish()
+
+
+ENCODINGS = {
+    # encoding: (stream, module it needs), preferred first
+    "br": (BrotliStream, "brotli"),
+    "gzip": (GzipStream, None),
+}
+compressed_bodies = OrderedDict()  # (etag, encoding): (headers, content)
+compression_stats = {"compressed": 0, "not_modified": 0, "cache_hits": 0, "stored_bytes": 0}
+
+
+# The accepted encoding with the highest quality, ties going to ENCODINGS
+# order; None to send the body as it is
+def content_encoding(accept_encoding):
+    qualities = dict(accept_values(accept_encoding))
+    best, best_quality = None, 0
+    for encoding, (_, module) in ENCODINGS.items():
+        quality = qualities.get(encoding, qualities.get("*", 0))
+        if quality > best_quality and (module is None or module_installed(module)):
+            best, best_quality = encoding, quality
+    return best
+
+
+def list_validator(table):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        SELECT (SELECT MAX(updated_at) FROM {table}),
+               (SELECT MAX(id) FROM sync_tombstones WHERE table_name = %s),
+               (SELECT deleted_at FROM sync_tombstones WHERE table_name = %s ORDER BY id DESC LIMIT 1),
+               NOW(6) - INTERVAL %s SECOND
+    """, (table, table, SYNC_SAFETY_LAG))
+    updated, deleted, deleted_at, settled = cursor.fetchone()
+    cursor.close()
+    conn.close()
+    if (updated and updated >= settled) or (deleted_at and deleted_at >= settled):
+        return None
+    # Archiving moves rows out of the table without tombstones
+    archived = archived_years(table) if table in PARTITIONED_TABLES else []
+    return updated, deleted, archived
+
+
+async def list_etag(request):
+    table = ETAG_ROUTES.get(request.url.path)
+    if request.method != "GET" or table is None or "include" in request.query_params:
+        return None  # included records come from other tables
+    try:
+        validator = await run_in_threadpool(list_validator, table)
+    except (mysql.connector.Error, DatabaseUnavailable):
+        return None  # the list query reports it
+    if validator is None:
+        return None
+    key = repr((
+        request.url.path, sorted(request.query_params.multi_items()), request.headers.get("accept", ""),
+        request.headers.get("origin", ""), validator,
+    ))
+    return f'W/"{hashlib.sha1(key.encode()).hexdigest()[:24]}"'
+
+
+def remember_compressed(key, headers, content):
+    old = compressed_bodies.pop(key, None)
+    if old:
+        compression_stats["stored_bytes"] -= len(old[1])
+    compressed_bodies[key] = (headers, content)
+    compression_stats["stored_bytes"] += len(content)
+    while compression_stats["stored_bytes"] > COMPRESSED_CACHE_MAX_BYTES and compressed_bodies:
+        _, (_, dropped) = compressed_bodies.popitem(last=False)
+        compression_stats["stored_bytes"] -= len(dropped)
+
+
+def should_compress(start, headers, body, more_body):
+    if start["status"] < 200 or start["status"] in (204, 304) or "content-encoding" in headers:
+        return False
+    if not headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES):
+        return False
+    if "content-length" in headers:
+        return int(headers["content-length"]) >= COMPRESS_MIN_SIZE
+    return more_body or len(body) >= COMPRESS_MIN_SIZE
+
+
+async def etag_middleware(request: Request, call_next):
+    etag = await list_etag(request)
+    if etag is None:
+        return await call_next(request)
+    if_none_match = [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]
+    if etag in if_none_match or etag[2:] in if_none_match or "*" in if_none_match:
+        compression_stats["not_modified"] += 1
+        return Response(status_code=304, headers={"etag": etag, "vary": "Accept, Accept-Encoding, Origin"})
+    encoding = content_encoding(request.headers.get("accept-encoding", ""))
+    stored = compressed_bodies.get((etag, encoding))
+    if stored:
+        compressed_bodies.move_to_end((etag, encoding))
+        compression_stats["cache_hits"] += 1
+        return Response(content=stored[1], headers=stored[0])
+    response = await call_next(request)
+    if response.status_code == 200:
+        response.headers["etag"] = etag
+    return response
+
+
+class CompressionMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        encoding = content_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        start = None
+        stream = None
+        kept = []  # compressed chunks of a cacheable body, None when it is not kept
+        kept_size = 0
+        kept_headers = None
+        etag = None
+
+        # The start message is held back until the first body chunk shows
+        # whether the body is worth compressing
+        async def send_compressed(message):
+            nonlocal start, stream, kept, kept_size, kept_headers, etag
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                return await send(message)
+            body, more_body = message.get("body", b""), message.get("more_body", False)
+            if not more_body and scope.get("stream_failed"):
+                # leave the body unterminated so the server drops the connection
+                raise StreamAborted(scope["path"])
+            if start is not None:
+                headers = MutableHeaders(raw=list(start["headers"]))
+                compressible = headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+                if compressible and "accept-encoding" not in headers.get("vary", "").lower():
+                    headers.add_vary_header("Accept-Encoding")
+                if encoding and should_compress(start, headers, body, more_body):
+                    stream = ENCODINGS[encoding][0]()
+                    del headers["content-length"]
+                    headers["content-encoding"] = encoding
+                    compression_stats["compressed"] += 1
+                await send(dict(start, headers=headers.raw))
+                if scope["path"] in ETAG_ROUTES and start["status"] == 200:
+                    etag = headers.get("etag")
+                if stream is None or etag is None:
+                    kept = None
+                kept_headers = dict(headers.items())
+                start = None
+            if stream is None:
+                return await send(message)
+
+            chunk = stream.compress(body) if body else b""
+            if not more_body:
+                chunk += stream.finish()
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+            if kept is not None:
+                kept.append(chunk)
+                kept_size += len(chunk)
+                if kept_size > COMPRESSED_CACHE_MAX_ENTRY:
+                    kept = None
+                elif not more_body:
+                    remember_compressed((etag, encoding), kept_headers, b"".join(kept))
+
+        await self.app(scope, receive, send_compressed)
+
+# How often responses were compressed or answered from the compressed bodies
+@router.get("/metrics/compression")
+def get_compression_metrics():
+    return {"entries": len(compressed_bodies), **compression_stats}
@@ -13,6 +13,15 @@ export async function fetchApi(endpoint: string, options?: RequestInit) {
   }
 
   const url = `${API_URL}${endpoint}`;
+
+  // One key per logical POST so retries of it (ours or the tunnel's) run once
+  if (options?.method?.toUpperCase() === 'POST') {
+    const headers = new Headers(options.headers);
+    if (!headers.has('Idempotency-Key')) {
+      headers.set('Idempotency-Key', crypto.randomUUID());
+    }
+    options = { ...options, headers };
+  }
   
   try {
     const response = await fetch(url, options);
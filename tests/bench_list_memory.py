@@ -0,0 +1,117 @@
+# Peak RSS of a large /fines read, before and after the streamed list path:
+#
+#   python tests/bench_list_memory.py [rows]
+#
+# "before" is the handler as it was (dictionary cursor, fetchall, response
+# model validation of the whole list), "after" is the /fines route as it is
+# now. Each runs in its own interpreter against an in-process MySQL stand-in
+# that generates the rows, so only the API's own memory is measured.
+import asyncio
+import datetime
+import os
+import resource
+import subprocess
+import sys
+import time
+from typing import List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COLUMNS = ("id", "trip_id", "reason", "truck_number", "driver_name", "driver_fault", "fine_date", "amount",
+           "payment_status", "version")
+
+
+def fine_row(i):
+    return (i, i, f"Speeding on route {i % 40}", f"TRK-{i % 300}", f"Driver {i % 250}", i % 2,
+            datetime.date(2024, 1, 1) + datetime.timedelta(days=i % 300), 150.0 + i % 900, "UNPAID", 1)
+
+
+class Cursor:
+    def __init__(self, rows, dictionary):
+        self.rows = rows
+        self.dictionary = dictionary
+        self.column_names = ()
+        self.pending = iter(())
+
+    def execute(self, query, params=()):
+        if "FROM fines" in query:
+            self.column_names = COLUMNS
+            self.pending = (fine_row(i) for i in range(self.rows))
+
+    def fetchmany(self, size):
+        batch = [row for _, row in zip(range(size), self.pending)]
+        return [dict(zip(self.column_names, row)) for row in batch] if self.dictionary else batch
+
+    def fetchall(self):
+        return self.fetchmany(self.rows)
+
+    def close(self):
+        pass
+
+
+class Connection:
+    connection_id = 1
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def cursor(self, dictionary=False, **kwargs):
+        return Cursor(self.rows, dictionary)
+
+    def close(self):
+        pass
+
+
+def run(mode, rows):
+    sys.path.insert(0, ROOT)
+    import backend2
+    from backend import db
+    from backend.fleet import Fine
+
+    db.mysql.connector.connect = lambda **config: Connection(rows)
+    app = backend2.app
+    path = "/fines"
+    if mode == "before":
+        path = "/bench/fines-before"
+
+        @app.get(path, response_model=List[Fine])
+        def get_all_fines_before():
+            conn = db.get_db_connection()
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute("SELECT * FROM fines;")
+            fines = cursor.fetchall()
+            cursor.close()
+            conn.close()
+            return fines
+
+    sent = 0
+
+    async def receive():
+        await asyncio.sleep(3600)
+
+    async def send(message):
+        nonlocal sent
+        if message["type"] == "http.response.body":
+            sent += len(message.get("body", b""))
+
+    scope = {
+        "type": "http", "method": "GET", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "headers": [(b"host", b"bench")], "http_version": "1.1", "scheme": "http", "server": ("bench", 80),
+        "client": ("bench", 1), "root_path": "",
+    }
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    asyncio.run(app(scope, receive, send))
+    seconds = time.perf_counter() - started
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"{mode:>6}: {sent / 1e6:6.0f} MB body in {seconds:5.1f}s, peak RSS {peak / 1024:6.0f} MB "
+          f"({(peak - baseline) / 1024:.0f} MB above the idle app)")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--run":
+        run(sys.argv[2], int(sys.argv[3]))
+    else:
+        rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+        print(f"/fines, {rows} rows")
+        for mode in ("before", "after"):
+            subprocess.run([sys.executable, "-W", "ignore", __file__, "--run", mode, str(rows)], check=True)
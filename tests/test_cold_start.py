@@ -0,0 +1,27 @@
+# Cold start of the API: building the app must stay fast and must not pull in
+# the heavy optional dependencies, which the routes import when first used.
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COLD_START_BUDGET = 3.0  # seconds; about 0.6s on a laptop
+LAZY_MODULES = ("duckdb", "pyarrow", "numpy", "msgpack", "brotli", "redis")
+
+COLD_START = f"""
+import sys, time
+started = time.perf_counter()
+import backend2
+backend2.app
+print(time.perf_counter() - started, *[name for name in {LAZY_MODULES!r} if name in sys.modules])
+"""
+
+
+def test_cold_start():
+    # A fresh interpreter, so nothing is already imported or cached
+    result = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", COLD_START], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    seconds, *imported = result.stdout.splitlines()[-1].split()
+    assert float(seconds) < COLD_START_BUDGET
+    assert imported == []
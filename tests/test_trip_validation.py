@@ -0,0 +1,25 @@
+# Request bodies the Trip model rejects must come back as 422 before any
+# database work, with an error the client can read.
+from fastapi.testclient import TestClient
+
+import backend2
+
+TRIP = {
+    "destination_country": "Oman", "service_provider": "Own", "client": "ACME",
+    "company_rate": 1000, "driver_rate": 300, "diesel": 200,
+}
+DUPLICATE_SHARES = [{"investor_id": 1, "share": 100}, {"investor_id": 1, "share": 50}]
+
+
+def test_duplicate_investor_is_rejected():
+    client = TestClient(backend2.app)
+    response = client.post("/trips", json={**TRIP, "investor_shares": DUPLICATE_SHARES})
+    assert response.status_code == 422
+    assert "investor_id listed more than once: 1" in response.text
+
+
+def test_duplicate_investor_is_rejected_on_patch():
+    client = TestClient(backend2.app)
+    response = client.patch("/trips/1", json={"investor_shares": DUPLICATE_SHARES})
+    assert response.status_code == 422
+    assert "investor_id listed more than once: 1" in response.text